@@ -1,41 +1,73 @@
 # ────────────────────────────────────────────────────────────────────────────────
 # 📌 admin_panel.py
 # Objectif : Interface web d'administration du bot (DB, logs, git pull, reload)
+#            Serveur aiohttp lancé dans la boucle du bot : il partage le pool
+#            SQLite (utils.database) et accède directement au bot et à ses cogs
 # ────────────────────────────────────────────────────────────────────────────────
 
 import os
+import re
 import json
-import sqlite3
-import subprocess
-import threading
+import base64
+import asyncio
+import hashlib
+import hmac
+import html
 import sys
-from functools import wraps
+from functools import partial, wraps
 from datetime import datetime
 import time
 
-from flask import Flask, render_template_string, request, redirect, session, jsonify, url_for
+from aiohttp import web
 from dotenv import load_dotenv
 
+from utils.database import db
+from utils.profile_cache import profile_cache
+from utils.discord_utils import outbound
+from utils.message_router import message_router
+from utils.timer_service import timer_service
+from utils.reiatsu_ledger import ledger
+
 load_dotenv()
 
 # ─── Config ────────────────────────────────────────────────────────────────────
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "admin1234")
-SECRET_KEY     = os.getenv("FLASK_SECRET", "bleach_urahara_secret")
-DB_PATH        = os.path.join(os.path.dirname(os.path.abspath(__file__)), "database", "reiatsu.db")
+SECRET_KEY     = os.getenv("ADMIN_SECRET") or os.getenv("FLASK_SECRET", "bleach_urahara_secret")
+SESSION_COOKIE = "kisuke_admin"
+SESSION_TTL    = 7 * 86400  # secondes
 
-app = Flask(__name__)
-app.secret_key = SECRET_KEY
+routes = web.RouteTableDef()
 
 # ─── Auth ──────────────────────────────────────────────────────────────────────
-def login_required(f):
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        if not session.get("logged_in"):
-            return redirect(url_for("login"))
-        return f(*args, **kwargs)
+def _sign(expires: int) -> str:
+    return hmac.new(SECRET_KEY.encode(), str(expires).encode(), hashlib.sha256).hexdigest()
+
+
+def _session_cookie() -> str:
+    """Cookie signé « échéance.signature » : pas d'état serveur à garder."""
+    expires = int(time.time()) + SESSION_TTL
+    return f"{expires}.{_sign(expires)}"
+
+
+def _logged_in(request: web.Request) -> bool:
+    expires, _, signature = request.cookies.get(SESSION_COOKIE, "").partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _sign(int(expires)))
+
+
+def login_required(handler):
+    @wraps(handler)
+    async def decorated(request: web.Request):
+        if not _logged_in(request):
+            raise web.HTTPFound("/login")
+        return await handler(request)
     return decorated
 
 
+jsonify = partial(web.json_response, dumps=partial(json.dumps, default=str))
+
+
 # ─── HTML Templates ────────────────────────────────────────────────────────────
 
 HTML_LOGIN = """
@@ -241,7 +273,7 @@ HTML_LOGIN = """
   <div class="box">
     <div class="box-title">Accès</div>
     <div class="box-sub">Panneau d'administration</div>
-    {% if error %}<div class="error">⚠ {{ error }}</div>{% endif %}
+    <!--ERROR-->
     <form method="POST">
       <label class="field-label">Mot de passe</label>
       <input type="password" name="password" placeholder="••••••••••••" autofocus>
@@ -1168,8 +1200,8 @@ HTML_MAIN = """
         <div class="card-header">
           <span class="card-title">Contenu</span>
           <div class="toolbar">
-            <select id="tableSelect" onchange="loadTable()"></select>
-            <input type="text" class="input" style="width:200px" id="filterInput" placeholder="Filtrer les lignes…" oninput="filterRows()">
+            <select id="tableSelect" onchange="selectTable()"></select>
+            <input type="text" class="input" style="width:200px" id="filterInput" placeholder="Rechercher…" oninput="filterRows()">
             <button class="btn btn-ghost" onclick="loadTable()">↻</button>
           </div>
         </div>
@@ -1184,6 +1216,7 @@ HTML_MAIN = """
               <thead id="tableHead"></thead>
               <tbody id="tableBody"></tbody>
             </table>
+            <button class="btn btn-ghost" id="loadMoreBtn" style="display:none;margin:10px auto" onclick="fetchTablePage(true)">Charger plus</button>
           </div>
         </div>
       </div>
@@ -1284,6 +1317,55 @@ HTML_MAIN = """
           <div class="action-result" id="res-restart_bot"></div>
         </div>
 
+        <div class="action-card">
+          <div class="action-header">
+            <span class="action-icon">◎</span>
+            <span class="action-title">Cache profils</span>
+          </div>
+          <div class="action-desc">Profils Reiatsu gardés en mémoire par ensure_profile (LRU + TTL). Hits / misses depuis le démarrage du bot.</div>
+          <div class="toolbar">
+            <button class="btn btn-ghost" onclick="loadCacheStats()">↻ Rafraîchir</button>
+            <button class="btn btn-ghost" onclick="clearProfileCache()">✕ Vider</button>
+          </div>
+          <div class="action-result" id="res-profile_cache" style="display:block"></div>
+        </div>
+
+        <div class="action-card">
+          <div class="action-header">
+            <span class="action-icon">⇅</span>
+            <span class="action-title">File Discord</span>
+          </div>
+          <div class="action-desc">Appels API sortants (safe_send / safe_edit…) : requêtes en file, éditions fusionnées, 429 et latence file + appel.</div>
+          <div class="toolbar">
+            <button class="btn btn-ghost" onclick="loadOutboundStats()">↻ Rafraîchir</button>
+          </div>
+          <div class="action-result" id="res-outbound" style="display:block"></div>
+        </div>
+
+        <div class="action-card">
+          <div class="action-header">
+            <span class="action-icon">⤨</span>
+            <span class="action-title">Routeur de messages</span>
+          </div>
+          <div class="action-desc">Messages transmis aux jeux en cours (mots secrets, anagramme, pendu, Kawashima…) : abonnements actifs, appels et temps par listener.</div>
+          <div class="toolbar">
+            <button class="btn btn-ghost" onclick="loadRouterStats()">↻ Rafraîchir</button>
+          </div>
+          <div class="action-result" id="res-router" style="display:block"></div>
+        </div>
+
+        <div class="action-card">
+          <div class="action-header">
+            <span class="action-icon">⏲</span>
+            <span class="action-title">Minuteurs</span>
+          </div>
+          <div class="action-desc">Échéances persistantes (fin des effets du ReiatsuShop, disparition des faux Reiatsu) : minuteurs en attente par type, déclenchés et rattrapés au démarrage.</div>
+          <div class="toolbar">
+            <button class="btn btn-ghost" onclick="loadTimerStats()">↻ Rafraîchir</button>
+          </div>
+          <div class="action-result" id="res-timers" style="display:block"></div>
+        </div>
+
       </div>
     </section>
 
@@ -1362,14 +1444,18 @@ function showTab(name, btn) {
   if (sideIdx[name] !== undefined) links[sideIdx[name]]?.classList.add('active');
   if (name === 'db') loadTable();
   if (name === 'logs') loadLogs();
+  if (name === 'actions') { loadCacheStats(); loadOutboundStats(); loadRouterStats(); loadTimerStats(); }
 }
 
 // ══════════════════════════════════════════════════════════════════════════════
 // DATABASE
 // ══════════════════════════════════════════════════════════════════════════════
-let currentData = [], currentCols = [], currentTableName = '', currentPk = '';
+let currentData = [], currentCols = [], currentTableName = '', currentPk = '', currentPkIdx = 0;
 let sortCol = null, sortDir = 1;
+let nextCursor = null, tableTotal = null, tableBound = '=', tableLoading = false, tableLoadSeq = 0;
+let filterTimer = null;
 let rawLogs = [];
+const PAGE_SIZE = 200;
 
 async function loadTableList() {
   const res = await fetch('/api/tables');
@@ -1377,47 +1463,129 @@ async function loadTableList() {
   const sel = document.getElementById('tableSelect');
   sel.innerHTML = data.tables.map(t => `<option value="${t}">${t}</option>`).join('');
   document.getElementById('sb-table-count').textContent = data.tables.length;
+  selectTable();
+}
+
+function selectTable() {
+  sortCol = null; sortDir = 1;
   loadTable();
 }
 
-async function loadTable() {
+function loadTable() {
+  return fetchTablePage(false);
+}
+
+function filterRows() {
+  clearTimeout(filterTimer);
+  filterTimer = setTimeout(loadTable, 300);
+}
+
+function sortBy(colIndex) {
+  if (sortCol === colIndex) sortDir *= -1; else { sortCol = colIndex; sortDir = 1; }
+  loadTable();
+}
+
+// Page suivante (ou première page) lue en flux NDJSON : meta, lignes, fin
+async function fetchTablePage(append) {
   const table = document.getElementById('tableSelect').value;
-  if (!table) return;
-  document.getElementById('ti-table').textContent = table;
-  document.getElementById('bc-table').textContent = table;
-  const res = await fetch('/api/table/' + table);
-  const data = await res.json();
-  currentData = data.rows;
-  currentCols = data.columns;
-  currentTableName = table;
-  currentPk = data.pk;
-  sortCol = null;
-  renderTable(data.columns, data.rows);
-  document.getElementById('ti-pk').textContent = 'PK: ' + data.pk;
-  document.getElementById('ti-count').textContent = data.rows.length + ' entrée' + (data.rows.length > 1 ? 's' : '');
-  updateStatCards(data);
+  if (!table || (append && !nextCursor)) return;
+  const seq = ++tableLoadSeq;
+  tableLoading = true;
+
+  const params = new URLSearchParams({limit: PAGE_SIZE});
+  if (sortCol !== null) { params.set('sort', currentCols[sortCol]); params.set('dir', sortDir === 1 ? 'asc' : 'desc'); }
+  const q = document.getElementById('filterInput').value.trim();
+  if (q) params.set('q', q);
+  if (append) params.set('after', nextCursor);
+
+  const res = await fetch(`/api/table/${encodeURIComponent(table)}?${params}`);
+  if (!res.ok) {
+    const err = await res.json().catch(() => ({}));
+    toast('✕ ' + (err.error || res.status), 'err');
+    tableLoading = false;
+    return;
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buf = '';
+  while (true) {
+    const {done, value} = await reader.read();
+    if (seq !== tableLoadSeq) { reader.cancel(); return; }  // requête remplacée entre-temps
+    buf += decoder.decode(value || new Uint8Array(), {stream: !done});
+    const lines = buf.split(`
+`);
+    buf = lines.pop();
+    const batch = [];
+    for (const line of lines) {
+      if (!line) continue;
+      const msg = JSON.parse(line);
+      if (Array.isArray(msg)) batch.push(msg);
+      else if (msg.type === 'meta') onTableMeta(msg, append);
+      else if (msg.type === 'end') onTableEnd(msg, append);
+    }
+    if (batch.length) appendRows(batch);
+    if (done) break;
+  }
+  tableLoading = false;
+}
+
+function onTableMeta(meta, append) {
+  currentTableName = meta.table;
+  currentCols = meta.columns;
+  currentPk = meta.pk;
+  currentPkIdx = Math.max(0, meta.columns.indexOf(meta.pk));
+  if (append) return;
+  currentData = [];
+  document.getElementById('ti-table').textContent = meta.table;
+  document.getElementById('bc-table').textContent = meta.table;
+  document.getElementById('ti-pk').textContent = 'PK: ' + meta.pk;
+  renderHead(meta.columns);
+  document.getElementById('tableBody').innerHTML = '';
+  document.querySelector('#tab-db .table-wrap').scrollTop = 0;
+}
+
+function onTableEnd(end, append) {
+  nextCursor = end.next;
+  if (!append) { tableTotal = end.total; tableBound = end.bound; }
+  document.getElementById('loadMoreBtn').style.display = nextCursor ? 'block' : 'none';
+  updateTableCount();
+  updateStatCards();
 }
 
-function updateStatCards(data) {
+function formatTotal() {
+  if (tableTotal === null) return '—';
+  const n = tableTotal.toLocaleString('fr');
+  return tableBound === '=' ? n : `${tableBound} ${n}`;
+}
+
+function updateTableCount() {
+  const loaded = currentData.length;
+  document.getElementById('ti-count').textContent =
+    `${loaded.toLocaleString('fr')} chargée${loaded > 1 ? 's' : ''} / ${formatTotal()} entrée${tableTotal > 1 ? 's' : ''}`;
+}
+
+function updateStatCards() {
   const grid = document.getElementById('db-stats-grid');
   const colors = ['gold','cyan','green','purple','red'];
   const icons = ['◈','∑','↑','⚙','★'];
-  // Quelques colonnes numériques
-  const numCols = data.columns
+  // Quelques colonnes numériques (sommes sur les lignes chargées)
+  const numCols = currentCols
     .map((c,i) => ({name:c, idx:i}))
     .filter(({name}) => /point|niveau|count|total|nb|score/i.test(name))
-    .slice(0, 4);
+    .slice(0, 3);
 
   const cards = [
-    { label:'Total entrées', value: data.rows.length, icon:'⬡', color:'gold' },
-    { label:'Colonnes', value: data.columns.length, icon:'◈', color:'cyan' },
+    { label:'Total entrées', value: formatTotal(), icon:'⬡', color:'gold' },
+    { label:'Colonnes', value: currentCols.length, icon:'◈', color:'cyan' },
   ];
 
   numCols.forEach(({name, idx}, i) => {
-    const vals = data.rows.map(r => parseFloat(r[idx])).filter(v => !isNaN(v));
+    const vals = currentData.map(r => parseFloat(r[idx])).filter(v => !isNaN(v));
     if (vals.length) {
       const sum = vals.reduce((a,b)=>a+b,0);
-      cards.push({ label: name.toUpperCase(), value: Math.round(sum).toLocaleString('fr'), icon: icons[i+2], color: colors[i+2] });
+      const label = name.toUpperCase() + (nextCursor ? ' (chargées)' : '');
+      cards.push({ label, value: Math.round(sum).toLocaleString('fr'), icon: icons[i+2], color: colors[i+2] });
     }
   });
 
@@ -1430,20 +1598,8 @@ function updateStatCards(data) {
   `).join('');
 }
 
-function sortBy(colIndex) {
-  if (sortCol === colIndex) sortDir *= -1; else { sortCol = colIndex; sortDir = 1; }
-  const sorted = [...currentData].sort((a, b) => {
-    const va = a[colIndex] ?? '', vb = b[colIndex] ?? '';
-    const na = parseFloat(va), nb = parseFloat(vb);
-    if (!isNaN(na) && !isNaN(nb)) return (na - nb) * sortDir;
-    return String(va).localeCompare(String(vb), 'fr', {sensitivity:'base'}) * sortDir;
-  });
-  renderTable(currentCols, sorted);
-}
-
-function renderTable(cols, rows) {
+function renderHead(cols) {
   const head = document.getElementById('tableHead');
-  const body = document.getElementById('tableBody');
   const htr = document.createElement('tr');
   cols.forEach((c, i) => {
     const th = document.createElement('th');
@@ -1453,10 +1609,14 @@ function renderTable(cols, rows) {
     htr.appendChild(th);
   });
   head.innerHTML = ''; head.appendChild(htr);
-  body.innerHTML = '';
+}
+
+function appendRows(rows) {
+  const body = document.getElementById('tableBody');
+  const frag = document.createDocumentFragment();
   rows.forEach(row => {
     const tr = document.createElement('tr');
-    cols.forEach((col, i) => {
+    currentCols.forEach((col, i) => {
       const val = row[i];
       const td = document.createElement('td');
       const isPk = col === currentPk;
@@ -1468,21 +1628,22 @@ function renderTable(cols, rows) {
       }
       if (!isPk) {
         td.className = 'editable';
-        td.onclick = () => openEdit(currentTableName, currentPk, String(row[0]), col, String(val ?? ''));
+        td.onclick = () => openEdit(currentTableName, currentPk, String(row[currentPkIdx]), col, String(val ?? ''));
       }
       tr.appendChild(td);
     });
-    body.appendChild(tr);
+    frag.appendChild(tr);
   });
-  filterRows();
+  body.appendChild(frag);
+  currentData.push(...rows);
+  updateTableCount();
 }
 
-function filterRows() {
-  const f = document.getElementById('filterInput').value.toLowerCase();
-  document.querySelectorAll('#tableBody tr').forEach(r => {
-    r.style.display = f === '' || r.textContent.toLowerCase().includes(f) ? '' : 'none';
-  });
-}
+// Défilement infini : page suivante à l'approche du bas du tableau
+document.querySelector('#tab-db .table-wrap').addEventListener('scroll', e => {
+  const el = e.target;
+  if (!tableLoading && nextCursor && el.scrollTop + el.clientHeight > el.scrollHeight - 200) fetchTablePage(true);
+});
 
 // ══════════════════════════════════════════════════════════════════════════════
 // MODAL EDIT
@@ -1645,6 +1806,90 @@ async function doAction(action, btn) {
   if (btn) btn.disabled = false;
 }
 
+// ══════════════════════════════════════════════════════════════════════════════
+// CACHE PROFILS
+// ══════════════════════════════════════════════════════════════════════════════
+async function loadCacheStats() {
+  const box = document.getElementById('res-profile_cache');
+  try {
+    const res = await fetch('/api/cache/stats');
+    const s = await res.json();
+    box.className = 'action-result';
+    box.textContent =
+      `Hits : ${s.hits}  ·  Misses : ${s.misses}  ·  Taux : ${(s.hit_rate * 100).toFixed(1)} %\n` +
+      `Profils : ${s.size} / ${s.maxsize}  ·  TTL : ${s.ttl}s  ·  Invalidations : ${s.invalidations}`;
+  } catch(e) {
+    box.className = 'action-result err';
+    box.textContent = '✕ Erreur réseau';
+  }
+}
+
+async function clearProfileCache() {
+  await fetch('/api/cache/clear', {method:'POST'});
+  toast('✓ Cache profils vidé', 'ok');
+  loadCacheStats();
+}
+
+// ══════════════════════════════════════════════════════════════════════════════
+// FILE DISCORD
+// ══════════════════════════════════════════════════════════════════════════════
+async function loadOutboundStats() {
+  const box = document.getElementById('res-outbound');
+  try {
+    const res = await fetch('/api/outbound/stats');
+    const s = await res.json();
+    box.className = 'action-result';
+    box.textContent =
+      `En file : ${s.queued.message} messages · ${s.queued.cosmetic} éditions/réactions  ·  En cours : ${s.inflight}\n` +
+      `Soumis : ${s.submitted}  ·  Fusionnés : ${s.coalesced}  ·  Échecs : ${s.failed}  ·  429 : ${s.rate_limited}\n` +
+      `Latence moy. ${s.latency_avg_ms} ms  ·  p95 ${s.latency_p95_ms} ms  ·  max ${s.latency_max_ms} ms`;
+  } catch(e) {
+    box.className = 'action-result err';
+    box.textContent = '✕ Erreur réseau';
+  }
+}
+
+// ══════════════════════════════════════════════════════════════════════════════
+// ROUTEUR DE MESSAGES
+// ══════════════════════════════════════════════════════════════════════════════
+async function loadRouterStats() {
+  const box = document.getElementById('res-router');
+  try {
+    const res = await fetch('/api/router/stats');
+    const s = await res.json();
+    const lines = Object.entries(s.listeners).map(([name, l]) =>
+      `  ${name} : ${l.dispatched} appels · ${l.errors} erreurs · moy. ${l.avg_ms} ms · max ${l.max_ms} ms`);
+    box.className = 'action-result';
+    box.textContent =
+      `Messages reçus : ${s.received}  ·  Routés : ${s.routed}  ·  Salons actifs : ${s.channels}  ·  Abonnements : ${s.routes}\n` +
+      (lines.length ? lines.join(`\n`) : '  Aucun listener appelé pour le moment');
+  } catch(e) {
+    box.className = 'action-result err';
+    box.textContent = '✕ Erreur réseau';
+  }
+}
+
+// ══════════════════════════════════════════════════════════════════════════════
+// MINUTEURS
+// ══════════════════════════════════════════════════════════════════════════════
+async function loadTimerStats() {
+  const box = document.getElementById('res-timers');
+  try {
+    const res = await fetch('/api/timers/stats');
+    const s = await res.json();
+    const lines = Object.entries(s.by_name).map(([name, t]) =>
+      `  ${name} : ${t.pending} en attente` + (t.waiting_callback ? ` (${t.waiting_callback} sans callback)` : ''));
+    box.className = s.running ? 'action-result' : 'action-result err';
+    box.textContent =
+      `${s.running ? 'Actif' : 'Arrêté'}  ·  En attente : ${s.pending}  ·  Prochain dans : ${s.next_in === null ? '—' : s.next_in + ' s'}\n` +
+      `Déclenchés : ${s.fired}  ·  Erreurs : ${s.failed}  ·  Rattrapés au démarrage : ${s.missed}\n` +
+      (lines.length ? lines.join(`\n`) : '  Aucun minuteur en attente');
+  } catch(e) {
+    box.className = 'action-result err';
+    box.textContent = '✕ Erreur réseau';
+  }
+}
+
 // ══════════════════════════════════════════════════════════════════════════════
 // INIT
 // ══════════════════════════════════════════════════════════════════════════════
@@ -1657,88 +1902,262 @@ autoRefreshTimer = setInterval(loadLogs, 2000);
 
 # ─── Routes ────────────────────────────────────────────────────────────────────
 
-@app.route("/", methods=["GET"])
+@routes.get("/")
 @login_required
-def index():
-    return render_template_string(HTML_MAIN)
-
-
-@app.route("/login", methods=["GET", "POST"])
-def login():
-    error = None
-    if request.method == "POST":
-        if request.form.get("password") == ADMIN_PASSWORD:
-            session["logged_in"] = True
-            return redirect(url_for("index"))
-        error = "Mot de passe incorrect."
-    return render_template_string(HTML_LOGIN, error=error)
-
-
-@app.route("/logout", methods=["POST"])
-def logout():
-    session.clear()
-    return redirect(url_for("login"))
-
-
-# ─── API : Tables (liste dynamique) ───────────────────────────────────────────
-def get_all_tables():
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-    tables = [row[0] for row in cur.fetchall()]
-    conn.close()
-    return tables
-
-def get_pk_for_table(table):
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute(f"PRAGMA table_info({table})")
-    cols = cur.fetchall()
-    conn.close()
-    for col in cols:
-        if col[5] == 1:
-            return col[1]
-    return cols[0][1]
-
-@app.route("/api/tables")
-@login_required
-def api_tables():
-    return jsonify({"tables": get_all_tables()})
+async def index(request):
+    return web.Response(text=HTML_MAIN, content_type="text/html")
+
+
+def _render_login(error: str | None = None) -> web.Response:
+    block = f'<div class="error">⚠ {html.escape(error)}</div>' if error else ""
+    return web.Response(text=HTML_LOGIN.replace("<!--ERROR-->", block), content_type="text/html")
+
+
+@routes.get("/login")
+async def login_page(request):
+    return _render_login()
+
+
+@routes.post("/login")
+async def login(request):
+    form = await request.post()
+    if not hmac.compare_digest(str(form.get("password", "")), ADMIN_PASSWORD):
+        return _render_login("Mot de passe incorrect.")
+    response = web.HTTPFound("/")
+    response.set_cookie(SESSION_COOKIE, _session_cookie(), max_age=SESSION_TTL, httponly=True, samesite="Lax")
+    raise response
+
+
+@routes.post("/logout")
+async def logout(request):
+    response = web.HTTPFound("/login")
+    response.del_cookie(SESSION_COOKIE)
+    raise response
+
+
+# ─── Schéma (cache, invalidé sur DDL) ─────────────────────────────────────────
+PAGE_SIZE     = 200     # lignes par page par défaut
+PAGE_SIZE_MAX = 1000
+COUNT_CAP     = 10_000  # au-delà, le total est estimé
+STREAM_BATCH  = 100     # lignes NDJSON par écriture réseau
+JS_SAFE_INT   = 2 ** 53  # entiers plus grands envoyés en texte (IDs Discord)
+DDL_PATTERN   = re.compile(r"\s*(CREATE|ALTER|DROP)\b", re.IGNORECASE)
 
 
-# ─── API : Table ───────────────────────────────────────────────────────────────
-@app.route("/api/table/<table_name>")
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SchemaCache:
+    """
+    {table: {columns, pk, pk_cols, rowid, notnull}} lu en une requête
+    (sqlite_master × pragma_table_info) puis gardé jusqu'au prochain DDL.
+    """
+
+    def __init__(self):
+        self._tables: dict[str, dict] | None = None
+
+    async def tables(self) -> dict[str, dict]:
+        if self._tables is None:
+            rows = await db.fetchall("""
+                SELECT m.name AS tbl, m.sql AS ddl, p.name AS col, p.pk, p."notnull" AS nn
+                FROM sqlite_master m, pragma_table_info(m.name) p
+                WHERE m.type = 'table'
+                ORDER BY m.name, p.cid
+            """)
+            tables: dict[str, dict] = {}
+            for row in rows:
+                meta = tables.setdefault(row["tbl"], {
+                    "columns": [], "pk_cols": [], "notnull": set(),
+                    "rowid": "WITHOUT ROWID" not in (row["ddl"] or "").upper(),
+                })
+                meta["columns"].append(row["col"])
+                if row["pk"]:
+                    meta["pk_cols"].append((row["pk"], row["col"]))
+                if row["nn"] or row["pk"]:
+                    meta["notnull"].add(row["col"])
+            for meta in tables.values():
+                meta["pk_cols"] = [col for _, col in sorted(meta["pk_cols"])]
+                meta["pk"] = meta["pk_cols"][0] if meta["pk_cols"] else meta["columns"][0]
+            self._tables = tables
+        return self._tables
+
+    async def get(self, table: str) -> dict | None:
+        return (await self.tables()).get(table)
+
+    def invalidate(self):
+        self._tables = None
+
+
+schema = SchemaCache()
+
+
+@routes.get("/api/tables")
 @login_required
-def api_table(table_name):
-    if table_name not in get_all_tables():
-        return jsonify({"error": "Table non autorisée"}), 403
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute(f"SELECT * FROM {table_name}")
-    raw_rows = cur.fetchall()
-    columns = [d[0] for d in cur.description]
-    pk_col = get_pk_for_table(table_name)
-    pk_idx = columns.index(pk_col) if pk_col in columns else 0
-    rows = [
-        [str(cell) if i == pk_idx and cell is not None else cell for i, cell in enumerate(row)]
-        for row in raw_rows
-    ]
-    conn.close()
-    return jsonify({"columns": columns, "rows": rows, "pk": pk_col})
-
-
-@app.route("/api/edit", methods=["POST"])
+async def api_tables(request):
+    return jsonify({"tables": list(await schema.tables())})
+
+
+# ─── API : Table (pagination par clé, NDJSON) ──────────────────────────────────
+def _encode_cursor(keys: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(keys).encode()).decode()
+
+
+def _decode_cursor(token: str) -> list:
+    return json.loads(base64.urlsafe_b64decode(token.encode()))
+
+
+def _page_keys(meta: dict, sort: str | None) -> list[str]:
+    """Clés de tri : colonne triée éventuelle, puis rowid ou clé primaire pour départager."""
+    keys = [_quote(sort)] if sort is not None else []
+    keys += ["rowid"] if meta["rowid"] else [_quote(c) for c in meta["pk_cols"] or meta["columns"]]
+    return keys
+
+
+def _search_clause(meta: dict, search: str) -> tuple[str, list]:
+    if not search:
+        return "", []
+    pattern = "%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    clause = " OR ".join(f"{_quote(c)} LIKE ? ESCAPE '\\'" for c in meta["columns"])  # LIKE convertit en texte
+    return f"({clause})", [pattern] * len(meta["columns"])
+
+
+def _json_cell(cell):
+    if isinstance(cell, int) and not -JS_SAFE_INT < cell < JS_SAFE_INT:
+        return str(cell)
+    if isinstance(cell, bytes):
+        return f"<blob {len(cell)} o>"
+    return cell
+
+
+def _ndjson(obj) -> bytes:
+    return (json.dumps(obj, default=str, ensure_ascii=False) + "\n").encode()
+
+
+async def _estimate_count(table: str, meta: dict, where: str, params: list) -> tuple[int, str]:
+    """
+    (total, précision) : exact (« = ») jusqu'à COUNT_CAP ; au-delà, plage de
+    rowid sans filtre (« ≈ », lecture d'index) ou simple plancher (« > »).
+    """
+    sql = f"SELECT COUNT(*) FROM (SELECT 1 FROM {_quote(table)} {where} LIMIT {COUNT_CAP + 1})"
+    count = (await db.fetchone(sql, tuple(params)))[0]
+    if count <= COUNT_CAP:
+        return count, "="
+    if meta["rowid"] and not where:
+        row = await db.fetchone(f"SELECT MAX(rowid) - MIN(rowid) + 1 FROM {_quote(table)}")
+        return max(row[0], count), "≈"
+    return COUNT_CAP, ">"
+
+
+async def _fetch_page(table: str, meta: dict, keys: list[str], nullable: bool, descending: bool,
+                      search: str, params: list, after: list | None, limit: int) -> list[tuple]:
+    """
+    Lignes de la page, suivies des valeurs des clés (curseur).
+    Si la colonne triée peut être NULL, la page parcourt deux segments à la
+    suite, NULL puis valeurs (l'inverse en DESC, comme ORDER BY de SQLite) :
+    chacun reste une plage (clés…) > (?…) que l'index de la colonne sert.
+    """
+    direction, op = ("DESC", "<") if descending else ("ASC", ">")
+    segments = [None]
+    if nullable:
+        segments = ["IS NOT NULL", "IS NULL"] if descending else ["IS NULL", "IS NOT NULL"]
+        if after is not None:
+            segments = segments[segments.index("IS NULL" if after[0] is None else "IS NOT NULL"):]
+
+    select = f"SELECT {', '.join(_quote(c) for c in meta['columns'])}, {', '.join(keys)} FROM {_quote(table)}"
+    rows: list[tuple] = []
+    for segment in segments:
+        order = keys[1:] if segment == "IS NULL" else keys
+        conditions, args = ([search], list(params)) if search else ([], [])
+        if segment:
+            conditions.append(f"{keys[0]} {segment}")
+        if after is not None:
+            conditions.append(f"({', '.join(order)}) {op} ({', '.join('?' * len(order))})")
+            args += after[len(keys) - len(order):]
+            after = None  # les segments suivants repartent de leur début
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = (f"{select} {where} ORDER BY {', '.join(f'{k} {direction}' for k in order)} "
+               f"LIMIT {limit - len(rows)}")
+        rows += (await db.query(sql, tuple(args)))[1]
+        if len(rows) >= limit:
+            break
+    return rows
+
+
+@routes.get("/api/table/{table_name}")
 @login_required
-def api_edit():
-    data = request.json
+async def api_table(request):
+    """
+    Une page de la table, triée et filtrée côté serveur, en NDJSON :
+    {"type": "meta", ...} puis une ligne JSON (liste) par enregistrement,
+    puis {"type": "end", "next": curseur | null, "total": n, "bound": "=" | "≈" | ">"}.
+    Paramètres : sort, dir (asc|desc), q (recherche), after (curseur), limit.
+    """
+    table = request.match_info["table_name"]
+    meta = await schema.get(table)
+    if meta is None:
+        return jsonify({"error": "Table non autorisée"}, status=403)
+
+    query = request.query
+    sort = query.get("sort") or None
+    if sort is not None and sort not in meta["columns"]:
+        return jsonify({"error": f"Colonne inconnue : {sort}"}, status=400)
+    descending = query.get("dir") == "desc"
+    try:
+        limit = min(max(int(query.get("limit", PAGE_SIZE)), 1), PAGE_SIZE_MAX)
+        after = _decode_cursor(query["after"]) if query.get("after") else None
+    except (ValueError, TypeError):
+        return jsonify({"error": "Paramètres de pagination invalides"}, status=400)
+
+    keys = _page_keys(meta, sort)
+    if after is not None and len(after) != len(keys):
+        return jsonify({"error": "Curseur invalide"}, status=400)
+
+    search, params = _search_clause(meta, query.get("q", "").strip())
+    nullable = sort is not None and sort not in meta["notnull"]
+
+    response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson; charset=utf-8"})
+    await response.prepare(request)
+    await response.write(_ndjson({
+        "type": "meta", "table": table, "columns": meta["columns"], "pk": meta["pk"],
+        "sort": sort, "dir": "desc" if descending else "asc",
+    }))
+
+    rows = await _fetch_page(table, meta, keys, nullable, descending, search, params, after, limit)
+    width = len(meta["columns"])
+    for i in range(0, len(rows), STREAM_BATCH):
+        await response.write(b"".join(
+            _ndjson([_json_cell(cell) for cell in row[:width]]) for row in rows[i:i + STREAM_BATCH]
+        ))
+
+    next_cursor = _encode_cursor(list(rows[-1][width:])) if len(rows) == limit else None
+    total, bound = None, None
+    if after is None and next_cursor is None:  # tout tient dans la première page
+        total, bound = len(rows), "="
+    elif after is None:  # total estimé une seule fois, sur la première page
+        total, bound = await _estimate_count(table, meta, f"WHERE {search}" if search else "", params)
+    await response.write(_ndjson({
+        "type": "end", "next": next_cursor, "returned": len(rows), "total": total, "bound": bound,
+    }))
+    await response.write_eof()
+    return response
+
+
+@routes.post("/api/edit")
+@login_required
+async def api_edit(request):
+    data = await request.json()
     table  = data.get("table")
     pk     = data.get("pk")
     pk_val = data.get("pk_val")
     col    = data.get("col")
     value  = data.get("value")
 
-    if table not in get_all_tables():
+    meta = await schema.get(table)
+    if meta is None:
         return jsonify({"ok": False, "error": "Table non autorisée"})
+    if col not in meta["columns"] or pk not in meta["columns"]:
+        return jsonify({"ok": False, "error": "Colonne inconnue"})
     if col == pk:
         return jsonify({"ok": False, "error": "Impossible de modifier la clé primaire"})
 
@@ -1748,138 +2167,191 @@ def api_edit():
         except (ValueError, TypeError):
             pass
 
-        conn = sqlite3.connect(DB_PATH)
-        cur = conn.cursor()
-        cur.execute(
-            f"UPDATE {table} SET {col} = ? WHERE CAST({pk} AS TEXT) = CAST(? AS TEXT)",
+        cursor = await db.execute(
+            f"UPDATE {_quote(table)} SET {_quote(col)} = ? WHERE CAST({_quote(pk)} AS TEXT) = CAST(? AS TEXT)",
             (value, str(pk_val))
         )
-        rows_affected = cur.rowcount
-        conn.commit()
-        conn.close()
-        if rows_affected == 0:
+        if cursor.rowcount == 0:
             return jsonify({"ok": False, "error": f"0 ligne modifiée — {pk}={pk_val!r} introuvable"})
+        if table == "reiatsu":
+            profile_cache.clear()
+        elif table == "reiatsu_config":
+            await reload_spawn_schedule()
         return jsonify({"ok": True})
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)})
 
 
 # ─── API : SQL ─────────────────────────────────────────────────────────────────
-@app.route("/api/sql", methods=["POST"])
+@routes.post("/api/sql")
 @login_required
-def api_sql():
-    query = request.json.get("query", "").strip()
+async def api_sql(request):
+    query = (await request.json()).get("query", "").strip()
     if not query:
         return jsonify({"error": "Requête vide"})
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cur = conn.cursor()
-        cur.execute(query)
-        if cur.description:
-            columns = [d[0] for d in cur.description]
-            rows = cur.fetchall()
-            conn.close()
+        columns, rows, rowcount = await db.query(query, write=True)
+        if DDL_PATTERN.match(query):
+            schema.invalidate()
+        if columns:
             return jsonify({"columns": columns, "rows": rows})
-        else:
-            conn.commit()
-            conn.close()
-            return jsonify({"ok": True, "message": f"{cur.rowcount} ligne(s) affectée(s)"})
+        profile_cache.clear()  # la requête a pu toucher `reiatsu`
+        await reload_spawn_schedule()  # … ou `reiatsu_config`
+        return jsonify({"ok": True, "message": f"{rowcount} ligne(s) affectée(s)"})
     except Exception as e:
         return jsonify({"error": str(e)})
 
 
 # ─── API : Logs ────────────────────────────────────────────────────────────────
-@app.route("/api/logs")
+@routes.get("/api/logs")
 @login_required
-def api_logs():
+async def api_logs(request):
     from utils.logger import get_logs
     return jsonify({"logs": get_logs()})
 
-@app.route("/api/logs/clear", methods=["POST"])
+@routes.post("/api/logs/clear")
 @login_required
-def api_logs_clear():
+async def api_logs_clear(request):
     from utils.logger import LOG_BUFFER
     LOG_BUFFER.clear()
     return jsonify({"ok": True})
 
 
+# ─── API : Cache profils ───────────────────────────────────────────────────────
+@routes.get("/api/cache/stats")
+@login_required
+async def api_cache_stats(request):
+    return jsonify(profile_cache.stats())
+
+@routes.post("/api/cache/clear")
+@login_required
+async def api_cache_clear(request):
+    profile_cache.clear()
+    return jsonify({"ok": True})
+
+
+# ─── API : File Discord ────────────────────────────────────────────────────────
+@routes.get("/api/outbound/stats")
+@login_required
+async def api_outbound_stats(request):
+    return jsonify(outbound.stats())
+
+
+# ─── API : Routeur de messages ─────────────────────────────────────────────────
+@routes.get("/api/router/stats")
+@login_required
+async def api_router_stats(request):
+    return jsonify(message_router.stats())
+
+
+# ─── API : Minuteurs ───────────────────────────────────────────────────────────
+@routes.get("/api/timers/stats")
+@login_required
+async def api_timers_stats(request):
+    return jsonify(timer_service.stats())
+
+
 # ─── API : Actions ─────────────────────────────────────────────────────────────
 _bot_ref = None
+_restart_task: asyncio.Task | None = None  # redémarrage demandé (une seule fois)
 
 def set_bot(bot):
     global _bot_ref
     _bot_ref = bot
 
 
-@app.route("/api/action/<action>", methods=["POST"])
+async def reload_spawn_schedule():
+    """Recharge le planificateur de spawn du bot après une écriture manuelle en base."""
+    if _bot_ref is None:
+        return
+    spawner = _bot_ref.get_cog("ReiatsuSpawner")
+    if spawner:
+        await spawner.load_schedule()
+
+
+async def _git_pull() -> tuple[bool, str]:
+    proc = await asyncio.create_subprocess_exec(
+        "git", "pull", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=30)
+    except asyncio.TimeoutError:
+        proc.kill()
+        return False, "❌ git pull : délai dépassé (30 s)"
+    return proc.returncode == 0, stdout.decode(errors="replace")
+
+
+async def _reload_extensions() -> list[str]:
+    output_lines = []
+    for ext in list(_bot_ref.extensions.keys()):
+        try:
+            await _bot_ref.reload_extension(ext)
+            output_lines.append(f"✅ {ext}")
+        except Exception as e:
+            output_lines.append(f"❌ {ext}: {e}")
+    return output_lines
+
+
+@routes.post("/api/action/{action}")
 @login_required
-def api_action(action):
+async def api_action(request):
+    action = request.match_info["action"]
 
     if action == "git_pull":
-        result = subprocess.run(["git", "pull"], capture_output=True, text=True, timeout=30)
-        output = result.stdout + result.stderr
-        return jsonify({"ok": result.returncode == 0, "output": output})
+        ok, output = await _git_pull()
+        return jsonify({"ok": ok, "output": output})
 
     elif action == "git_pull_restart":
-        result = subprocess.run(["git", "pull"], capture_output=True, text=True, timeout=30)
-        output = result.stdout + result.stderr
+        _, output = await _git_pull()
         if _bot_ref is None:
             return jsonify({"ok": False, "output": output + "\n❌ Bot non disponible pour le reload"})
-        import asyncio
-        output_lines = [output]
-
-        async def do_reload():
-            extensions = list(_bot_ref.extensions.keys())
-            for ext in extensions:
-                try:
-                    await _bot_ref.reload_extension(ext)
-                    output_lines.append(f"✅ {ext}")
-                except Exception as e:
-                    output_lines.append(f"❌ {ext}: {e}")
-
-        asyncio.run_coroutine_threadsafe(do_reload(), _bot_ref.loop).result(timeout=15)
+        output_lines = [output] + await _reload_extensions()
         return jsonify({"ok": True, "output": "\n".join(output_lines)})
 
     elif action == "reload_cogs":
         if _bot_ref is None:
             return jsonify({"ok": False, "output": "Bot non disponible"})
-        import asyncio
-        loop = _bot_ref.loop
-        output_lines = []
-
-        async def do_reload():
-            extensions = list(_bot_ref.extensions.keys())
-            for ext in extensions:
-                try:
-                    await _bot_ref.reload_extension(ext)
-                    output_lines.append(f"✅ {ext}")
-                except Exception as e:
-                    output_lines.append(f"❌ {ext}: {e}")
-
-        asyncio.run_coroutine_threadsafe(do_reload(), loop).result(timeout=15)
-        return jsonify({"ok": True, "output": "\n".join(output_lines)})
+        return jsonify({"ok": True, "output": "\n".join(await _reload_extensions())})
 
     elif action == "restart_bot":
-        threading.Timer(1.0, restart_bot_process).start()
+        global _restart_task
+        await ledger.flush()  # points en attente écrits avant de répondre
+        if _restart_task is None:
+            _restart_task = asyncio.create_task(restart_bot_process())
         return jsonify({"ok": True, "output": "⏳ Redémarrage en cours…"})
 
     return jsonify({"ok": False, "output": "Action inconnue"})
 
 
-def restart_bot_process():
+async def restart_bot_process():
+    """
+    Relance via start.sh sans bloquer la boucle : laisse partir la réponse HTTP,
+    écrit le ledger (variations différées), lance start.sh puis quitte.
+    """
+    await asyncio.sleep(1.0)
     print("🔄 Redémarrage complet via start.sh...")
+    await ledger.close()
     start_sh = os.path.join(os.path.dirname(os.path.abspath(__file__)), "start.sh")
-    subprocess.Popen(
-        ["bash", start_sh],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-        close_fds=True,
+    await asyncio.create_subprocess_exec(
+        "bash", start_sh,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
         start_new_session=True
     )
-    time.sleep(1)
-    os.kill(os.getpid(), 9)
+    db.close()
+    os._exit(0)  # sans attendre la fermeture du client Discord : start.sh prend le relais
+
+
+# ─── Lancement (dans la boucle du bot) ────────────────────────────────────────
+def create_app() -> web.Application:
+    app = web.Application()
+    app.add_routes(routes)
+    return app
 
 
-# ─── Lancement Flask (dans un thread) ─────────────────────────────────────────
-def run_admin(port=5050):
-    app.run(host="0.0.0.0", port=port, debug=False, use_reloader=False)
+async def start_admin(port=5050, host="0.0.0.0") -> web.AppRunner:
+    """Démarre le panneau dans la boucle courante ; `await runner.cleanup()` pour l'arrêter."""
+    runner = web.AppRunner(create_app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
@@ -0,0 +1,135 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 admin_load_benchmark.py — Charge locale sur le panneau admin (aiohttp)
+# Objectif : Lancer le panneau dans la boucle courante sur une base temporaire,
+#            envoyer des requêtes admin concurrentes et mesurer débit, latence
+#            et retard infligé à la boucle (celle que partage le bot)
+# Catégorie : Benchmark
+# Accès : Développeurs
+# Usage : python benchmarks/admin_load_benchmark.py [nb_requêtes] [concurrence] [nb_joueurs]
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import aiohttp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import utils.init_db as init_db_module
+from utils.database import db
+import admin_panel
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+# (méthode, chemin, corps JSON) tirés au hasard à chaque requête
+REQUESTS = [
+    ("GET",  "/api/tables", None),
+    ("GET",  "/api/table/reiatsu_config", None),
+    ("GET",  "/api/table/reiatsu?sort=points&dir=desc", None),
+    ("GET",  "/api/table/reiatsu?q=joueur42", None),
+    ("GET",  "/api/router/stats", None),
+    ("GET",  "/api/timers/stats", None),
+    ("POST", "/api/sql", {"query": "SELECT COUNT(*), MAX(points) FROM reiatsu"}),
+    ("POST", "/api/sql", {"query": "SELECT user_id, points FROM reiatsu ORDER BY points DESC LIMIT 50"}),
+]
+JSON_TYPES = ("application/json", "application/x-ndjson")  # sinon : page de connexion
+LAG_TICK = 0.01  # période de la sonde de boucle (s)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔧 Préparation
+# ────────────────────────────────────────────────────────────────────────────────
+async def _seed(tmp_dir: str, nb_players: int):
+    db.path = os.path.join(tmp_dir, "bench.db")
+    init_db_module.REIATSU_DB_PATH = db.path
+    init_db_module.init_db()
+    async with db.transaction() as tx:
+        await tx.executemany(
+            "INSERT INTO reiatsu (user_id, username, points) VALUES (?, ?, ?)",
+            [(i, f"joueur{i}", random.randint(0, 5000)) for i in range(nb_players)]
+        )
+        await tx.executemany(
+            "INSERT INTO reiatsu_config (guild_id, channel_id) VALUES (?, ?)",
+            [(i, 10_000 + i) for i in range(50)]
+        )
+
+
+async def _loop_lag(stop: asyncio.Event, samples: list[float]):
+    """Retard de réveil d'une tâche périodique : ce que subirait le bot."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(LAG_TICK)
+        samples.append(time.perf_counter() - start - LAG_TICK)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🚀 Lancement
+# ────────────────────────────────────────────────────────────────────────────────
+async def main(nb_requests: int, concurrency: int, nb_players: int) -> int:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        await _seed(tmp_dir, nb_players)
+        runner = await admin_panel.start_admin(port=0, host="127.0.0.1")
+        port = runner.addresses[0][1]
+        base = f"http://127.0.0.1:{port}"
+
+        latencies: list[float] = []
+        errors = 0
+        lag: list[float] = []
+        stop = asyncio.Event()
+        sem = asyncio.Semaphore(concurrency)
+
+        try:
+            # unsafe=True : le cookie de session doit être accepté sur une adresse IP
+            async with aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar(unsafe=True)) as session:
+                async with session.post(f"{base}/login", data={"password": admin_panel.ADMIN_PASSWORD},
+                                        allow_redirects=False) as resp:
+                    if resp.status != 302:
+                        print("❌ Connexion au panneau refusée")
+                        return 1
+
+                async def one():
+                    nonlocal errors
+                    method, path, body = random.choice(REQUESTS)
+                    async with sem:
+                        start = time.perf_counter()
+                        async with session.request(method, base + path, json=body, allow_redirects=False) as resp:
+                            await resp.read()
+                            errors += resp.status != 200 or resp.content_type not in JSON_TYPES
+                        latencies.append(time.perf_counter() - start)
+
+                probe = asyncio.create_task(_loop_lag(stop, lag))
+                start = time.perf_counter()
+                await asyncio.gather(*(one() for _ in range(nb_requests)))
+                elapsed = time.perf_counter() - start
+                stop.set()
+                await probe
+        finally:
+            await runner.cleanup()
+            db.close()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    print(f"Requêtes : {nb_requests}  ·  Concurrence : {concurrency}  ·  Joueurs : {nb_players}")
+    print(f"Débit            : {nb_requests / elapsed:,.0f} req/s ({elapsed:.2f} s)")
+    print(f"Latence          : p50 {statistics.median(latencies) * 1000:.1f} ms  ·  "
+          f"p95 {p95 * 1000:.1f} ms  ·  max {latencies[-1] * 1000:.1f} ms")
+    print(f"Retard de boucle : moy. {statistics.mean(lag) * 1000:.2f} ms  ·  max {max(lag) * 1000:.2f} ms")
+    print("✅ Aucune erreur" if not errors else f"❌ {errors} réponse(s) en erreur")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    nb = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    conc = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    players = int(sys.argv[3]) if len(sys.argv) > 3 else 5000
+    sys.exit(asyncio.run(main(nb, conc, players)))
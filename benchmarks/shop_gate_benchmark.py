@@ -0,0 +1,104 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 shop_gate_benchmark.py — Coût des effets du ReiatsuShop par message reçu
+# Objectif : Mesurer les messages traités par seconde par message_router.dispatch
+#            avec l'intercepteur du shop, sans effet actif, avec beaucoup
+#            d'effets sur d'autres joueurs, pour des joueurs affectés (mise en
+#            file seulement) et en MP. Référence : un listener on_message par cog
+# Catégorie : Benchmark
+# Accès : Développeurs
+# Usage : python benchmarks/shop_gate_benchmark.py [nb_messages] [nb_effets]
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from commands.reiatsu.reiatsu_shop import ReiatsuShop, ZOMB, MUTE, RENAME
+from utils.message_router import MessageRouter
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+GUILD_ID = 1
+CHANNEL_ID = 10
+
+
+def _message(user_id: int, guild: bool = True):
+    return SimpleNamespace(
+        id=user_id,
+        content="bonjour à tous",
+        author=SimpleNamespace(id=user_id, bot=False),
+        guild=SimpleNamespace(id=GUILD_ID) if guild else None,
+        channel=SimpleNamespace(id=CHANNEL_ID),
+    )
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⏱️ Mesures
+# ────────────────────────────────────────────────────────────────────────────────
+def _rate(router: MessageRouter, messages: list, drain: asyncio.Queue | None = None) -> float:
+    start = time.perf_counter()
+    for i, message in enumerate(messages):
+        router.dispatch(message)
+        if drain is not None and i % 256 == 255:
+            while not drain.empty():  # pas de workers : on vide la file hors mesure utile
+                drain.get_nowait()
+                drain.task_done()
+    return len(messages) / (time.perf_counter() - start)
+
+
+async def _listener_rate(messages: list) -> float:
+    """Référence : discord.py crée une tâche par listener on_message et par message."""
+    effects = {}
+
+    async def listener(message):
+        if message.guild is None:
+            return
+        effects.get((message.guild.id, message.author.id))
+
+    start = time.perf_counter()
+    for i in range(0, len(messages), 256):
+        await asyncio.gather(*(asyncio.create_task(listener(m)) for m in messages[i:i + 256]))
+    return len(messages) / (time.perf_counter() - start)
+
+
+async def main(nb_messages: int, nb_effects: int) -> int:
+    shop = ReiatsuShop(None)
+    router = MessageRouter()
+    router.intercept("reiatsu_shop", shop.intercept)
+
+    others = [_message(1_000_000 + i) for i in range(nb_messages)]
+    affected = [_message(i % nb_effects) for i in range(nb_messages)]
+    dms = [_message(i, guild=False) for i in range(nb_messages)]
+
+    results = {"sans effet": _rate(router, others)}
+
+    bits = (ZOMB, MUTE, RENAME)
+    for user_id in range(nb_effects):
+        shop._set(GUILD_ID, user_id, bits[user_id % 3])
+
+    results[f"{nb_effects} effets, autres joueurs"] = _rate(router, others)
+    results["joueurs affectés (mise en file)"] = _rate(router, affected, drain=shop._rewrites)
+    results["messages privés"] = _rate(router, dms)
+    results["réf. listener on_message"] = await _listener_rate(others)
+
+    print(f"{'Scénario':<36} {'messages/s':>14} {'µs/message':>11}")
+    print("─" * 63)
+    for name, rate in results.items():
+        print(f"{name:<36} {rate:>14,.0f} {1e6 / rate:>11.2f}")
+    print(f"\nFile : {shop.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    nb = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    effects = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    sys.exit(asyncio.run(main(nb, effects)))
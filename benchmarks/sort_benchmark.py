@@ -0,0 +1,110 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 sort_benchmark.py — Comparatif des algorithmes de tri (utils.algorithms)
+# Objectif : Faire tourner tous les algorithmes sur plusieurs tailles et
+#            distributions d'entrée, vérifier le résultat et afficher un tableau
+#            comparaisons / swaps / temps
+# Catégorie : Benchmark
+# Accès : Développeurs
+# Usage : python benchmarks/sort_benchmark.py [--sizes 14,100] [--dists random,reversed]
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import argparse
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.algorithms import algorithms, run_sort
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+DEFAULT_SIZES = (2, 14, 100, 500)  # 2 et 14 : n % 3 == 2 (dernière paire de Centrifugal)
+SEED = 1234
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🎲 Distributions d'entrée
+# ────────────────────────────────────────────────────────────────────────────────
+def _random(n: int, rng: random.Random) -> list[int]:
+    data = list(range(1, n + 1))
+    rng.shuffle(data)
+    return data
+
+
+def _nearly_sorted(n: int, rng: random.Random) -> list[int]:
+    data = list(range(1, n + 1))
+    for _ in range(max(1, n // 20)):  # ~5 % de paires échangées
+        i, j = rng.randrange(n), rng.randrange(n)
+        data[i], data[j] = data[j], data[i]
+    return data
+
+
+DISTRIBUTIONS = {
+    "random":   _random,
+    "sorted":   lambda n, rng: list(range(1, n + 1)),
+    "reversed": lambda n, rng: list(range(n, 0, -1)),
+    "few":      lambda n, rng: [rng.randint(1, 5) for _ in range(n)],  # peu de valeurs distinctes
+    "nearly":   _nearly_sorted,
+}
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ▶️ Benchmark
+# ────────────────────────────────────────────────────────────────────────────────
+def main(sizes, distributions) -> int:
+    errors = 0
+    header = f"{'Algorithme':<17} {'Entrée':<9} {'n':>6} {'Comparaisons':>13} {'Swaps':>11} {'ms':>9}"
+    print(header)
+    print("─" * len(header))
+
+    for size in sizes:
+        for dist in distributions:
+            data = DISTRIBUTIONS[dist](size, random.Random(SEED))
+            expected = sorted(data)
+            for name, func in sorted(algorithms.items()):
+                # record=False : compteurs seulement, pas d'étapes en mémoire
+                trace = run_sort(func, data, record=False)
+                ok = trace.data == expected
+                errors += not ok
+                print(
+                    f"{name:<17} {dist:<9} {size:>6} {trace.comparisons:>13} "
+                    f"{trace.moves:>11} {trace.elapsed * 1000:>9.1f}" + ("" if ok else "  ❌ non trié")
+                )
+            print()
+
+    print("✅ Tous les tris sont corrects" if not errors else f"❌ {errors} résultat(s) incorrect(s)")
+    return 1 if errors else 0
+
+
+def _csv(kind, choices=None):
+    """Type argparse : liste séparée par des virgules."""
+    def parse(value: str) -> list:
+        try:
+            items = [kind(x) for x in value.split(",") if x]
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"liste invalide : {value}")
+        if kind is int and any(x < 1 for x in items):
+            raise argparse.ArgumentTypeError(f"tailles ≥ 1 attendues : {value}")
+        unknown = [x for x in items if choices is not None and x not in choices]
+        if unknown:
+            raise argparse.ArgumentTypeError(
+                f"inconnu(s) : {', '.join(map(str, unknown))} (choix : {', '.join(choices)})"
+            )
+        return items
+    return parse
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare les algorithmes de utils.algorithms et vérifie leur résultat.")
+    parser.add_argument("--sizes", type=_csv(int), default=list(DEFAULT_SIZES),
+                        help=f"tailles séparées par des virgules (défaut : {','.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument("--dists", type=_csv(str, DISTRIBUTIONS), default=list(DISTRIBUTIONS),
+                        help=f"distributions parmi {','.join(DISTRIBUTIONS)} (défaut : toutes)")
+    args = parser.parse_args()
+    sys.exit(main(args.sizes, args.dists))
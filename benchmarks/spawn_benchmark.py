@@ -0,0 +1,179 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 spawn_benchmark.py — Coût d'un spawn Reiatsu (requêtes SQL + appels Discord)
+# Objectif : Compter les requêtes SQLite et les appels API Discord par spawn
+#            (vrai et faux) et échouer si le budget attendu est dépassé
+# Catégorie : Benchmark
+# Accès : Développeurs
+# Usage : python benchmarks/spawn_benchmark.py [nb_spawns]
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from itertools import count
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # le spawner lit data/reiatsu_config.json en relatif
+
+import utils.discord_utils as discord_utils
+import utils.init_db as init_db_module
+from utils.database import db
+from tasks.reiatsu_spawner import ReiatsuSpawner
+from utils.timer_service import timer_service
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Budget par spawn (au-delà → régression)
+# ────────────────────────────────────────────────────────────────────────────────
+BUDGET = {
+    # UPDATE reiatsu_config (vitesse de spawn lue en mémoire)
+    "real": {"sql": 1, "api": 2, "timers": 0},
+    # UPDATE reiatsu (fake_spawn_*) + INSERT timers (expiration persistante)
+    "fake": {"sql": 2, "api": 2, "timers": 1},
+}
+
+API_CALLS = Counter()
+SQL_CALLS = Counter()
+_ids = count(1_000_000)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🎭 Objets Discord minimalistes (comptent les appels API)
+# ────────────────────────────────────────────────────────────────────────────────
+class BenchGuild:
+    def __init__(self, guild_id: int):
+        self.id = guild_id
+
+
+class BenchMessage:
+    def __init__(self, channel: "BenchChannel"):
+        self.id = next(_ids)
+        self.channel = channel
+
+    async def add_reaction(self, emoji):
+        API_CALLS["add_reaction"] += 1
+
+    async def delete(self):
+        API_CALLS["delete"] += 1
+
+
+class BenchChannel:
+    def __init__(self, channel_id: int, guild: BenchGuild):
+        self.id = channel_id
+        self.guild = guild
+
+    async def send(self, content=None, **kwargs):
+        API_CALLS["send"] += 1
+        return BenchMessage(self)
+
+    async def fetch_message(self, message_id: int):
+        API_CALLS["fetch_message"] += 1
+        return BenchMessage(self)
+
+
+class BenchBot:
+    def __init__(self, channels: dict[int, BenchChannel]):
+        self._channels = channels
+
+    def get_channel(self, channel_id: int):
+        return self._channels.get(channel_id)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔧 Préparation
+# ────────────────────────────────────────────────────────────────────────────────
+def _trace_sql(statement: str):
+    SQL_CALLS[statement.split(None, 1)[0].upper()] += 1
+
+
+async def _setup(tmp_dir: str, nb_guilds: int) -> tuple[ReiatsuSpawner, list[BenchChannel]]:
+    db.path = os.path.join(tmp_dir, "bench.db")
+    init_db_module.REIATSU_DB_PATH = db.path
+    init_db_module.init_db()
+
+    channels = [BenchChannel(10_000 + i, BenchGuild(i)) for i in range(nb_guilds)]
+    async with db.transaction() as tx:
+        await tx.executemany(
+            "INSERT INTO reiatsu_config (guild_id, channel_id, spawn_speed, is_spawn) VALUES (?, ?, 'Normal', 0)",
+            [(ch.guild.id, ch.id) for ch in channels]
+        )
+        await tx.executemany(
+            "INSERT INTO reiatsu (user_id, username, classe, active_skill) VALUES (?, ?, 'Illusionniste', 1)",
+            [(ch.guild.id, f"illu{ch.guild.id}") for ch in channels]
+        )
+
+    # Trace toutes les connexions du pool (après la préparation)
+    db._ensure_open()
+    db._writer.set_trace_callback(_trace_sql)
+    for conn in list(db._readers.queue):
+        conn.set_trace_callback(_trace_sql)
+
+    bot = BenchBot({ch.id: ch for ch in channels})
+    cog = ReiatsuSpawner(bot)
+    await cog.load_schedule()
+    return cog, channels
+
+
+async def _measure(cog: ReiatsuSpawner, channels: list[BenchChannel], kind: str) -> dict:
+    API_CALLS.clear()
+    SQL_CALLS.clear()
+    timers_before = timer_service.stats()["pending"]
+    start = time.perf_counter()
+
+    for ch in channels:
+        if kind == "real":
+            await cog._spawn_message(ch, ch.guild.id)
+        else:
+            await cog._spawn_message(ch, ch.guild.id, is_fake=True, owner_id=ch.guild.id)
+
+    elapsed = time.perf_counter() - start
+    n = len(channels)
+    return {
+        "sql":          sum(SQL_CALLS.values()) / n,
+        "api":          sum(API_CALLS.values()) / n,
+        "timers":       (timer_service.stats()["pending"] - timers_before) / n,
+        "ms":           elapsed * 1000 / n,
+        "detail_sql":   dict(SQL_CALLS),
+        "detail_api":   dict(API_CALLS),
+    }
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🚀 Lancement
+# ────────────────────────────────────────────────────────────────────────────────
+async def main(nb_spawns: int) -> int:
+    # Pas de limite globale dans la file sortante : seuls les appels comptent ici
+    discord_utils.outbound._global = discord_utils.TokenBucket(10**9, 1.0)
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cog, channels = await _setup(tmp_dir, nb_spawns)
+        try:
+            for kind in ("real", "fake"):
+                result = await _measure(cog, channels, kind)
+                print(f"── Spawn {kind} ({nb_spawns}×) ─────────────────────────")
+                print(f"  SQL / spawn       : {result['sql']:.2f}  {result['detail_sql']}")
+                print(f"  API / spawn       : {result['api']:.2f}  {result['detail_api']}")
+                print(f"  Minuteurs / spawn : {result['timers']:.2f}")
+                print(f"  Temps / spawn     : {result['ms']:.2f} ms")
+
+                for key, limit in BUDGET[kind].items():
+                    if result[key] > limit:
+                        failures += 1
+                        print(f"  ❌ {key} = {result[key]:.2f} > budget {limit}")
+        finally:
+            db.close()
+
+    print("✅ Budget respecté" if not failures else f"❌ {failures} dépassement(s) de budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    nb = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    sys.exit(asyncio.run(main(nb)))
@@ -10,7 +10,6 @@
 # ────────────────────────────────────────────────────────────────────────────────
 import os
 import asyncio
-import threading
 import logging
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -26,6 +25,10 @@ from discord import app_commands
 # ────────────────────────────────────────────────────────────────────────────────
 from utils.discord_utils import safe_send, safe_respond
 from utils.init_db import init_db
+from utils.database import db
+from utils.reiatsu_ledger import ledger
+from utils.message_router import message_router
+from utils.webhook_pool import webhook_pool
 from utils.logger import init_logger
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -109,6 +112,9 @@ async def on_message(message):
     if message.author.bot:
         return
 
+    # Jeux en cours dans ce salon (une recherche de dict si aucun)
+    message_router.dispatch(message)
+
     if message.content.strip() in (f"<@{bot.user.id}>", f"<@!{bot.user.id}>"):
         prefix = get_prefix(bot, message)
         embed = discord.Embed(
@@ -175,16 +181,21 @@ if __name__ == "__main__":
 
     init_logger()
 
-    from admin_panel import run_admin, set_bot
-    admin_thread = threading.Thread(target=run_admin, args=(ADMIN_PORT,), daemon=True)
-    admin_thread.start()
-    print(f"🌐 Panel admin lancé sur http://localhost:{ADMIN_PORT}")
+    from admin_panel import start_admin, set_bot
 
     async def start():
         init_db()
+        webhook_pool.attach(bot)  # avant les extensions : le pool ne dépend pas de tasks/webhook_cleanup
         await load_commands()
         await load_tasks()
         set_bot(bot)
-        await bot.start(TOKEN)
+        admin = await start_admin(ADMIN_PORT)  # même boucle et même pool SQLite que le bot
+        print(f"🌐 Panel admin lancé sur http://localhost:{ADMIN_PORT}")
+        try:
+            await bot.start(TOKEN)
+        finally:
+            await admin.cleanup()
+            await ledger.close()
+            db.close()
 
     asyncio.run(start())
@@ -16,7 +16,7 @@ from discord.ext import commands
 from discord.ui import View, Button
 
 from utils.discord_utils import safe_send, safe_respond
-from utils.init_db import get_conn
+from utils.database import db
 
 log = logging.getLogger(__name__)
 
@@ -24,14 +24,10 @@ log = logging.getLogger(__name__)
 # 🗄️ Accès base de données locale
 # ────────────────────────────────────────────────────────────────────────────────
 
-def db_get_tunnel_url() -> str | None:
+async def db_get_tunnel_url() -> str | None:
     """Récupère l'URL du tunnel Cloudflare stockée en base."""
     try:
-        conn   = get_conn()
-        cursor = conn.cursor()
-        cursor.execute("SELECT value FROM config WHERE key = 'tunnel_url'")
-        row = cursor.fetchone()
-        conn.close()
+        row = await db.fetchone("SELECT value FROM config WHERE key = 'tunnel_url'")
         return row[0] if row else None
     except Exception as e:
         log.exception("[admin_panel] Erreur lecture tunnel_url : %s", e)
@@ -64,9 +60,9 @@ class AdminPanelCog(commands.Cog):
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Fonction interne commune
     # ────────────────────────────────────────────────────────────────────────────
-    def _build_embed_and_view(self) -> tuple[discord.Embed, AdminPanelView | None]:
+    async def _build_embed_and_view(self) -> tuple[discord.Embed, AdminPanelView | None]:
         """Construit l'embed et la view en lisant l'URL depuis la base."""
-        url   = db_get_tunnel_url()
+        url   = await db_get_tunnel_url()
         embed = discord.Embed(
             title="🔒 Panneau Admin",
             description="Clique sur le bouton ci-dessous pour accéder au panneau d'administration.",
@@ -92,7 +88,7 @@ class AdminPanelCog(commands.Cog):
     @app_commands.checks.has_permissions(administrator=True)
     @app_commands.checks.cooldown(rate=1, per=5.0, key=lambda i: i.user.id)
     async def slash_admin_panel(self, interaction: discord.Interaction):
-        embed, view = self._build_embed_and_view()
+        embed, view = await self._build_embed_and_view()
         await safe_respond(
             interaction,
             embed=embed,
@@ -107,7 +103,7 @@ class AdminPanelCog(commands.Cog):
     @commands.has_permissions(administrator=True)
     @commands.cooldown(1, 5, commands.BucketType.user)
     async def prefix_admin_panel(self, ctx: commands.Context):
-        embed, view = self._build_embed_and_view()
+        embed, view = await self._build_embed_and_view()
         await safe_send(ctx.channel, embed=embed, view=view)
 
 # ────────────────────────────────────────────────────────────────────────────────
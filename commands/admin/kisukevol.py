@@ -19,7 +19,9 @@ from discord import app_commands
 from discord.ext import commands
 
 from utils.discord_utils import safe_send
-from utils.init_db import get_conn
+from utils.database import db
+from utils.profile_cache import profile_cache
+from utils.reiatsu_ledger import ledger
 
 log = logging.getLogger(__name__)
 
@@ -46,11 +48,8 @@ class KisukeVol(commands.Cog):
     # 🔹 Fonction interne commune
     # ────────────────────────────────────────────────────────────────────────────
     async def _kisukevol_logic(self, channel: discord.abc.Messageable, guild: discord.Guild):
-        conn   = get_conn()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT * FROM reiatsu WHERE points > 0")
-        rows = cursor.fetchall()
+        await ledger.flush()
+        rows = await db.fetchall("SELECT * FROM reiatsu WHERE points > 0")
 
         kisuke_id = int(self.bot.user.id)
 
@@ -61,19 +60,16 @@ class KisukeVol(commands.Cog):
 
         if not membres_db:
             await safe_send(channel, "⚠️ Aucun membre valide trouvé avec du Reiatsu.")
-            conn.close()
             return
 
         cible_row = random.choice(membres_db)
         cible_id  = int(cible_row[0])
         cible     = guild.get_member(cible_id)
 
-        cursor.execute("SELECT * FROM reiatsu WHERE user_id = ?", (kisuke_id,))
-        kisuke_data = cursor.fetchone()
+        kisuke_data = await db.fetchone("SELECT * FROM reiatsu WHERE user_id = ?", (kisuke_id,))
 
         if not kisuke_data:
             await safe_send(channel, "⚠️ Impossible de charger le profil de Kisuke.")
-            conn.close()
             return
 
         kisuke_points      = kisuke_data[2] or 0
@@ -100,7 +96,6 @@ class KisukeVol(commands.Cog):
                         channel,
                         f"⏳ Kisuke doit encore attendre **{j}j {h}h{m}m** avant de retenter."
                     )
-                    conn.close()
                     return
 
             except Exception:
@@ -111,47 +106,54 @@ class KisukeVol(commands.Cog):
 
         if cible_points == 0:
             await safe_send(channel, f"⚠️ {cible.mention} n'a pas de Reiatsu à voler.")
-            conn.close()
             return
 
         if kisuke_points == 0:
             await safe_send(channel, "⚠️ Kisuke doit avoir au moins **1 point** de Reiatsu pour tenter un vol.")
-            conn.close()
             return
 
         montant = max(1, cible_points // 50)
 
-        if kisuke_classe == "Voleur" and kisuke_active_skill:
+        skill_utilise = kisuke_classe == "Voleur" and kisuke_active_skill
+        if skill_utilise:
             succes   = True
             montant *= 2
-            cursor.execute("UPDATE reiatsu SET active_skill = 0 WHERE user_id = ?", (kisuke_id,))
         else:
             succes = random.random() < (
                 VOL_PROBA_VOLEUR if kisuke_classe == "Voleur" else VOL_PROBA_AUTRE
             )
 
-        cursor.execute(
-            "UPDATE reiatsu SET last_steal_attempt = ? WHERE user_id = ?",
-            (now.isoformat(), kisuke_id)
-        )
+        illusion = succes and cible_classe == "Illusionniste" and random.random() < 0.5
 
-        if succes:
-            cursor.execute(
-                "UPDATE reiatsu SET points = points + ? WHERE user_id = ?",
-                (montant, kisuke_id)
+        async with db.transaction() as tx:
+            if skill_utilise:
+                await tx.execute("UPDATE reiatsu SET active_skill = 0 WHERE user_id = ?", (kisuke_id,))
+
+            await tx.execute(
+                "UPDATE reiatsu SET last_steal_attempt = ? WHERE user_id = ?",
+                (now.isoformat(), kisuke_id)
             )
 
-            if cible_classe == "Illusionniste" and random.random() < 0.5:
+            if succes:
+                await tx.execute(
+                    "UPDATE reiatsu SET points = points + ? WHERE user_id = ?",
+                    (montant, kisuke_id)
+                )
+                if not illusion:
+                    await tx.execute(
+                        "UPDATE reiatsu SET points = MAX(points - ?, 0) WHERE user_id = ?",
+                        (montant, cible_id)
+                    )
+        profile_cache.invalidate(kisuke_id, cible_id)
+
+        if succes:
+            if illusion:
                 await safe_send(
                     channel,
                     f"🩸 Kisuke a volé **{montant}** points à {cible.mention}... "
                     f"mais c'était une illusion, {cible.mention} n'a rien perdu !"
                 )
             else:
-                cursor.execute(
-                    "UPDATE reiatsu SET points = MAX(points - ?, 0) WHERE user_id = ?",
-                    (montant, cible_id)
-                )
                 await safe_send(
                     channel,
                     f"🩸 Kisuke a réussi à voler **{montant}** points de Reiatsu à {cible.mention} !"
@@ -162,9 +164,6 @@ class KisukeVol(commands.Cog):
                 f"😵 Kisuke a tenté de voler {cible.mention}... mais a échoué !"
             )
 
-        conn.commit()
-        conn.close()
-
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Commande SLASH
     # ────────────────────────────────────────────────────────────────────────────
@@ -21,7 +21,9 @@ from discord import app_commands, ui
 from discord.ext import commands
 
 from utils.discord_utils import safe_send, safe_respond, safe_interact, safe_edit
-from utils.init_db import get_conn
+from utils.database import db
+from utils.profile_cache import profile_cache
+from utils.reiatsu_ledger import ledger
 
 log = logging.getLogger(__name__)
 
@@ -35,6 +37,12 @@ with open(CONFIG_PATH, "r", encoding="utf-8") as f:
 SPAWN_SPEED_RANGES  = CONFIG["SPAWN_SPEED_RANGES"]
 DEFAULT_SPAWN_SPEED = CONFIG["DEFAULT_SPAWN_SPEED"]
 
+async def refresh_spawn_schedule(bot: commands.Bot, guild_id: int):
+    """Prévient le planificateur du spawner qu'une config de serveur a changé."""
+    spawner = bot.get_cog("ReiatsuSpawner")
+    if spawner:
+        await spawner.refresh_guild(guild_id)
+
 # ────────────────────────────────────────────────────────────────────────────────
 # 🎛️ UI — View boutons vitesse (partagée prefix + slash)
 # ────────────────────────────────────────────────────────────────────────────────
@@ -68,13 +76,11 @@ class SpeedButton(ui.Button):
         min_delay, max_delay = SPAWN_SPEED_RANGES[new_speed_name]
         new_delay            = random.randint(min_delay, max_delay)
 
-        with get_conn() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                "UPDATE reiatsu_config SET spawn_delay = ?, spawn_speed = ? WHERE guild_id = ?",
-                (new_delay, new_speed_name, self.guild_id)
-            )
-            conn.commit()
+        await db.execute(
+            "UPDATE reiatsu_config SET spawn_delay = ?, spawn_speed = ? WHERE guild_id = ?",
+            (new_delay, new_speed_name, self.guild_id)
+        )
+        await refresh_spawn_schedule(interaction.client, self.guild_id)
 
         await safe_interact(
             interaction,
@@ -123,53 +129,42 @@ class ReiatsuAdmin(commands.Cog):
         now_iso       = datetime.utcnow().isoformat()
         delay         = random.randint(*SPAWN_SPEED_RANGES[DEFAULT_SPAWN_SPEED])
         default_speed = DEFAULT_SPAWN_SPEED
-        with get_conn() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT * FROM reiatsu_config WHERE guild_id = ?", (guild_id,))
-            if cur.fetchone():
-                cur.execute("""
+        async with db.transaction() as tx:
+            if await tx.fetchone("SELECT * FROM reiatsu_config WHERE guild_id = ?", (guild_id,)):
+                await tx.execute("""
                     UPDATE reiatsu_config
                     SET channel_id = ?, last_spawn_at = ?, spawn_delay = ?, spawn_speed = ?, is_spawn = 0, message_id = NULL
                     WHERE guild_id = ?
                 """, (channel_id, now_iso, delay, default_speed, guild_id))
             else:
-                cur.execute("""
+                await tx.execute("""
                     INSERT INTO reiatsu_config(guild_id, channel_id, last_spawn_at, spawn_delay, spawn_speed, is_spawn)
                     VALUES (?, ?, ?, ?, ?, 0)
                 """, (guild_id, channel_id, now_iso, delay, default_speed))
-            conn.commit()
+        await refresh_spawn_schedule(self.bot, guild_id)
         return default_speed
 
     async def _unset_logic(self, guild_id: int) -> bool:
-        with get_conn() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT * FROM reiatsu_config WHERE guild_id = ?", (guild_id,))
-            if cur.fetchone():
-                cur.execute("DELETE FROM reiatsu_config WHERE guild_id = ?", (guild_id,))
-                conn.commit()
-                return True
-        return False
+        cur = await db.execute("DELETE FROM reiatsu_config WHERE guild_id = ?", (guild_id,))
+        await refresh_spawn_schedule(self.bot, guild_id)
+        return cur.rowcount > 0
 
     async def _change_logic(self, member: discord.Member, points: int) -> str:
         user_id  = member.id
         username = member.display_name
-        with get_conn() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT * FROM reiatsu WHERE user_id = ?", (user_id,))
-            if cur.fetchone():
-                cur.execute("UPDATE reiatsu SET points = ? WHERE user_id = ?", (points, user_id))
+        await ledger.flush()  # évite qu'une variation en attente s'applique après le nouveau score
+        async with db.transaction() as tx:
+            if await tx.fetchone("SELECT * FROM reiatsu WHERE user_id = ?", (user_id,)):
+                await tx.execute("UPDATE reiatsu SET points = ? WHERE user_id = ?", (points, user_id))
                 status = "🔄 Score mis à jour"
             else:
-                cur.execute("INSERT INTO reiatsu(user_id, username, points) VALUES (?, ?, ?)", (user_id, username, points))
+                await tx.execute("INSERT INTO reiatsu(user_id, username, points) VALUES (?, ?, ?)", (user_id, username, points))
                 status = "🆕 Nouveau score enregistré"
-            conn.commit()
+        profile_cache.invalidate(user_id)
         return status
 
     async def _speed_logic(self, guild_id: int) -> tuple | None:
-        with get_conn() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT spawn_delay, spawn_speed FROM reiatsu_config WHERE guild_id = ?", (guild_id,))
-            return cur.fetchone()
+        return await db.fetchone("SELECT spawn_delay, spawn_speed FROM reiatsu_config WHERE guild_id = ?", (guild_id,))
 
     async def _spawn_logic(self, channel: discord.abc.Messageable):
         embed   = discord.Embed(
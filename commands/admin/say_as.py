@@ -16,6 +16,7 @@ from discord import app_commands
 from discord.ext import commands
 
 from utils.discord_utils import safe_send, safe_delete, safe_followup
+from utils.webhook_pool import webhook_pool
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -67,15 +68,12 @@ class SayAs(commands.Cog):
         if len(message) > 2000:
             message = message[:1997] + "..."
 
-        webhook = await channel.create_webhook(name=f"tmp-{target.name}")
-        try:
-            await webhook.send(
-                content=message,
-                username=target.display_name,
-                avatar_url=target.display_avatar.url
-            )
-        finally:
-            await webhook.delete()
+        await webhook_pool.send(
+            channel,
+            content=message,
+            username=target.display_name,
+            avatar_url=target.display_avatar.url
+        )
 
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Commande SLASH
@@ -19,7 +19,7 @@ from discord import app_commands
 from discord.ext import commands
 
 from utils.discord_utils import safe_send, safe_respond, safe_followup
-from utils.init_db import get_conn
+from utils.quests import complete_quest
 
 log = logging.getLogger(__name__)
 
@@ -37,48 +37,6 @@ def load_characters() -> list:
         log.exception("[bmoji] Impossible de charger %s : %s", DATA_JSON_PATH, e)
         return []
 
-# ────────────────────────────────────────────────────────────────────────────────
-# 🗄️ Accès base de données locale
-# ────────────────────────────────────────────────────────────────────────────────
-
-def db_valider_quete(user_id: int) -> int | None:
-    """
-    Vérifie si la quête 'bmoji' est déjà validée pour l'utilisateur.
-    Si non, l'ajoute et incrémente le niveau.
-    Retourne le nouveau niveau si la quête vient d'être validée, sinon None.
-    """
-    try:
-        conn   = get_conn()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT quetes, niveau FROM reiatsu WHERE user_id = ?", (user_id,))
-        row = cursor.fetchone()
-
-        if not row:
-            conn.close()
-            return None
-
-        quetes = json.loads(row[0] or "[]")
-        niveau = row[1] or 0
-
-        if "bmoji" in quetes:
-            conn.close()
-            return None
-
-        quetes.append("bmoji")
-        new_lvl = niveau + 1
-        cursor.execute(
-            "UPDATE reiatsu SET quetes = ?, niveau = ? WHERE user_id = ?",
-            (json.dumps(quetes), new_lvl, user_id)
-        )
-        conn.commit()
-        conn.close()
-        return new_lvl
-
-    except Exception as e:
-        log.exception("[bmoji] Erreur validation quête SQLite : %s", e)
-        return None
-
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
 # ────────────────────────────────────────────────────────────────────────────────
@@ -94,7 +52,7 @@ class BMojiCommand(commands.Cog):
     # ────────────────────────────────────────────────────────────────────────────
     async def _valider_quete_bmoji(self, user: discord.User | discord.Member, channel: discord.abc.Messageable):
         """Valide la quête 'bmoji' et envoie un embed de félicitations si nécessaire."""
-        new_lvl = db_valider_quete(user.id)
+        new_lvl = await complete_quest(user.id, "bmoji")
         if new_lvl is None:
             return
         embed = discord.Embed(
@@ -10,57 +10,12 @@
 # 📦 Imports nécessaires
 # ────────────────────────────────────────────────────────────────────────────────
 import random
-import json
-import logging
 import discord
 from discord import app_commands
 from discord.ext import commands
 
 from utils.discord_utils import safe_send, safe_edit, safe_respond, safe_interact
-from utils.init_db import get_conn
-
-log = logging.getLogger(__name__)
-
-# ────────────────────────────────────────────────────────────────────────────────
-# 🗄️ Accès base de données locale
-# ────────────────────────────────────────────────────────────────────────────────
-def db_valider_quete(user_id: int) -> int | None:
-    """
-    Vérifie si la quête 'couleur' est déjà validée pour l'utilisateur.
-    Si non, l'ajoute et incrémente le niveau.
-    Retourne le nouveau niveau si la quête vient d'être validée, sinon None.
-    """
-    try:
-        conn   = get_conn()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT quetes, niveau FROM reiatsu WHERE user_id = ?", (user_id,))
-        row = cursor.fetchone()
-
-        if not row:
-            conn.close()
-            return None
-
-        quetes = json.loads(row[0] or "[]")
-        niveau = row[1] or 1
-
-        if "couleur" in quetes:
-            conn.close()
-            return None
-
-        quetes.append("couleur")
-        new_lvl = niveau + 1
-        cursor.execute(
-            "UPDATE reiatsu SET quetes = ?, niveau = ? WHERE user_id = ?",
-            (json.dumps(quetes), new_lvl, user_id)
-        )
-        conn.commit()
-        conn.close()
-        return new_lvl
-
-    except Exception as e:
-        log.exception("[couleur] Erreur validation quête SQLite : %s", e)
-        return None
+from utils.quests import complete_quest
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🎛️ Vue interactive avec bouton "Nouvelle couleur"
@@ -118,7 +73,7 @@ class CouleurCommand(commands.Cog):
         interaction: discord.Interaction | None     = None
     ):
         """Valide la quête 'couleur' et envoie un embed de félicitations si nécessaire."""
-        new_lvl = db_valider_quete(user.id)
+        new_lvl = await complete_quest(user.id, "couleur")
         if new_lvl is None:
             return
 
@@ -12,9 +12,8 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import asyncio
 from utils.discord_utils import safe_send, safe_respond  # ✅ Utilitaires sécurisés
-from utils.gpt_oss_client import get_simple_response     # 🔗 Client GPT-OSS
+from utils import gpt_oss_client                          # 🔗 Client GPT-OSS (async)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -26,6 +25,9 @@ class GPTChat(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    async def cog_unload(self):
+        await gpt_oss_client.close()
+
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Commande SLASH : /gpt <message>
     # ────────────────────────────────────────────────────────────────────────────
@@ -72,8 +74,8 @@ class GPTChat(commands.Cog):
             return
 
         try:
-            # 🔄 Exécution du modèle sur un thread asynchrone
-            response = await asyncio.to_thread(get_simple_response, prompt)
+            # 🔄 Appel non bloquant (file par utilisateur + cache des prompts identiques)
+            response = await gpt_oss_client.get_simple_response(prompt, user_id=user.id)
 
             # ─────────────── Vérifications de sécurité ───────────────
             if not response or response.startswith("⚠️"):
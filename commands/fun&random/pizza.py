@@ -20,7 +20,7 @@ from discord.ext import commands
 from discord.ui import View, button
 
 from utils.discord_utils import safe_send, safe_edit, safe_respond, safe_interact
-from utils.init_db import get_conn
+from utils.quests import complete_quest
 
 log = logging.getLogger(__name__)
 
@@ -38,48 +38,6 @@ def load_data() -> dict:
         log.exception("[pizza] Impossible de charger %s : %s", DATA_JSON_PATH, e)
         return {}
 
-# ────────────────────────────────────────────────────────────────────────────────
-# 🗄️ Accès base de données locale
-# ────────────────────────────────────────────────────────────────────────────────
-
-def db_valider_quete(user_id: int) -> int | None:
-    """
-    Vérifie si la quête 'pizza' est déjà validée pour l'utilisateur.
-    Si non, l'ajoute et incrémente le niveau.
-    Retourne le nouveau niveau si la quête vient d'être validée, sinon None.
-    """
-    try:
-        conn   = get_conn()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT quetes, niveau FROM reiatsu WHERE user_id = ?", (user_id,))
-        row = cursor.fetchone()
-
-        if not row:
-            conn.close()
-            return None
-
-        quetes = json.loads(row[0] or "[]")
-        niveau = row[1] or 1
-
-        if "pizza" in quetes:
-            conn.close()
-            return None
-
-        quetes.append("pizza")
-        new_lvl = niveau + 1
-        cursor.execute(
-            "UPDATE reiatsu SET quetes = ?, niveau = ? WHERE user_id = ?",
-            (json.dumps(quetes), new_lvl, user_id)
-        )
-        conn.commit()
-        conn.close()
-        return new_lvl
-
-    except Exception as e:
-        log.exception("[pizza] Erreur validation quête SQLite : %s", e)
-        return None
-
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧩 Génération d'une pizza aléatoire (embed)
 # ────────────────────────────────────────────────────────────────────────────────
@@ -142,7 +100,7 @@ class PizzaAleatoire(commands.Cog):
     # ────────────────────────────────────────────────────────────────────────────
     async def _valider_quete(self, user: discord.User | discord.Member, channel: discord.abc.Messageable | None = None):
         """Valide la quête 'pizza' et envoie un embed de félicitations si nécessaire."""
-        new_lvl = db_valider_quete(user.id)
+        new_lvl = await complete_quest(user.id, "pizza")
         if new_lvl is None:
             return
         embed = discord.Embed(
@@ -12,10 +12,22 @@
 import discord
 import random
 import asyncio
+import time
 from discord import app_commands
 from discord.ext import commands
-from utils.discord_utils import safe_send, safe_respond
-from utils.algorithms import algorithms as all_algos  # ✅ Import des algorithmes
+from utils.discord_utils import safe_send, safe_respond, safe_edit
+from utils.algorithms import algorithms as all_algos, run_sort  # ✅ Import des algorithmes
+from utils.sort_frames import trace_keyframes
+from utils.sort_renderer import sort_renderer, MAX_BARS
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Paramètres d'animation
+# ────────────────────────────────────────────────────────────────────────────────
+EDIT_INTERVAL  = 1.0   # secondes minimum entre deux éditions (≤ 1 édition/s)
+MAX_EDITS      = 15    # images clés affichées en mode live (hors première et dernière)
+GIF_MODES      = ("gif", "anim", "animation")
+GIF_SEED_POOL  = 64    # graines possibles : les mêmes tris reviennent du cache disque
+LIVE_BARS      = 12    # barres emoji en mode live
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Visualisation des barres
@@ -56,27 +68,40 @@ class Sorting(commands.Cog):
             for name, func in all_algos.items()
         }
 
-    async def visualize_sorting(self, channel_or_interaction, algorithm_name: str):
+    def cog_unload(self):
+        sort_renderer.shutdown()
+
+    async def visualize_sorting(self, channel_or_interaction, algorithm_name: str, mode: str = "live",
+                                size: int = LIVE_BARS):
+        """
+        - live : le tri est exécuté en entier (trace compacte), puis quelques
+                 images clés sont affichées en éditant le même message (≤ 1 édition/s)
+        - gif  : une seule animation uploadée, jusqu'à MAX_BARS barres
+        """
         algo_info = self.algorithms[algorithm_name]
-        data = list(range(1, 13))
+
+        if mode in GIF_MODES:
+            await self._send_gif(channel_or_interaction, algorithm_name, algo_info, size)
+            return
+
+        data = list(range(1, LIVE_BARS + 1))
         random.shuffle(data)
-        algo = algo_info["func"]
-        delay = 0.25
+        trace = run_sort(algo_info["func"], data)
+        iterations = trace.moves
+        # état initial + MAX_EDITS images intermédiaires + état final
+        frames = trace_keyframes(trace, MAX_EDITS + 2)
+
         msg = None
-        iteration = 0
 
         async def send(embed):
             nonlocal msg
-            if isinstance(channel_or_interaction, discord.Interaction):
-                if msg:
-                    await msg.edit(embed=embed)
-                else:
-                    msg = await safe_respond(channel_or_interaction, embed=embed)
+            if msg:
+                await safe_edit(msg, embed=embed)
+            elif isinstance(channel_or_interaction, discord.Interaction):
+                await safe_respond(channel_or_interaction, embed=embed)
+                msg = await channel_or_interaction.original_response()
             else:
-                if msg:
-                    await msg.edit(embed=embed)
-                else:
-                    msg = await safe_send(channel_or_interaction, embed=embed)
+                msg = await safe_send(channel_or_interaction, embed=embed)
 
         # première étape
         embed = discord.Embed(
@@ -86,48 +111,102 @@ class Sorting(commands.Cog):
         )
         await send(embed)
 
-        # visualisation dynamique
-        async for step, highlight in algo(data.copy()):
-            iteration += 1
-            await asyncio.sleep(delay)
+        # images clés : le rythme s'adapte au temps réel d'une édition
+        interval = EDIT_INTERVAL
+        for step, values, highlight in frames[1:-1]:
+            await asyncio.sleep(interval)
+            start = time.monotonic()
             embed = discord.Embed(
-                title=f"🔄 {algorithm_name} — Étape {iteration}",
-                description=f"{algo_info['desc']}\n```\n{render_bars(step, highlight)}\n```",
+                title=f"🔄 {algorithm_name} — Étape {step}/{iterations}",
+                description=f"{algo_info['desc']}\n```\n{render_bars(values, highlight)}\n```",
                 color=discord.Color.orange()
             )
             await send(embed)
+            interval = max(0.0, EDIT_INTERVAL - (time.monotonic() - start))
 
         # résultat final
-        sorted_data = sorted(data)
+        await asyncio.sleep(interval)
+        await send(self._final_embed(algorithm_name, algo_info, trace))
+
+    def _final_embed(self, algorithm_name: str, algo_info: dict, trace) -> discord.Embed:
         embed = discord.Embed(
             title=f"✅ {algorithm_name} terminé !",
-            description=f"{algo_info['desc']}\n```\n{render_bars(sorted_data)}\n```",
+            description=f"{algo_info['desc']}\n```\n{render_bars(trace.data)}\n```",
             color=discord.Color.green()
         )
-        embed.add_field(name="🧮 Itérations totales", value=f"{iteration}", inline=False)
-        await send(embed)
+        embed.add_field(name="🧮 Itérations totales", value=f"{trace.moves}", inline=True)
+        embed.add_field(name="🔍 Comparaisons", value=f"{trace.comparisons}", inline=True)
+        return embed
+
+    async def _send_gif(self, channel_or_interaction, algorithm_name: str, algo_info: dict, size: int):
+        """Récupère (ou fait encoder par le pool de rendu) l'animation et l'envoie en un seul message."""
+        if isinstance(channel_or_interaction, discord.Interaction):
+            await channel_or_interaction.response.defer(thinking=True)
+
+        size = max(2, min(size, MAX_BARS))
+        seed = random.randrange(GIF_SEED_POOL)
+        try:
+            path, iterations = await sort_renderer.get(algorithm_name, seed, size)
+        except Exception as e:
+            print(f"[ERREUR sorting gif] {e}")
+            msg = "❌ Impossible de générer l'animation pour le moment."
+            if isinstance(channel_or_interaction, discord.Interaction):
+                await channel_or_interaction.followup.send(msg)
+            else:
+                await safe_send(channel_or_interaction, msg)
+            return
+        file = discord.File(path, filename="sorting.gif")
+
+        embed = discord.Embed(
+            title=f"✅ {algorithm_name} terminé !",
+            description=algo_info["desc"],
+            color=discord.Color.green()
+        )
+        embed.add_field(name="📊 Barres", value=f"{size}", inline=True)
+        embed.add_field(name="🧮 Itérations totales", value=f"{iterations}", inline=True)
+        embed.set_image(url="attachment://sorting.gif")
+
+        if isinstance(channel_or_interaction, discord.Interaction):
+            await channel_or_interaction.followup.send(embed=embed, file=file)
+        else:
+            await safe_send(channel_or_interaction, embed=embed, file=file)
 
     # ────────────────────────────────────────────────────────────────────────────
     # Commande SLASH
     # ────────────────────────────────────────────────────────────────────────────
     @app_commands.command(name="sorting",description="Visualise un algorithme de tri en temps réel.")
-    @app_commands.describe(algorithme="Trie 12 barres en longueurs différentes selon un algorithme.")
+    @app_commands.describe(
+        algorithme="Trie 12 barres en longueurs différentes selon un algorithme.",
+        mode="live (le message s'anime) ou gif (une animation envoyée d'un coup)",
+        taille=f"Nombre de barres en mode gif (2 à {MAX_BARS})"
+    )
     @app_commands.checks.cooldown(1, 10.0, key=lambda i: i.user.id)
-    async def slash_sorting(self, interaction: discord.Interaction, algorithme: str = None):
-        await self.handle_sorting(interaction, algorithme)
+    async def slash_sorting(self, interaction: discord.Interaction, algorithme: str = None, mode: str = "live",
+                            taille: int = LIVE_BARS):
+        await self.handle_sorting(interaction, algorithme, mode.strip().lower(), taille)
 
     # ────────────────────────────────────────────────────────────────────────────
     # Commande PREFIX
     # ────────────────────────────────────────────────────────────────────────────
-    @commands.command(name="sorting", aliases=["sort"], help="Trie 12 barres en longueurs différentes selon un algorithme.")
+    @commands.command(name="sorting", aliases=["sort"], help="Trie 12 barres en longueurs différentes selon un algorithme. Ajoute `gif [barres]` à la fin pour une animation.")
     @commands.cooldown(1, 10.0, commands.BucketType.user)
     async def prefix_sorting(self, ctx: commands.Context, *, algorithme: str = None):
-        await self.handle_sorting(ctx.channel, algorithme)
+        # « !!sorting bubble sort gif » / « !!sorting 3 gif 150 » → mode gif
+        mode, size = "live", LIVE_BARS
+        if algorithme:
+            words = algorithme.split()
+            if len(words) >= 2 and words[-1].isdigit() and words[-2].lower() in GIF_MODES:
+                size = int(words.pop())
+            if words[-1].lower() in GIF_MODES:
+                mode = words.pop().lower()
+                algorithme = " ".join(words) or "random"
+        await self.handle_sorting(ctx.channel, algorithme, mode, size)
 
     # ────────────────────────────────────────────────────────────────────────────
     # Gestion logique commune
     # ────────────────────────────────────────────────────────────────────────────
-    async def handle_sorting(self, channel_or_interaction, algorithme: str = None):
+    async def handle_sorting(self, channel_or_interaction, algorithme: str = None, mode: str = "live",
+                             size: int = LIVE_BARS):
         algos_list = sorted(self.algorithms.keys())
         algo_dict = {str(i + 1): name for i, name in enumerate(algos_list)}
 
@@ -142,7 +221,7 @@ class Sorting(commands.Cog):
                 value="\n".join([f"**{i+1}.** {name}" for i, name in enumerate(algos_list)]),
                 inline=False
             )
-            embed.set_footer(text="Exemples : /sorting 3 | /sorting Bubble Sort | /sorting random")
+            embed.set_footer(text="Exemples : /sorting 3 | /sorting Bubble Sort | /sorting random | !!sorting 3 gif 150")
             if isinstance(channel_or_interaction, discord.Interaction):
                 await safe_respond(channel_or_interaction, embed=embed)
             else:
@@ -170,7 +249,7 @@ class Sorting(commands.Cog):
                 return
             algo_name = matched
 
-        await self.visualize_sorting(channel_or_interaction, algo_name)
+        await self.visualize_sorting(channel_or_interaction, algo_name, mode, size)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Setup du Cog
@@ -14,6 +14,7 @@ import re
 from discord import app_commands
 from discord.ext import commands
 from utils.discord_utils import safe_send, safe_delete, safe_respond
+from utils.webhook_pool import webhook_pool
 
 # ──────────────────────────────────────────────────────────────
 # 🔹 Vue pour les messages secrets
@@ -87,15 +88,11 @@ class Say(commands.Cog):
         message = self._replace_custom_emojis(channel, message)
         if len(message) > 2000:
             message = message[:1997] + "..."
-        webhook = await channel.create_webhook(name=f"tmp-{user.name}")
-        try:
-            if embed:
-                embed_obj = discord.Embed(description=message, color=discord.Color.blurple())
-                await webhook.send(username=user.display_name, avatar_url=user.display_avatar.url, embed=embed_obj)
-            else:
-                await webhook.send(username=user.display_name, avatar_url=user.display_avatar.url, content=message)
-        finally:
-            await webhook.delete()
+        if embed:
+            embed_obj = discord.Embed(description=message, color=discord.Color.blurple())
+            await webhook_pool.send(channel, username=user.display_name, avatar_url=user.display_avatar.url, embed=embed_obj)
+        else:
+            await webhook_pool.send(channel, username=user.display_name, avatar_url=user.display_avatar.url, content=message)
 
     # ──────────────────────────────────────────────────────────────
     # 🔹 Remplacement emojis custom (avec affichage correct)
@@ -12,38 +12,11 @@
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
-import random, aiohttp, unicodedata, asyncio
-from spellchecker import SpellChecker
+import random, asyncio
+from utils.spell_service import spell_service
 from utils.discord_utils import safe_send, safe_edit
-
-# ────────────────────────────────────────────────────────────────────────────────
-# 🌐 Initialisation du spellchecker français
-# ────────────────────────────────────────────────────────────────────────────────
-spell = SpellChecker(language='fr')
-
-# ────────────────────────────────────────────────────────────────────────────────
-# 🌐 Fonction pour récupérer un mot français aléatoire
-# ────────────────────────────────────────────────────────────────────────────────
-async def get_random_french_word(length: int | None = None) -> str:
-    url = "https://trouve-mot.fr/api/random"
-    if length:
-        url += f"?size={length}"
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=5) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    if isinstance(data, list) and len(data) > 0:
-                        return data[0]["name"].upper()
-    except Exception as e:
-        print(f"[ERREUR API Anagramme] {e}")
-    return "PYTHON"
-
-# ────────────────────────────────────────────────────────────────────────────────
-# 🌐 Vérification d’un mot via SpellChecker
-# ────────────────────────────────────────────────────────────────────────────────
-def is_valid_word(word: str) -> bool:
-    return word.lower() in spell.word_frequency
+from utils.word_index import word_index, signature
+from utils.message_router import message_router, Route
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🎮 Vue principale du jeu
@@ -62,14 +35,9 @@ class AnagrammeView:
         self.attempts: list[dict] = []  # {'word': str, 'author': str}
         self.message = None
         self.finished = False
+        self.won = False
         self.start_time = asyncio.get_event_loop().time()
 
-    def remove_accents(self, text: str) -> str:
-        return ''.join(
-            c for c in unicodedata.normalize('NFD', text)
-            if unicodedata.category(c) != 'Mn'
-        ).upper()
-
     def build_embed(self) -> discord.Embed:
         mode_text = "Solo 🧍‍♂️" if not self.multi else "Multi 🌍"
         embed = discord.Embed(
@@ -109,13 +77,19 @@ class AnagrammeView:
 
         # Fin de partie
         if self.finished:
-            last_word = self.attempts[-1]['word'] if self.attempts else ""
-            if self.remove_accents(last_word) == self.remove_accents(self.target_word):
+            if self.won:
                 embed.color = discord.Color.green()
                 embed.set_footer(text="🎉 Bravo ! Le mot a été trouvé.")
             else:
                 embed.color = discord.Color.red()
                 embed.set_footer(text=f"💀 Partie terminée. Le mot était {self.target_word}.")
+            solutions = word_index.anagrams(self.target_word)
+            if solutions:
+                embed.add_field(
+                    name="🔤 Anagrammes valides",
+                    value=", ".join(w.upper() for w in solutions)[:1024],
+                    inline=False
+                )
         else:
             elapsed = int(asyncio.get_event_loop().time() - self.start_time)
             remaining = max(0, 180 - elapsed)
@@ -136,13 +110,14 @@ class AnagrammeView:
         # Vérification
         if len(filtered_guess) != self.display_length:
             return await safe_send(channel, f"⚠️ Le mot doit faire {self.display_length} lettres.")
-        if not is_valid_word(filtered_guess):
+        if not spell_service.is_valid(filtered_guess):
             return await safe_send(channel, f"❌ `{filtered_guess}` n’est pas reconnu comme un mot valide.")
 
         self.attempts.append({'word': filtered_guess, 'author': author_name})
 
-        # Fin si trouvé ou max essais (solo)
-        if self.remove_accents(filtered_guess) == self.remove_accents(self.target_word):
+        # Fin si trouvé (n'importe quel anagramme valide) ou max essais (solo)
+        if signature(filtered_guess) == signature(self.target_word):
+            self.won = True
             self.finished = True
         elif not self.multi and len(self.attempts) >= self.max_attempts:
             self.finished = True
@@ -168,28 +143,61 @@ class Anagramme(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.active_games: dict[int, AnagrammeView] = {}  # channel_id -> vue de jeu
+        self.routes: dict[int, Route] = {}                 # channel_id -> abonnement message_router
+
+    async def cog_load(self):
+        # Index et dictionnaire chargés (ou construits) hors de la boucle dès le démarrage
+        await word_index.ensure_loaded()
+        await spell_service.ensure_loaded()
 
     async def _start_game(self, channel: discord.abc.Messageable, author_id: int, mode: str = "solo"):
         length = random.choice(range(5, 9))
-        target_word = await get_random_french_word(length=length)
+        await word_index.ensure_loaded()
+        target_word = word_index.random_word(length=length).upper()
         multi = mode.lower() in ("multi", "m")
         author_filter = None if multi else author_id
         view = AnagrammeView(target_word, author_id=author_filter, multi=multi)
         embed = view.build_embed()
         view.message = await safe_send(channel, embed=embed)
+
+        # Une nouvelle partie remplace celle du salon
+        self._end_game(channel.id)
         self.active_games[channel.id] = view
-        asyncio.create_task(view.check_timeout())  # arrête après 3 minutes
+        self.routes[channel.id] = message_router.register(
+            channel.id, self.on_guess, self.is_guess, name="anagramme"
+        )
+        asyncio.create_task(self._watch_timeout(channel.id, view))  # arrête après 3 minutes
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot:
-            return
-        if message.channel.id not in self.active_games:
+    def _end_game(self, channel_id: int):
+        """Retire la partie du salon et son abonnement aux messages."""
+        self.active_games.pop(channel_id, None)
+        route = self.routes.pop(channel_id, None)
+        if route:
+            route.cancel()
+
+    async def _watch_timeout(self, channel_id: int, view: AnagrammeView):
+        await view.check_timeout()
+        if self.active_games.get(channel_id) is view:
+            self._end_game(channel_id)
+
+    def cog_unload(self):
+        for channel_id in list(self.active_games):
+            self._end_game(channel_id)
+
+    # ────────────────────────────────────────────────────────────────────────────────
+    # 💬 Propositions (via message_router)
+    # ────────────────────────────────────────────────────────────────────────────────
+    @staticmethod
+    def is_guess(message: discord.Message) -> bool:
+        return message.content.strip().startswith((".", "*"))
+
+    async def on_guess(self, message: discord.Message):
+        view = self.active_games.get(message.channel.id)
+        if view is None:
             return
-        content = message.content.strip()
-        if content.startswith((".", "*")):
-            view = self.active_games[message.channel.id]
-            await view.process_guess(message.channel, content, message.author.display_name, message.author.id)
+        await view.process_guess(message.channel, message.content.strip(), message.author.display_name, message.author.id)
+        if view.finished and self.active_games.get(message.channel.id) is view:
+            self._end_game(message.channel.id)
 
     # ────────────────────────────────────────────────────────────────────────────────
     # 🔹 Commande SLASH
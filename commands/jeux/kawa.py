@@ -16,11 +16,12 @@ import random
 import time
 import inspect
 import asyncio
-import json
 import logging
 
 from utils import kawashima_games
-from utils.init_db import get_conn
+from utils.message_router import message_router
+from utils.database import db
+from utils.quests import complete_quest
 
 log = logging.getLogger(__name__)
 
@@ -28,77 +29,31 @@ log = logging.getLogger(__name__)
 # 🗄️ Accès base de données locale
 # ────────────────────────────────────────────────────────────────────────────────
 
-def db_save_score(user_id: int, username: str, score: int):
+async def db_save_score(user_id: int, username: str, score: int):
     """Enregistre un score Kawashima dans la table kawashima_scores."""
     try:
-        conn   = get_conn()
-        cursor = conn.cursor()
-        cursor.execute("""
+        await db.execute("""
             INSERT INTO kawashima_scores (user_id, username, score, timestamp)
             VALUES (?, ?, ?, ?)
         """, (user_id, username, score, int(time.time())))
-        conn.commit()
-        conn.close()
     except Exception as e:
         log.exception("[cerebral] Erreur sauvegarde score SQLite : %s", e)
 
-def db_get_leaderboard(limit: int = 10) -> list[dict]:
+async def db_get_leaderboard(limit: int = 10) -> list[dict]:
     """Récupère les meilleurs scores globaux."""
     try:
-        conn   = get_conn()
-        cursor = conn.cursor()
-        cursor.execute("""
+        rows = await db.fetchall("""
             SELECT username, MAX(score) as score
             FROM kawashima_scores
             GROUP BY user_id
             ORDER BY score DESC
             LIMIT ?
         """, (limit,))
-        rows = cursor.fetchall()
-        conn.close()
         return [{"username": r[0], "score": r[1]} for r in rows]
     except Exception as e:
         log.exception("[cerebral] Erreur lecture leaderboard SQLite : %s", e)
         return []
 
-def db_valider_quete(user_id: int) -> int | None:
-    """
-    Vérifie si la quête 'entrainement' est déjà validée pour l'utilisateur.
-    Si non, l'ajoute et incrémente le niveau.
-    Retourne le nouveau niveau si la quête vient d'être validée, sinon None.
-    """
-    try:
-        conn   = get_conn()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT quetes, niveau FROM reiatsu WHERE user_id = ?", (user_id,))
-        row = cursor.fetchone()
-
-        if not row:
-            conn.close()
-            return None
-
-        quetes = json.loads(row[0] or "[]")
-        niveau = row[1] or 1
-
-        if "entrainement" in quetes:
-            conn.close()
-            return None
-
-        quetes.append("entrainement")
-        new_lvl = niveau + 1
-        cursor.execute(
-            "UPDATE reiatsu SET quetes = ?, niveau = ? WHERE user_id = ?",
-            (json.dumps(quetes), new_lvl, user_id)
-        )
-        conn.commit()
-        conn.close()
-        return new_lvl
-
-    except Exception as e:
-        log.exception("[cerebral] Erreur validation quête SQLite : %s", e)
-        return None
-
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
 # ────────────────────────────────────────────────────────────────────────────────
@@ -131,7 +86,7 @@ class EntrainementCerebral(commands.Cog):
         if total_score < 5000:
             return
 
-        new_lvl = db_valider_quete(user.id)
+        new_lvl = await complete_quest(user.id, "entrainement")
         if new_lvl is None:
             return
 
@@ -331,11 +286,11 @@ class EntrainementCerebral(commands.Cog):
 
                 if multiplayer:
                     def check(m):
-                        return m.author in active_players and m.channel == msg_game.channel
+                        return m.author in active_players
                     winner = None
                     try:
                         while True:
-                            msg     = await self.bot.wait_for("message", check=check, timeout=25)
+                            msg     = await message_router.wait_for(msg_game.channel.id, check, 25, name="kawa")
                             success = await game(msg_game, game_embed, lambda: msg.author.id, self.bot, msg_override=msg)
                             if success:
                                 winner = msg.author
@@ -415,7 +370,7 @@ class EntrainementCerebral(commands.Cog):
 
                 # ─── Sauvegarde score solo ─────────────────────────────────
                 if not multiplayer:
-                    db_save_score(player.id, player.name, total)
+                    await db_save_score(player.id, player.name, total)
 
                 # ─── Validation quête ──────────────────────────────────────
                 await self._valider_quete(
@@ -438,7 +393,7 @@ class EntrainementCerebral(commands.Cog):
             description="Voici le classement global des meilleurs scores !",
             color=discord.Color.gold()
         )
-        entries  = db_get_leaderboard(10)
+        entries  = await db_get_leaderboard(10)
         top_text = "\n".join(
             f"**{i+1}.** {entry['username']} — `{entry['score']:,}` pts"
             for i, entry in enumerate(entries)
@@ -13,14 +13,10 @@ import discord, random
 from discord import app_commands
 from discord.ext import commands
 from discord.ui import View, Modal, TextInput, Button
-from spellchecker import SpellChecker
+from utils.spell_service import spell_service
+from utils.word_index import fold
 from utils.discord_utils import safe_send, safe_respond, safe_edit
 
-# ────────────────────────────────────────────────────────────────────────────────
-# 🌐 Initialisation du SpellChecker français
-# ────────────────────────────────────────────────────────────────────────────────
-spell = SpellChecker(language='fr')
-
 # ────────────────────────────────────────────────────────────────────────────────
 # ⚙️ Pondération des lettres (moins de chances pour les rares)
 # ────────────────────────────────────────────────────────────────────────────────
@@ -35,10 +31,6 @@ def weighted_random_letter() -> str:
     weights = list(FRENCH_LETTER_WEIGHTS.values())
     return random.choices(letters, weights=weights, k=1)[0]
 
-def is_valid_word(word: str) -> bool:
-    """Vérifie si le mot existe en français"""
-    return word.lower() in spell.word_frequency
-
 # ────────────────────────────────────────────────────────────────────────────────
 # 🎛️ Modal de saisie du mot
 # ────────────────────────────────────────────────────────────────────────────────
@@ -89,12 +81,12 @@ class MotContraintView(View):
         if interaction.user.id != self.author_id:
             return await interaction.response.send_message("❌ Tu ne participes pas à cette partie.", ephemeral=True)
 
-        word_clean = word.lower()
-        if not word_clean.startswith(self.start_letter.lower()):
+        word_clean = fold(word.strip())  # « école » commence bien par E
+        if not word_clean.startswith(self.start_letter):
             return await safe_respond(interaction, f"❌ Le mot ne commence pas par `{self.start_letter}`.", ephemeral=True)
-        if not word_clean.endswith(self.end_letter.lower()):
+        if not word_clean.endswith(self.end_letter):
             return await safe_respond(interaction, f"❌ Le mot ne se termine pas par `{self.end_letter}`.", ephemeral=True)
-        if not is_valid_word(word_clean):
+        if not spell_service.is_valid(word_clean):
             return await safe_respond(interaction, f"❌ `{word}` n’est pas reconnu comme un mot français valide.", ephemeral=True)
 
         self.score += 1
@@ -149,6 +141,10 @@ class MotContraint(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    async def cog_load(self):
+        # Dictionnaire partagé chargé hors de la boucle dès le démarrage
+        await spell_service.ensure_loaded()
+
     async def _start_game(self, channel, author_id):
         start = weighted_random_letter()
         end = weighted_random_letter()
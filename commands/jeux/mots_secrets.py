@@ -19,7 +19,9 @@ from pathlib import Path
 from datetime import datetime, timedelta
 
 from utils.discord_utils import safe_send, safe_respond
-from utils.init_db import get_conn
+from utils.database import db
+from utils.reiatsu_ledger import ledger
+from utils.message_router import message_router
 
 log = logging.getLogger(__name__)
 
@@ -43,14 +45,10 @@ MOTS = load_mots()
 # 🗄️ Accès base de données locale
 # ────────────────────────────────────────────────────────────────────────────────
 
-def db_get_mots_trouves(user_id: int) -> list:
+async def db_get_mots_trouves(user_id: int) -> list:
     """Récupère la liste des IDs de mots déjà trouvés par l'utilisateur."""
     try:
-        conn   = get_conn()
-        cursor = conn.cursor()
-        cursor.execute("SELECT mots FROM mots_trouves WHERE user_id = ?", (user_id,))
-        row = cursor.fetchone()
-        conn.close()
+        row = await db.fetchone("SELECT mots FROM mots_trouves WHERE user_id = ?", (user_id,))
         if not row:
             return []
         return json.loads(row[0] or "[]")
@@ -58,53 +56,22 @@ def db_get_mots_trouves(user_id: int) -> list:
         log.exception("[motssecrets] Erreur lecture mots_trouves : %s", e)
         return []
 
-def db_save_mot_trouve(user_id: int, username: str, mots_trouves: list):
+async def db_save_mot_trouve(user_id: int, username: str, mots_trouves: list):
     """Sauvegarde la liste mise à jour des mots trouvés."""
     try:
-        conn   = get_conn()
-        cursor = conn.cursor()
-        cursor.execute("SELECT user_id FROM mots_trouves WHERE user_id = ?", (user_id,))
-        exists = cursor.fetchone()
-
-        if exists:
-            cursor.execute("""
-                UPDATE mots_trouves SET mots = ?, last_found_at = ?
-                WHERE user_id = ?
-            """, (json.dumps(mots_trouves), datetime.utcnow().isoformat(), user_id))
-        else:
-            cursor.execute("""
-                INSERT INTO mots_trouves (user_id, username, mots, last_found_at)
-                VALUES (?, ?, ?, ?)
-            """, (user_id, username, json.dumps(mots_trouves), datetime.utcnow().isoformat()))
-
-        conn.commit()
-        conn.close()
+        await db.execute("""
+            INSERT INTO mots_trouves (user_id, username, mots, last_found_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET
+                mots = excluded.mots,
+                last_found_at = excluded.last_found_at
+        """, (user_id, username, json.dumps(mots_trouves), datetime.utcnow().isoformat()))
     except Exception as e:
         log.exception("[motssecrets] Erreur sauvegarde mots_trouves : %s", e)
 
 def db_add_reiatsu(user_id: int, username: str, points: int = 10):
-    """Ajoute des points de Reiatsu à l'utilisateur."""
-    try:
-        conn   = get_conn()
-        cursor = conn.cursor()
-        cursor.execute("SELECT points FROM reiatsu WHERE user_id = ?", (user_id,))
-        row = cursor.fetchone()
-
-        if row:
-            cursor.execute(
-                "UPDATE reiatsu SET points = ? WHERE user_id = ?",
-                (row[0] + points, user_id)
-            )
-        else:
-            cursor.execute(
-                "INSERT INTO reiatsu (user_id, username, points) VALUES (?, ?, ?)",
-                (user_id, username, points)
-            )
-
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        log.exception("[motssecrets] Erreur ajout reiatsu : %s", e)
+    """Ajoute des points de Reiatsu à l'utilisateur (écriture différée)."""
+    ledger.add(user_id, points, username=username)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -116,6 +83,12 @@ class MotsSecretsMulti(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot          = bot
         self.active_games = {}  # channel_id : end_time
+        self.routes       = {}  # channel_id : abonnement message_router
+
+    def cog_unload(self):
+        for route in self.routes.values():
+            route.cancel()
+        self.routes.clear()
 
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Fonction interne — normalisation
@@ -133,6 +106,8 @@ class MotsSecretsMulti(commands.Cog):
             return
 
         self.active_games[channel.id] = datetime.utcnow() + timedelta(minutes=3)
+        route = message_router.register(channel.id, self.handle_guess, self.is_guess, name="motssecrets")
+        self.routes[channel.id] = route
 
         embed = discord.Embed(
             title="📝 Jeu des Mots Secrets !",
@@ -151,6 +126,8 @@ class MotsSecretsMulti(commands.Cog):
 
         async def stop_later():
             await asyncio.sleep(180)
+            route.cancel()
+            self.routes.pop(channel.id, None)
             if channel.id in self.active_games:
                 await safe_send(channel, "⏰ Le jeu des mots secrets est terminé !")
                 del self.active_games[channel.id]
@@ -160,6 +137,12 @@ class MotsSecretsMulti(commands.Cog):
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Fonction interne — vérification d'un mot proposé
     # ────────────────────────────────────────────────────────────────────────────
+    @staticmethod
+    def is_guess(message: discord.Message) -> bool:
+        """Proposition = `.mot` ou `*mot` (« . » ou « * » seuls ignorés)."""
+        content = message.content
+        return content.startswith((".", "*")) and bool(content[1:].strip())
+
     async def handle_guess(self, message: discord.Message):
         """Vérifie si le mot proposé est un mot secret et attribue les points."""
         mot_propose = self.normalize(message.content[1:])
@@ -172,14 +155,14 @@ class MotsSecretsMulti(commands.Cog):
         user_id  = message.author.id
         username = str(message.author)
 
-        mots_trouves = db_get_mots_trouves(user_id)
+        mots_trouves = await db_get_mots_trouves(user_id)
 
         if mot_id in mots_trouves:
             await message.reply(f"⚠️ {message.author.mention}, tu as déjà trouvé ce mot secret !")
             return
 
         mots_trouves.append(mot_id)
-        db_save_mot_trouve(user_id, username, mots_trouves)
+        await db_save_mot_trouve(user_id, username, mots_trouves)
         db_add_reiatsu(user_id, username, 10)
 
         await message.reply(
@@ -219,21 +202,6 @@ class MotsSecretsMulti(commands.Cog):
             log.exception("[!motsecret] Erreur non gérée : %s", error)
             await safe_send(ctx.channel, "❌ Une erreur est survenue.")
 
-    # ────────────────────────────────────────────────────────────────────────────
-    # 🎧 Événement — Proposition de mot
-    # ────────────────────────────────────────────────────────────────────────────
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot:
-            return
-        if message.channel.id not in self.active_games:
-            return
-        if not (message.content.startswith(".") or message.content.startswith("*")):
-            return
-        if not message.content[1:].strip():
-            return  # ignore "." ou "*" seuls
-        await self.handle_guess(message)
-
 # ────────────────────────────────────────────────────────────────────────────────
 # 🔌 Setup du Cog
 # ────────────────────────────────────────────────────────────────────────────────
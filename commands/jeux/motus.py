@@ -14,41 +14,10 @@ from discord import app_commands
 from discord.ext import commands
 from discord.ui import View, Modal, TextInput, Button
 import random
-import aiohttp
 import unicodedata
-from spellchecker import SpellChecker
+from utils.spell_service import spell_service
 from utils.discord_utils import safe_send, safe_edit, safe_respond
-
-# ────────────────────────────────────────────────────────────────────────────────
-# 🌐 Initialisation du spellchecker français
-# ────────────────────────────────────────────────────────────────────────────────
-spell = SpellChecker(language='fr')
-
-# ────────────────────────────────────────────────────────────────────────────────
-# 🌐 Fonction pour récupérer un mot français aléatoire
-# ────────────────────────────────────────────────────────────────────────────────
-async def get_random_french_word(length: int | None = None) -> str:
-    """Récupère un mot français aléatoire depuis l'API trouve-mot.fr"""
-    url = "https://trouve-mot.fr/api/random"
-    if length:
-        url += f"?size={length}"
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=5) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    if isinstance(data, list) and len(data) > 0:
-                        return data[0]["name"].upper()
-    except Exception as e:
-        print(f"[ERREUR API Motus] {e}")
-    return "PYTHON"
-
-# ────────────────────────────────────────────────────────────────────────────────
-# 🌐 Fonction pour vérifier qu’un mot existe via SpellChecker
-# ────────────────────────────────────────────────────────────────────────────────
-def is_valid_word(word: str) -> bool:
-    """Retourne True si le mot est reconnu par SpellChecker"""
-    return word.lower() in spell.word_frequency
+from utils.word_index import word_index
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🎛️ Modal pour proposer un mot
@@ -194,7 +163,7 @@ class MotusView(View):
         if len(filtered_guess) != self.display_length:
             return await safe_respond(interaction, f"⚠️ Le mot doit faire {self.display_length} lettres.", ephemeral=True)
 
-        if not is_valid_word(filtered_guess):
+        if not spell_service.is_valid(filtered_guess):
             return await safe_respond(interaction, f"❌ `{guess}` n’est pas reconnu comme un mot valide.", ephemeral=True)
 
         self.attempts.append({'word': guess.upper(), 'hint': False})
@@ -276,9 +245,15 @@ class Motus(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    async def cog_load(self):
+        # Index et dictionnaire chargés (ou construits) hors de la boucle dès le démarrage
+        await word_index.ensure_loaded()
+        await spell_service.ensure_loaded()
+
     async def _start_game(self, channel: discord.abc.Messageable, author_id: int, mode: str = "solo"):
         length = random.choice(range(5, 9))
-        target_word = await get_random_french_word(length=length)
+        await word_index.ensure_loaded()
+        target_word = word_index.random_word(length=length).upper()
         author_filter = None if mode.lower() in ("multi", "m") else author_id
         view = MotusView(target_word, max_attempts=None, author_id=author_filter)
         embed = view.build_embed()
@@ -13,6 +13,7 @@ from discord.ext import commands, tasks
 import aiohttp
 import asyncio
 from utils.discord_utils import safe_send, safe_edit, safe_respond  # ✅ Utilisation safe_
+from utils.message_router import message_router
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🎨 Constantes et ASCII
@@ -89,6 +90,7 @@ class PenduSession:
         self.message = message
         self.mode = mode  # "solo" ou "multi"
         self.last_activity = asyncio.get_event_loop().time()  # ⏱️ Pour le timer
+        self.route = None  # abonnement au message_router (propositions de lettres)
         if mode == "multi":
             self.players = set()
         else:
@@ -110,6 +112,15 @@ class Pendu(commands.Cog):
 
     def cog_unload(self):
         self.verif_inactivite.cancel()
+        for channel_id in list(self.sessions):
+            self._end_session(channel_id)
+
+    def _end_session(self, channel_id: int) -> PenduSession | None:
+        """Retire la partie du salon et son abonnement aux messages."""
+        session = self.sessions.pop(channel_id, None)
+        if session and session.route:
+            session.route.cancel()
+        return session
 
     @commands.command(
         name="pendu",
@@ -136,6 +147,9 @@ class Pendu(commands.Cog):
         message = await safe_send(ctx.channel, embed=embed)
 
         session = PenduSession(game, message, mode=mode, author_id=ctx.author.id)
+        session.route = message_router.register(
+            channel_id, self.on_guess, lambda m: self._is_guess(session, m), name="pendu"
+        )
         self.sessions[channel_id] = session
 
     async def _fetch_random_word(self) -> str | None:
@@ -162,7 +176,7 @@ class Pendu(commands.Cog):
                 a_supprimer.append(channel_id)
 
         for cid in a_supprimer:
-            session = self.sessions.pop(cid, None)
+            session = self._end_session(cid)
             if session:
                 await safe_send(
                     session.message.channel,
@@ -170,27 +184,25 @@ class Pendu(commands.Cog):
                 )
 
     # ───────────────────────────────────────────────────────────────────────
-    # 💬 Réception des messages (propositions)
+    # 💬 Réception des messages (propositions, via message_router)
     # ───────────────────────────────────────────────────────────────────────
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot or not message.guild:
-            return
+    @staticmethod
+    def _is_guess(session: PenduSession, message: discord.Message) -> bool:
+        if not message.guild:
+            return False
+        # Solo : uniquement le joueur qui a lancé la partie ; multi : tout le monde
+        if session.mode == "solo" and message.author.id != session.player_id:
+            return False
+        content = message.content.strip()
+        return len(content) == 1 and content.isalpha()
 
+    async def on_guess(self, message: discord.Message):
         channel_id = message.channel.id
         session: PenduSession = self.sessions.get(channel_id)
         if not session:
             return
 
-        # Solo : uniquement le joueur qui a lancé la partie
-        if session.mode == "solo" and message.author.id != session.player_id:
-            return
-
-        # Multi : tout le monde peut proposer
         content = message.content.strip().lower()
-        if len(content) != 1 or not content.isalpha():
-            return
-
         session.last_activity = asyncio.get_event_loop().time()  # 🔁 reset timer
         game = session.game
         resultat = game.propose_lettre(content)
@@ -204,7 +216,7 @@ class Pendu(commands.Cog):
         try:
             await safe_edit(session.message, embed=embed)
         except discord.NotFound:
-            del self.sessions[channel_id]
+            self._end_session(channel_id)
             await safe_send(message.channel, "❌ Partie annulée car le message du jeu a été supprimé.")
             return
 
@@ -212,12 +224,12 @@ class Pendu(commands.Cog):
 
         if resultat == "gagne":
             await safe_send(message.channel, f"🎉 Bravo {message.author.mention}, le mot `{game.mot}` a été deviné !")
-            del self.sessions[channel_id]
+            self._end_session(channel_id)
             return
 
         if resultat == "perdu":
             await safe_send(message.channel, f"💀 Partie terminée ! Le mot était `{game.mot}`.")
-            del self.sessions[channel_id]
+            self._end_session(channel_id)
             return
 
 # ────────────────────────────────────────────────────────────────────────────────
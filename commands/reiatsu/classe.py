@@ -16,19 +16,16 @@ from discord.ext import commands
 from discord.ui import View, Button
 import json
 import os
-import sqlite3
 from datetime import datetime, timezone
 
 from utils.discord_utils import safe_send, safe_respond, safe_edit
+from utils.database import db
+from utils.profile_cache import profile_cache
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📂 Chargement de la configuration Reiatsu
 # ────────────────────────────────────────────────────────────────────────────────
 REIATSU_CONFIG_PATH = os.path.join("data", "reiatsu_config.json")
-DB_PATH = os.path.join("database", "reiatsu.db")
-
-def get_conn():
-    return sqlite3.connect(DB_PATH)
 
 def load_reiatsu_config():
     """Charge la configuration Reiatsu depuis le fichier JSON."""
@@ -56,13 +53,10 @@ class ClasseSelectView(View):
     async def check_active_skill(self):
         """Vérifie si le joueur a un skill actif et calcule le temps restant."""
         try:
-            with get_conn() as conn:
-                cur = conn.cursor()
-                cur.execute(
-                    "SELECT active_skill, last_skilled_at, steal_cd FROM reiatsu WHERE user_id = ?",
-                    (self.user_id,)
-                )
-                row = cur.fetchone()
+            row = await db.fetchone(
+                "SELECT active_skill, last_skilled_at, steal_cd FROM reiatsu WHERE user_id = ?",
+                (self.user_id,)
+            )
 
             if row and row[0]:
                 self.skill_actif = True
@@ -93,13 +87,10 @@ class ClasseSelectView(View):
 
             # Vérifier si le skill est actif
             try:
-                with get_conn() as conn:
-                    cur = conn.cursor()
-                    cur.execute(
-                        "SELECT active_skill FROM reiatsu WHERE user_id = ?",
-                        (self.user_id,)
-                    )
-                    row = cur.fetchone()
+                row = await db.fetchone(
+                    "SELECT active_skill FROM reiatsu WHERE user_id = ?",
+                    (self.user_id,)
+                )
 
                 if row and row[0]:
                     await safe_respond(interaction, "❌ Tu ne peux pas changer de classe pendant qu’un skill est actif.", ephemeral=True)
@@ -113,13 +104,11 @@ class ClasseSelectView(View):
             try:
                 nouveau_cd = 19 if nom == "Voleur" else 24
 
-                with get_conn() as conn:
-                    cur = conn.cursor()
-                    cur.execute(
-                        "UPDATE reiatsu SET classe = ?, steal_cd = ? WHERE user_id = ?",
-                        (nom, nouveau_cd, self.user_id)
-                    )
-                    conn.commit()
+                await db.execute(
+                    "UPDATE reiatsu SET classe = ?, steal_cd = ? WHERE user_id = ?",
+                    (nom, nouveau_cd, self.user_id)
+                )
+                profile_cache.invalidate(self.user_id)
 
                 symbole = data.get("Symbole", "🌀")
                 embed = discord.Embed(
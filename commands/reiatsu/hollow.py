@@ -17,7 +17,9 @@ from discord.ext import commands
 from discord.ui import View, Button
 
 from utils.discord_utils import safe_send, safe_edit, safe_respond
-from utils.init_db import get_conn
+from utils.database import db
+from utils.profile_cache import profile_cache
+from utils.reiatsu_ledger import ledger
 from utils.taches import lancer_3_taches
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -27,25 +29,19 @@ HOLLOW_IMAGE_PATH = os.path.join("assets", "hollows", "hollow0.jpg")
 REIATSU_COST = 1
 
 # ────────────────────────────────────────────────────────────────────────────────
-# 🗄️ Helpers DB (via get_conn() de init_db)
+# 🗄️ Helpers DB (via le pool partagé utils.database)
 # ────────────────────────────────────────────────────────────────────────────────
-def get_points(user_id: int) -> int:
-    conn = get_conn()
-    cursor = conn.cursor()
-    cursor.execute("SELECT points FROM reiatsu WHERE user_id = ?", (user_id,))
-    row = cursor.fetchone()
-    conn.close()
+async def get_points(user_id: int) -> int:
+    await ledger.flush()
+    row = await db.fetchone("SELECT points FROM reiatsu WHERE user_id = ?", (user_id,))
     return row[0] if row else 0
 
-def remove_points(user_id: int, amount: int):
-    conn = get_conn()
-    cursor = conn.cursor()
-    cursor.execute(
+async def remove_points(user_id: int, amount: int):
+    await db.execute(
         "UPDATE reiatsu SET points = MAX(points - ?, 0) WHERE user_id = ?",
         (amount, user_id)
     )
-    conn.commit()
-    conn.close()
+    profile_cache.invalidate(user_id)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🎛️ UI — Bouton d'attaque
@@ -79,7 +75,7 @@ class AttackButton(Button):
             child.disabled = True
         await interaction.response.edit_message(view=self.view)
 
-        remove_points(self.author.id, REIATSU_COST)
+        await remove_points(self.author.id, REIATSU_COST)
 
         self.embed.title = "⚔️ Combat contre le Hollow"
         self.embed.description = (
@@ -126,7 +122,7 @@ class Hollow(commands.Cog):
         if not os.path.isfile(HOLLOW_IMAGE_PATH):
             return await safe_send(channel, "❌ Image du Hollow introuvable.")
 
-        reiatsu = get_points(author.id)
+        reiatsu = await get_points(author.id)
         if reiatsu < REIATSU_COST:
             return await safe_send(channel, f"❌ Il te faut au moins {REIATSU_COST} reiatsu pour attaquer un Hollow.")
 
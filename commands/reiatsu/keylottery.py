@@ -14,9 +14,10 @@ from discord import app_commands
 from discord.ext import commands
 from discord.ui import View, Button
 import random
-import sqlite3
 from utils.discord_utils import safe_send, safe_edit, safe_respond
-from utils.init_db import REIATSU_DB_PATH
+from utils.database import db
+from utils.profile_cache import profile_cache
+from utils.reiatsu_ledger import ledger
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📂 Constantes
@@ -24,13 +25,6 @@ from utils.init_db import REIATSU_DB_PATH
 SCRATCH_COST = 250
 NB_BUTTONS = 10
 
-# ────────────────────────────────────────────────────────────────────────────────
-# 🧠 Fonctions DB
-# ────────────────────────────────────────────────────────────────────────────────
-def get_conn():
-    return sqlite3.connect(REIATSU_DB_PATH)
-
-
 # ────────────────────────────────────────────────────────────────────────────────
 # 🎛️ UI — Ticket à gratter
 # ────────────────────────────────────────────────────────────────────────────────
@@ -76,13 +70,9 @@ class BetButton(Button):
         self.parent_view = parent_view
 
     async def callback(self, interaction: discord.Interaction):
-        reiatsu_points = await self.parent_view.parent._get_reiatsu(interaction.user.id)
-
-        if reiatsu_points < SCRATCH_COST:
+        if not await self.parent_view.parent._spend_reiatsu(interaction.user.id, SCRATCH_COST):
             return await safe_respond(interaction, f"❌ Pas assez de Reiatsu ! Il te faut {SCRATCH_COST}.", ephemeral=True)
 
-        await self.parent_view.parent._update_reiatsu(interaction.user.id, reiatsu_points - SCRATCH_COST)
-
         self.parent_view.clear_items()
         for i in range(NB_BUTTONS):
             self.parent_view.add_item(ScratchButton(i, self.parent_view))
@@ -146,27 +136,28 @@ class ScratchKey(commands.Cog):
 
     # ───────────── Gestion Reiatsu ─────────────
     async def _get_reiatsu(self, user_id: int) -> int:
-        conn = get_conn()
-        cursor = conn.cursor()
-        cursor.execute("SELECT points FROM reiatsu WHERE user_id = ?", (user_id,))
-        row = cursor.fetchone()
-        conn.close()
+        await ledger.flush()
+        row = await db.fetchone("SELECT points FROM reiatsu WHERE user_id = ?", (user_id,))
         return row[0] if row else 0
 
-    async def _update_reiatsu(self, user_id: int, new_points: int):
-        conn = get_conn()
-        cursor = conn.cursor()
-        cursor.execute("UPDATE reiatsu SET points = ? WHERE user_id = ?", (new_points, user_id))
-        conn.commit()
-        conn.close()
+    async def _update_reiatsu(self, user_id: int, delta: int):
+        """Applique une variation (jamais un solde absolu : le jeu attend Discord entre lecture et écriture)."""
+        await db.execute("UPDATE reiatsu SET points = MAX(points + ?, 0) WHERE user_id = ?", (delta, user_id))
+        profile_cache.invalidate(user_id)
+
+    async def _spend_reiatsu(self, user_id: int, cost: int) -> bool:
+        """Débite la mise si le solde suffit (vérification et débit dans la même requête)."""
+        await ledger.flush()
+        cursor = await db.execute(
+            "UPDATE reiatsu SET points = points - ? WHERE user_id = ? AND points >= ?",
+            (cost, user_id, cost)
+        )
+        profile_cache.invalidate(user_id)
+        return cursor.rowcount > 0
 
     # ───────────── Gestion Steam Keys ─────────────
     async def _get_all_steam_keys(self):
-        conn = get_conn()
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, game_name, steam_url, steam_key FROM steam_keys WHERE won = 0 OR won = 'false' OR won IS NULL")
-        rows = cursor.fetchall()
-        conn.close()
+        rows = await db.fetchall("SELECT id, game_name, steam_url, steam_key FROM steam_keys WHERE won = 0 OR won = 'false' OR won IS NULL")
 
         return [
             {
@@ -179,14 +170,10 @@ class ScratchKey(commands.Cog):
         ]
 
     async def _mark_steam_key_won(self, key_id: int, winner: str):
-        conn = get_conn()
-        cursor = conn.cursor()
-        cursor.execute(
+        await db.execute(
             "UPDATE steam_keys SET won = 1, winner = ? WHERE id = ? AND (won = 0 OR won = 'false')",
             (winner, key_id)
         )
-        conn.commit()
-        conn.close()
 
     # ───────────── Envoi Ticket ─────────────
     async def _send_ticket(self, channel, user, user_id: int):
@@ -216,13 +203,11 @@ class ScratchKey(commands.Cog):
 
     # ───────────── Gestion Résultat ─────────────
     async def _handle_result(self, interaction, result_type: str, user_id: int):
-        reiatsu_points = await self._get_reiatsu(user_id)
-
         if result_type == "jackpot":
-            await self._update_reiatsu(user_id, reiatsu_points + SCRATCH_COST * 2)
+            await self._update_reiatsu(user_id, SCRATCH_COST * 2)
 
         elif result_type == "key":
-            await self._update_reiatsu(user_id, reiatsu_points + SCRATCH_COST)
+            await self._update_reiatsu(user_id, SCRATCH_COST)
 
             keys_dispo = await self._get_all_steam_keys()
             if not keys_dispo:
@@ -13,18 +13,7 @@ from discord import app_commands
 from discord.ext import commands
 from utils.discord_utils import safe_send, safe_respond  # ✅ Utilitaires sécurisés
 from utils.reiatsu_utils import ensure_profile  # ⚡ Utilitaire pour les profils joueurs
-
-# ────────────────────────────────────────────────────────────────────────────────
-# 📜 Liste des quêtes disponibles
-# ────────────────────────────────────────────────────────────────────────────────
-ALL_QUESTS = {
-    "couleur": "Faire une fois la commande couleur",
-    "pizza": "Faire une fois la commande pizza",
-    "division": "Faire le quizz de la commande division",
-    "entrainement": "Faire un score de minimum 5000 à l'entraînement cérébral",
-    "skill": "Utiliser ton skill",
-    "bmoji": "Réussi le minijeu de la commande bmoji"
-}
+from utils.quests import QUESTS, get_completions  # 📜 Service des quêtes
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -65,15 +54,17 @@ class QuetesCommand(commands.Cog):
             user = source.user if isinstance(source, discord.Interaction) else source.author
 
             # ⚡ Récupération ou création du profil
-            profile = ensure_profile(user.id, user.name)
+            profile = await ensure_profile(user.id, user.name)
             niveau = profile.get("niveau", 1)
-            quetes_faites = profile.get("quetes", [])
+            quetes_faites = await get_completions(user.id)
 
             # Génération du texte des quêtes
             lines = []
-            for key, desc in ALL_QUESTS.items():
+            for key, desc in QUESTS.items():
                 if key in quetes_faites:
-                    lines.append(f"✅ {desc}")
+                    done_at = quetes_faites[key]
+                    # Date inconnue pour les quêtes reprises de l'ancien format (0)
+                    lines.append(f"✅ {desc} — <t:{int(done_at)}:d>" if done_at else f"✅ {desc}")
                 else:
                     lines.append(f"⁉️ {desc}")
 
@@ -18,7 +18,9 @@ from discord.ext import commands
 from discord.ui import Button, View
 
 from utils.discord_utils import safe_respond, safe_send
-from utils.init_db import get_conn
+from utils.database import db
+from utils.leaderboard import leaderboard
+from utils.reiatsu_ledger import ledger
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📂 Constantes
@@ -33,23 +35,13 @@ SPAWN_SPEED_INTERVALS = {
 # ────────────────────────────────────────────────────────────────────────────────
 # 🗄️ Helpers DB
 # ────────────────────────────────────────────────────────────────────────────────
-def get_server_config(guild_id: int):
-    conn = get_conn()
-    conn.row_factory = __import__("sqlite3").Row
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM reiatsu_config WHERE guild_id = ?", (guild_id,))
-    row = cursor.fetchone()
-    conn.close()
-    return row
-
-def get_classement():
-    conn = get_conn()
-    conn.row_factory = __import__("sqlite3").Row
-    cursor = conn.cursor()
-    cursor.execute("SELECT user_id, points FROM reiatsu ORDER BY points DESC LIMIT 10")
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
+async def get_server_config(guild_id: int):
+    return await db.fetchone("SELECT * FROM reiatsu_config WHERE guild_id = ?", (guild_id,))
+
+async def get_classement():
+    await ledger.flush()
+    await leaderboard.refresh()
+    return leaderboard.top(10)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🎛️ UI — Vue Reiatsu (bouton persistant + lien spawn)
@@ -73,15 +65,13 @@ class ReiatsuView(View):
         if self.author and interaction.user != self.author:
             return await safe_respond(interaction, "❌ Tu ne peux pas utiliser ce bouton.", ephemeral=True)
 
-        classement = get_classement()
+        classement = await get_classement()
 
         if not classement:
             return await safe_respond(interaction, "⚠️ Aucun classement disponible pour le moment.", ephemeral=True)
 
         description = ""
-        for i, entry in enumerate(classement, start=1):
-            user_id = entry["user_id"]
-            points = entry["points"]
+        for i, (user_id, points) in enumerate(classement, start=1):
             user = interaction.guild.get_member(user_id) if interaction.guild else None
             name = user.display_name if user else f"Utilisateur ({user_id})"
             description += f"**{i}. {name}** — {points} points\n"
@@ -107,7 +97,7 @@ class ReiatsuCommand(commands.Cog):
     # 🔹 Fonction interne commune
     # ────────────────────────────────────────────────────────────────────────────
     async def _send_server_info(self, channel, author: discord.Member, guild: discord.Guild):
-        config = get_server_config(guild.id)
+        config = await get_server_config(guild.id)
 
         salon_text = "❌"
         spawn_speed_text = "⚠️ Inconnu"
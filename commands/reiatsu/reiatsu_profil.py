@@ -16,19 +16,16 @@ from dateutil import parser
 from datetime import datetime, timedelta, timezone
 import os
 import json
-import sqlite3
 
 from utils.discord_utils import safe_send, safe_respond
 from utils.reiatsu_utils import ensure_profile  # ✅ Ajout pour auto-création profil
+from utils.database import db
+from utils.reiatsu_ledger import ledger
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📂 Chargement des classes depuis JSON
 # ────────────────────────────────────────────────────────────────────────────────
 CONFIG_JSON_PATH = os.path.join("data", "reiatsu_config.json")
-DB_PATH = "database/reiatsu.db"
-
-def get_conn():
-    return sqlite3.connect(DB_PATH)
 
 def load_classes():
     try:
@@ -56,18 +53,16 @@ class ReiatsuProfil(commands.Cog):
         user_id = int(user.id)
 
         # ✅ Création automatique du profil si inexistant
-        ensure_profile(user_id, user.name)
+        await ensure_profile(user_id, user.name)
+        await ledger.flush()
 
         # Récupération des données Reiatsu depuis SQLite
         try:
-            with get_conn() as conn:
-                cur = conn.cursor()
-                cur.execute("""
-                    SELECT username, points, bonus5, classe, last_steal_attempt,
-                           steal_cd, last_skilled_at, active_skill, niveau
-                    FROM reiatsu WHERE user_id = ?
-                """, (user_id,))
-                row = cur.fetchone()
+            row = await db.fetchone("""
+                SELECT username, points, bonus5, classe, last_steal_attempt,
+                       steal_cd, last_skilled_at, active_skill, niveau
+                FROM reiatsu WHERE user_id = ?
+            """, (user_id,))
         except Exception as e:
             print(f"[ERREUR DB] Lecture Reiatsu échouée : {e}")
             return await safe_send(channel_or_interaction, "❌ Impossible de récupérer ton profil.")
@@ -10,51 +10,69 @@
 # 📦 Imports nécessaires
 # ────────────────────────────────────────────────────────────────────────────────
 import asyncio
-import sqlite3
 import json
-import os
+import logging
+import time
 import discord
 from discord import app_commands
-from discord.ext import commands, tasks
-from utils.discord_utils import safe_send, safe_respond
+from discord.ext import commands
+from utils.discord_utils import safe_send, safe_respond, safe_delete
+from utils.message_router import message_router
 from utils.reiatsu_utils import ensure_profile
+from utils.database import db
+from utils.reiatsu_ledger import ledger
+from utils.timer_service import timer_service
+from utils.webhook_pool import webhook_pool
 import datetime
 import random
 
+log = logging.getLogger(__name__)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+EFFECT_TIMER = "reiatsu_shop.effect"  # minuteur de fin d'effet, clé "user_id:guild_id:effect_key"
+
+# Effets actifs d'un joueur sur un serveur : un seul entier par (guild_id, user_id)
+ZOMB           = 1 << 0  # 1 message sur 3 reposté avec « arrrg cerveau... »
+MUTE           = 1 << 1  # timeout impossible → messages supprimés
+RENAME         = 1 << 2  # pseudo forcé (on_member_update)
+RENAME_WEBHOOK = 1 << 3  # pseudo non modifiable → messages repostés sous le pseudo forcé
+EFFECT_BITS    = {"zomb": ZOMB, "mute": MUTE, "rename": RENAME | RENAME_WEBHOOK}
+INTERCEPT      = ZOMB | MUTE | RENAME_WEBHOOK  # effets qui réécrivent les messages
+
+REWRITE_QUEUE_SIZE = 500  # au-delà, les réécritures sont abandonnées (gateway jamais bloquée)
+REWRITE_WORKERS    = 4
+
 # ────────────────────────────────────────────────────────────────────────────────
 # 🗄️ SQLite
 # ────────────────────────────────────────────────────────────────────────────────
-DB_PATH = os.path.join("database", "reiatsu.db")
-
-def get_conn():
-    return sqlite3.connect(DB_PATH)
-
-def db_get_shop_effets(user_id: int) -> list:
-    conn = get_conn()
-    cursor = conn.cursor()
-    cursor.execute("SELECT shop_effets FROM reiatsu WHERE user_id = ?", (user_id,))
-    row = cursor.fetchone()
-    conn.close()
-    if not row:
-        return []
-    return json.loads(row[0] or "[]")
-
-def db_set_shop_effets(user_id: int, effects: list):
-    conn = get_conn()
-    cursor = conn.cursor()
-    cursor.execute(
-        "UPDATE reiatsu SET shop_effets = ? WHERE user_id = ?",
-        (json.dumps(effects), user_id)
+async def db_add_effect(user_id: int, guild_id: int, effect_key: str, end_time: float, payload: dict | None):
+    """Enregistre l'effet (le même effet racheté sur le même joueur repart de zéro)."""
+    await db.execute("""
+        INSERT INTO active_effects (user_id, guild_id, effect_key, end_time, payload)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(user_id, guild_id, effect_key) DO UPDATE SET
+            end_time = excluded.end_time,
+            payload  = excluded.payload
+    """, (user_id, guild_id, effect_key, end_time, json.dumps(payload) if payload else None))
+
+async def db_load_effects(now: float) -> list:
+    """Effets encore actifs (idx_active_effects_end) ; les expirés sont purgés au passage."""
+    await db.execute("DELETE FROM active_effects WHERE end_time <= ?", (now,))
+    return await db.fetchall(
+        "SELECT user_id, guild_id, effect_key, end_time, payload FROM active_effects WHERE end_time > ?",
+        (now,)
+    )
+
+async def db_delete_effect(user_id: int, guild_id: int, effect_key: str):
+    await db.execute(
+        "DELETE FROM active_effects WHERE user_id = ? AND guild_id = ? AND effect_key = ?",
+        (user_id, guild_id, effect_key)
     )
-    conn.commit()
-    conn.close()
 
-def db_update_points(user_id: int, points: int):
-    conn = get_conn()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE reiatsu SET points = ? WHERE user_id = ?", (points, user_id))
-    conn.commit()
-    conn.close()
+def db_update_points(user_id: int, delta: int):
+    ledger.add(user_id, delta)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -65,12 +83,15 @@ class ReiatsuShop(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
-        # Effets actifs en mémoire
-        self.active_effects = {
-            "zomb": {},   # {user_id: guild_id}
-            "rename": {}, # {user_id: {"guild_id": int, "nick": str, "use_webhook": bool}}
-            "mute": {}    # {user_id: {"guild_id": int, "end_time": datetime}}
-        }
+        # Effets actifs en mémoire : {(guild_id, user_id): bits} + pseudos forcés
+        self.effects: dict[tuple[int, int], int] = {}
+        self.forced_nicks: dict[tuple[int, int], str] = {}
+
+        # Réécritures de messages (mute / zombie / rename) traitées hors du gateway
+        self._rewrites: asyncio.Queue = asyncio.Queue(maxsize=REWRITE_QUEUE_SIZE)
+        self._workers: list[asyncio.Task] = []
+        self.rewritten = 0
+        self.dropped = 0
 
         # Shop items
         self.shop_items = {
@@ -82,39 +103,57 @@ class ReiatsuShop(commands.Cog):
                           "description": "Force le pseudo et empêche de le changer pendant 2 jours."}
         }
 
-        self.load_effects_from_db()
-        self.clean_expired_effects.start()
+    async def cog_load(self):
+        await self.load_effects_from_db()
+        timer_service.register(EFFECT_TIMER, self._on_effect_expired)
+        self._workers = [asyncio.create_task(self._rewrite_worker()) for _ in range(REWRITE_WORKERS)]
+        message_router.intercept("reiatsu_shop", self.intercept)
+
+    def cog_unload(self):
+        message_router.remove_interceptor("reiatsu_shop")
+        timer_service.unregister(EFFECT_TIMER)  # les fins d'effet restent en base
+        for task in self._workers:
+            task.cancel()
 
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Chargement des effets depuis la DB
     # ────────────────────────────────────────────────────────────────────────────
-    def load_effects_from_db(self):
-        conn = get_conn()
-        cursor = conn.cursor()
-        cursor.execute("SELECT user_id, shop_effets FROM reiatsu")
-        rows = cursor.fetchall()
-        conn.close()
-
-        now = datetime.datetime.utcnow()
-
-        for row in rows:
-            user_id = int(row[0])
-            effects = json.loads(row[1] or "[]")
-            for eff in effects:
-                end_time = datetime.datetime.fromisoformat(eff["end_time"])
-                guild_id = eff.get("guild_id")
-                if end_time > now and guild_id:
-                    key = eff["effect_key"]
-                    if key == "zomb":
-                        self.active_effects["zomb"][user_id] = guild_id
-                    elif key == "rename":
-                        self.active_effects["rename"][user_id] = {
-                            "guild_id": guild_id,
-                            "nick": eff.get("forced_nick"),
-                            "use_webhook": False
-                        }
-                    elif key == "mute":
-                        self.active_effects["mute"][user_id] = {"guild_id": guild_id, "end_time": end_time}
+    async def load_effects_from_db(self):
+        for row in await db_load_effects(time.time()):
+            payload = json.loads(row["payload"]) if row["payload"] else {}
+            self._activate(row["user_id"], row["guild_id"], row["effect_key"], row["end_time"], payload)
+
+    def _activate(self, user_id: int, guild_id: int, key: str, end_ts: float, payload: dict):
+        """Effet en mémoire (la fin est planifiée par timer_service)."""
+        if key == "rename":
+            self.forced_nicks[(guild_id, user_id)] = payload.get("nick")
+            self._set(guild_id, user_id, RENAME)
+        elif key in EFFECT_BITS:
+            self._set(guild_id, user_id, EFFECT_BITS[key])
+
+    def _set(self, guild_id: int, user_id: int, bits: int):
+        key = (guild_id, user_id)
+        self.effects[key] = self.effects.get(key, 0) | bits
+
+    def _clear(self, guild_id: int, user_id: int, bits: int):
+        key = (guild_id, user_id)
+        remaining = self.effects.get(key, 0) & ~bits
+        if remaining:
+            self.effects[key] = remaining
+        else:
+            self.effects.pop(key, None)
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔹 Expiration des effets
+    # ────────────────────────────────────────────────────────────────────────────
+    async def _on_effect_expired(self, timer_key: str, payload):
+        """Fin d'un effet : retiré de la mémoire et de active_effects."""
+        user_id, guild_id, key = timer_key.split(":")
+        user_id, guild_id = int(user_id), int(guild_id)
+        self._clear(guild_id, user_id, EFFECT_BITS[key])
+        if key == "rename":
+            self.forced_nicks.pop((guild_id, user_id), None)
+        await db_delete_effect(user_id, guild_id, key)
 
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Commande SLASH
@@ -167,7 +206,8 @@ class ReiatsuShop(commands.Cog):
             await send_func(ctx_or_inter, "❌ Pour rename, indique le nouveau pseudo.", ephemeral=is_slash)
             return
 
-        profile = ensure_profile(user.id, user.display_name)
+        await ledger.flush()  # solde exact avant achat
+        profile = await ensure_profile(user.id, user.display_name)
         item_key = {"zomb": "zombification", "mute": "mute_temp", "rename": "rename_2j"}[effect]
         item = self.shop_items[item_key]
 
@@ -177,7 +217,7 @@ class ReiatsuShop(commands.Cog):
 
         # Débit des points
         new_points = profile["points"] - item["price"]
-        db_update_points(user.id, new_points)
+        db_update_points(user.id, -item["price"])
         profile["points"] = new_points
 
         # Application de l'effet
@@ -194,35 +234,21 @@ class ReiatsuShop(commands.Cog):
     # ────────────────────────────────────────────────────────────────────────────
     async def apply_effect(self, member: discord.Member, effect: str, guild_id: int, new_nick: str = None):
         item = self.shop_items[{"zomb": "zombification", "mute": "mute_temp", "rename": "rename_2j"}[effect]]
-        start_time = datetime.datetime.utcnow()
-        end_time = start_time + datetime.timedelta(seconds=item["duration"])
+        end_ts = time.time() + item["duration"]
+        payload = {"nick": new_nick} if effect == "rename" else None
 
-        ensure_profile(member.id, member.display_name)
-        effects = db_get_shop_effets(member.id)
+        await ensure_profile(member.id, member.display_name)
+        await db_add_effect(member.id, guild_id, effect, end_ts, payload)
+        await timer_service.schedule(EFFECT_TIMER, f"{member.id}:{guild_id}:{effect}", end_ts)
 
-        effect_data = {
-            "effect_key": effect,
-            "start_time": start_time.isoformat(),
-            "end_time": end_time.isoformat(),
-            "guild_id": guild_id
-        }
-        if effect == "rename":
-            effect_data["forced_nick"] = new_nick
-
-        effects.append(effect_data)
-        db_set_shop_effets(member.id, effects)
-
-        # Application en mémoire et Discord
+        # Application en mémoire et sur Discord
         if effect == "zomb":
-            self.active_effects["zomb"][member.id] = guild_id
+            self._activate(member.id, guild_id, effect, end_ts, {})
         elif effect == "rename":
-            self.active_effects["rename"][member.id] = {"guild_id": guild_id, "nick": new_nick, "use_webhook": False}
+            self._activate(member.id, guild_id, effect, end_ts, payload)
             await self._apply_rename(member, new_nick)
         elif effect == "mute":
-            await self._apply_mute(member, item["duration"], guild_id, end_time)
-
-        # Supprimer automatiquement après la durée
-        asyncio.create_task(self._remove_effect_after(member.id, effect, item["duration"]))
+            await self._apply_mute(member, item["duration"], guild_id)
 
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Helpers internes pour effets
@@ -231,113 +257,94 @@ class ReiatsuShop(commands.Cog):
         try:
             await member.edit(nick=new_nick)
         except discord.Forbidden:
-            self.active_effects["rename"][member.id]["use_webhook"] = True
+            self._set(member.guild.id, member.id, RENAME_WEBHOOK)
 
-    async def _apply_mute(self, member: discord.Member, duration: int, guild_id: int, end_time: datetime.datetime):
+    async def _apply_mute(self, member: discord.Member, duration: int, guild_id: int):
         if member.guild.me.guild_permissions.moderate_members:
             try:
                 await member.timeout(datetime.timedelta(seconds=duration))
+                return
             except discord.Forbidden:
-                self.active_effects["mute"][member.id] = {"guild_id": guild_id, "end_time": end_time}
-        else:
-            self.active_effects["mute"][member.id] = {"guild_id": guild_id, "end_time": end_time}
-
-    async def _remove_effect_after(self, user_id: int, effect: str, duration: int):
-        await asyncio.sleep(duration)
-        self.active_effects["zomb"].pop(user_id, None)
-        self.active_effects["rename"].pop(user_id, None)
-        self.active_effects["mute"].pop(user_id, None)
-
-        now = datetime.datetime.utcnow()
-        effects = db_get_shop_effets(user_id)
-        effects = [
-            e for e in effects
-            if e["effect_key"] != effect or datetime.datetime.fromisoformat(e["end_time"]) > now
-        ]
-        db_set_shop_effets(user_id, effects)
+                pass
+        self._set(guild_id, member.id, MUTE)
 
     # ────────────────────────────────────────────────────────────────────────────
-    # 🔹 Listeners pour fallback et effets actifs
+    # 🔹 Interception des messages (appelée par message_router pour chaque message)
     # ────────────────────────────────────────────────────────────────────────────
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot:
-            return
-
-        guild_id = message.guild.id
-        user_id = message.author.id
-
+    def intercept(self, message: discord.Message) -> bool:
+        """Une recherche dans un dict pour un joueur sans effet ; sinon mise en file."""
+        if message.guild is None:
+            return False
+        flags = self.effects.get((message.guild.id, message.author.id), 0) & INTERCEPT
+        if not flags:
+            return False
+        try:
+            self._rewrites.put_nowait((flags, message))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            log.warning("[reiatsushop] File de réécriture pleine, message %s ignoré", message.id)
+        return True
+
+    async def _rewrite_worker(self):
+        while True:
+            flags, message = await self._rewrites.get()
+            try:
+                await self._rewrite(flags, message)
+                self.rewritten += 1
+            except Exception:
+                log.exception("[reiatsushop] Réécriture du message %s en erreur", message.id)
+            finally:
+                self._rewrites.task_done()
+
+    async def _rewrite(self, flags: int, message: discord.Message):
         # Mute fallback
-        mute_data = self.active_effects["mute"].get(user_id)
-        if mute_data and mute_data["guild_id"] == guild_id:
-            await message.delete()
+        if flags & MUTE:
+            await safe_delete(message)
             return
 
-        # Zombification
-        if self.active_effects["zomb"].get(user_id) == guild_id:
-            if not message.content.startswith(("!!", "$", "dun", "Dun")) and random.randint(1, 3) == 1:
-                await self._send_webhook(message, message.content + " arrrg cerveau...")
-                await message.delete()
+        nick = self.forced_nicks.get((message.guild.id, message.author.id)) if flags & RENAME_WEBHOOK else None
+
+        # Zombification (sous le pseudo forcé s'il y a aussi un rename)
+        if flags & ZOMB and not message.content.startswith(("!!", "$", "dun", "Dun")) and random.randint(1, 3) == 1:
+            await self._send_webhook(message, message.content + " arrrg cerveau...", username=nick)
+            await safe_delete(message)
 
         # Rename fallback
-        rename_data = self.active_effects["rename"].get(user_id)
-        if rename_data and rename_data["guild_id"] == guild_id and rename_data.get("use_webhook"):
-            await self._send_webhook(message, message.content, username=rename_data["nick"])
-            await message.delete()
+        elif nick:
+            await self._send_webhook(message, message.content, username=nick)
+            await safe_delete(message)
 
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔹 Listener : pseudo forcé
+    # ────────────────────────────────────────────────────────────────────────────
     @commands.Cog.listener()
     async def on_member_update(self, before: discord.Member, after: discord.Member):
-        data = self.active_effects["rename"].get(after.id)
-        if data and data["guild_id"] == after.guild.id and after.display_name != data["nick"]:
-            if not data.get("use_webhook"):
-                try:
-                    await after.edit(nick=data["nick"])
-                except Exception:
-                    self.active_effects["rename"][after.id]["use_webhook"] = True
+        key = (after.guild.id, after.id)
+        flags = self.effects.get(key, 0)
+        if not flags & RENAME or flags & RENAME_WEBHOOK:
+            return
+        nick = self.forced_nicks.get(key)
+        if after.display_name != nick:
+            try:
+                await after.edit(nick=nick)
+            except Exception:
+                self._set(after.guild.id, after.id, RENAME_WEBHOOK)
 
     async def _send_webhook(self, message: discord.Message, content: str, username: str = None):
-        webhook = await message.channel.create_webhook(name=username or f"tmp-{message.author.name}")
-        try:
-            await webhook.send(
-                username=username or message.author.display_name,
-                avatar_url=message.author.display_avatar.url,
-                content=content
-            )
-        finally:
-            await webhook.delete()
+        await webhook_pool.send(
+            message.channel,
+            username=username or message.author.display_name,
+            avatar_url=message.author.display_avatar.url,
+            content=content
+        )
 
-    # ────────────────────────────────────────────────────────────────────────────
-    # 🔹 Nettoyage périodique
-    # ────────────────────────────────────────────────────────────────────────────
-    @tasks.loop(minutes=5)
-    async def clean_expired_effects(self):
-        now = datetime.datetime.utcnow()
-
-        conn = get_conn()
-        cursor = conn.cursor()
-        cursor.execute("SELECT user_id, shop_effets FROM reiatsu")
-        rows = cursor.fetchall()
-        conn.close()
-
-        for row in rows:
-            user_id = int(row[0])
-            effects = json.loads(row[1] or "[]")
-            new_effects = []
-
-            for e in effects:
-                end_time = datetime.datetime.fromisoformat(e["end_time"])
-                if end_time > now:
-                    new_effects.append(e)
-                else:
-                    key = e["effect_key"]
-                    self.active_effects[key].pop(user_id, None)
-
-            if len(new_effects) != len(effects):
-                db_set_shop_effets(user_id, new_effects)
-
-    @clean_expired_effects.before_loop
-    async def before_clean_expired_effects(self):
-        await self.bot.wait_until_ready()
+    def stats(self) -> dict:
+        return {
+            "affected": len(self.effects),
+            "queued": self._rewrites.qsize(),
+            "rewritten": self.rewritten,
+            "dropped": self.dropped,
+        }
 
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Helper pour formater la durée
@@ -14,12 +14,11 @@ from discord import app_commands
 from discord.ext import commands
 from datetime import datetime, timedelta, timezone
 import random
-import sqlite3
 
 from utils.reiatsu_utils import ensure_profile
 from utils.discord_utils import safe_send, safe_respond
-
-DB_PATH = "database/reiatsu.db"
+from utils.database import db
+from utils.reiatsu_ledger import ledger
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -29,12 +28,6 @@ class ReiatsuVol(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
-    # ────────────────────────────────────────────────────────────────────────────
-    # 🔹 Connexion DB locale
-    # ────────────────────────────────────────────────────────────────────────────
-    def _get_db(self):
-        return sqlite3.connect(DB_PATH)
-
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Logique principale
     # ────────────────────────────────────────────────────────────────────────────
@@ -43,23 +36,21 @@ class ReiatsuVol(commands.Cog):
         voleur_id = int(voleur.id)
         cible_id = int(cible.id)
 
-        ensure_profile(voleur_id, voleur.name)
-        ensure_profile(cible_id, cible.name)
+        await ensure_profile(voleur_id, voleur.name)
+        await ensure_profile(cible_id, cible.name)
 
-        conn = self._get_db()
-        cursor = conn.cursor()
+        # Points exacts nécessaires (montant du vol, cooldown)
+        await ledger.flush()
 
-        cursor.execute("""
+        voleur_data = await db.fetchone("""
             SELECT points, classe, steal_cd, last_steal_attempt, active_skill
             FROM reiatsu WHERE user_id = ?
         """, (voleur_id,))
-        voleur_data = cursor.fetchone()
 
-        cursor.execute("""
+        cible_data = await db.fetchone("""
             SELECT points, classe
             FROM reiatsu WHERE user_id = ?
         """, (cible_id,))
-        cible_data = cursor.fetchone()
 
         voleur_points, voleur_classe, voleur_cd, last_attempt, active_skill = voleur_data
         cible_points, cible_classe = cible_data
@@ -81,59 +72,47 @@ class ReiatsuVol(commands.Cog):
                     channel,
                     f"⏳ Tu dois encore attendre **{h}h {m}m** avant de retenter."
                 )
-                conn.close()
                 return
 
         # 🔹 Vérifications
         if cible_points <= 0:
             await safe_send(channel, f"⚠️ {cible.mention} n’a pas de Reiatsu à voler.")
-            conn.close()
             return
 
         if voleur_points <= 0:
             await safe_send(channel, "⚠️ Tu dois avoir au moins 1 point de Reiatsu pour voler.")
-            conn.close()
             return
 
         montant = max(1, cible_points // 10)
 
         # 🔹 Skill actif
-        if voleur_classe == "Voleur" and active_skill:
+        skill_utilise = voleur_classe == "Voleur" and active_skill
+        if skill_utilise:
             succes = True
             montant *= 2
-            cursor.execute(
-                "UPDATE reiatsu SET active_skill = 0 WHERE user_id = ?",
-                (voleur_id,)
-            )
         else:
             succes = random.random() < (0.67 if voleur_classe == "Voleur" else 0.25)
 
-        # 🔹 Enregistrement tentative
-        cursor.execute(
-            "UPDATE reiatsu SET last_steal_attempt = ? WHERE user_id = ?",
-            (now.isoformat(), voleur_id)
-        )
+        illusion = succes and cible_classe == "Illusionniste" and random.random() < 0.5
 
-        # 🔹 Résultat
-        if succes:
+        # 🔹 Enregistrement (écriture différée via le ledger)
+        fields = {"last_steal_attempt": now.isoformat()}
+        if skill_utilise:
+            fields["active_skill"] = 0
 
-            # Ajout au voleur
-            cursor.execute(
-                "UPDATE reiatsu SET points = points + ? WHERE user_id = ?",
-                (montant, voleur_id)
-            )
+        ledger.add(voleur_id, montant if succes else 0, **fields)
+        if succes and not illusion:
+            ledger.add(cible_id, -montant)
 
+        # 🔹 Résultat
+        if succes:
             # Illusionniste
-            if cible_classe == "Illusionniste" and random.random() < 0.5:
+            if illusion:
                 await safe_send(
                     channel,
                     f"🩸 {voleur.mention} a volé **{montant}**... mais c’était une illusion !"
                 )
             else:
-                cursor.execute(
-                    "UPDATE reiatsu SET points = MAX(points - ?, 0) WHERE user_id = ?",
-                    (montant, cible_id)
-                )
                 await safe_send(
                     channel,
                     f"🩸 {voleur.mention} a volé **{montant}** points à {cible.mention} !"
@@ -145,9 +124,6 @@ class ReiatsuVol(commands.Cog):
                 f"😵 {voleur.mention} a échoué à voler {cible.mention}."
             )
 
-        conn.commit()
-        conn.close()
-
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Slash
     # ────────────────────────────────────────────────────────────────────────────
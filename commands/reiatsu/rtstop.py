@@ -1,6 +1,6 @@
 # ────────────────────────────────────────────────────────────────────────────────
 # 📌 reiatsutop.py — Commande interactive /reiatsutop et !reiatsutop
-# Objectif : Affiche le classement global Reiatsu (Top 20) + position de l'utilisateur
+# Objectif : Affiche le classement Reiatsu (Top 20, global ou du serveur) + position de l'utilisateur
 # Catégorie : Reiatsu
 # Accès : Public
 # Cooldown : 1 utilisation / 3 secondes / utilisateur
@@ -10,22 +10,20 @@
 # 📦 Imports nécessaires
 # ────────────────────────────────────────────────────────────────────────────────
 import discord
-import sqlite3
 import time
 from discord import app_commands
 from discord.ext import commands
 from utils.discord_utils import safe_send, safe_respond
-
-# ────────────────────────────────────────────────────────────────────────────────
-# 🗄️ Configuration SQLite
-# ────────────────────────────────────────────────────────────────────────────────
-DB_PATH = "database/reiatsu.db"
+from utils.leaderboard import leaderboard
+from utils.reiatsu_ledger import ledger
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🏅 Médailles pour le podium
 # ────────────────────────────────────────────────────────────────────────────────
 MEDALS = {1: "🥇", 2: "🥈", 3: "🥉"}
 
+SCOPE_SERVER = ("serveur", "server", "local", "s")
+
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
 # ────────────────────────────────────────────────────────────────────────────────
@@ -37,11 +35,51 @@ class ReiatsuTopCommand(commands.Cog):
     # ──────────────────────────────────────────────────────────────
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
-        self.cursor = self.conn.cursor()
-
         self.user_cooldowns = {}
+        # Lignes du Top 20 déjà formatées : {(guild_id, portée): (version, [(user_id, ligne)])}
+        self._top_lines: dict[tuple[int | None, bool], tuple[int, list[tuple[int, str]]]] = {}
+
+    async def cog_load(self):
+        # Rechargement du cog à chaud : les membres sont déjà en cache
+        if self.bot.is_ready():
+            self._load_guild_members()
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Membres des serveurs (classements par serveur)
+    # ──────────────────────────────────────────────────────────────
+    def _set_guild(self, guild: discord.Guild):
+        leaderboard.set_guild_members(guild.id, (m.id for m in guild.members if not m.bot))
+        self._drop_lines(guild.id)
+
+    def _load_guild_members(self):
+        for guild in self.bot.guilds:
+            self._set_guild(guild)
+
+    def _drop_lines(self, guild_id: int):
+        self._top_lines.pop((guild_id, True), None)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        self._load_guild_members()
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        self._set_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        leaderboard.drop_guild(guild.id)
+        self._top_lines.pop((guild.id, True), None)
+        self._top_lines.pop((guild.id, False), None)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        if not member.bot:
+            leaderboard.add_member(member.guild.id, member.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        leaderboard.remove_member(member.guild.id, member.id)
 
     # ──────────────────────────────────────────────────────────────
     async def _check_cooldown(self, user_id: int):
@@ -53,19 +91,40 @@ class ReiatsuTopCommand(commands.Cog):
         return 0
 
     # ──────────────────────────────────────────────────────────────
-    async def _send_top(self, channel_or_interaction, author: discord.Member, guild: discord.Guild):
+    def _get_top_lines(self, guild: discord.Guild | None, local: bool) -> list[tuple[int, str]]:
+        """Lignes du Top 20, reformatées seulement quand le Top 20 a changé."""
+        guild_id = guild.id if guild else None
+        scope_id = guild_id if local else None
+        version = leaderboard.version(scope_id)
+        cached = self._top_lines.get((guild_id, local))
+        if cached and cached[0] == version:
+            return cached[1]
+
+        lines = []
+        for i, (uid, points) in enumerate(leaderboard.top(20, guild_id=scope_id), start=1):
+            member = guild.get_member(uid) if guild else None
+            name = member.display_name if member else f"Utilisateur ({uid})"
+            medal = MEDALS.get(i, f"**#{i}**")
+            lines.append((uid, f"{medal} **{name}** — {points} pts"))
+
+        self._top_lines[(guild_id, local)] = (version, lines)
+        return lines
+
+    # ──────────────────────────────────────────────────────────────
+    async def _send_top(self, channel_or_interaction, author: discord.Member, guild: discord.Guild,
+                        portee: str = "global"):
 
         user_id = author.id
+        local = guild is not None and portee.lower() in SCOPE_SERVER
+        if local and not leaderboard.has_guild(guild.id):
+            # Membres pas encore reçus (démarrage) : on les prend dans le cache Discord
+            self._set_guild(guild)
+        scope_id = guild.id if local else None
 
-        # ── Récupération du Top 20 ──
+        # ── Récupération du Top 20 (classement matérialisé en mémoire) ──
         try:
-            self.cursor.execute("""
-                SELECT user_id, points
-                FROM reiatsu
-                ORDER BY points DESC
-                LIMIT 20
-            """)
-            top20 = self.cursor.fetchall()
+            await ledger.flush()
+            await leaderboard.refresh()
         except Exception as e:
             print(f"[ERREUR DB] Impossible de récupérer le classement : {e}")
             msg = "❌ Erreur lors du chargement du classement."
@@ -73,7 +132,8 @@ class ReiatsuTopCommand(commands.Cog):
                 return await channel_or_interaction.response.send_message(msg, ephemeral=True)
             return await safe_send(channel_or_interaction, msg)
 
-        if not top20:
+        lines = self._get_top_lines(guild, local)
+        if not lines:
             msg = "⚠️ Aucun classement disponible pour le moment."
             if isinstance(channel_or_interaction, discord.Interaction):
                 return await channel_or_interaction.response.send_message(msg, ephemeral=True)
@@ -83,50 +143,24 @@ class ReiatsuTopCommand(commands.Cog):
         description = ""
         user_in_top = False
 
-        for i, entry in enumerate(top20, start=1):
-            uid = entry["user_id"]
-            points = entry["points"]
-            member = guild.get_member(uid) if guild else None
-            name = member.display_name if member else f"Utilisateur ({uid})"
-            medal = MEDALS.get(i, f"**#{i}**")
-            highlight = " ◀" if uid == user_id else ""
-            description += f"{medal} **{name}** — {points} pts{highlight}\n"
-
+        for uid, line in lines:
             if uid == user_id:
                 user_in_top = True
+                description += f"{line} ◀\n"
+            else:
+                description += f"{line}\n"
 
         # ── Position de l'utilisateur s'il n'est pas dans le Top 20 ──
-        footer_extra = ""
         if not user_in_top:
-            try:
-                self.cursor.execute("""
-                    SELECT COUNT(*) as rank
-                    FROM reiatsu
-                    WHERE points > (
-                        SELECT points FROM reiatsu WHERE user_id = ?
-                    )
-                """, (user_id,))
-                row = self.cursor.fetchone()
-
-                self.cursor.execute("""
-                    SELECT points FROM reiatsu WHERE user_id = ?
-                """, (user_id,))
-                user_row = self.cursor.fetchone()
-
-                if user_row:
-                    rank = (row["rank"] if row else 0) + 1
-                    points = user_row["points"]
-                    description += f"\n{'─' * 30}\n"
-                    description += f"📍 **Ta position** : #{rank} — {points} pts\n"
-                else:
-                    description += f"\n{'─' * 30}\n"
-                    description += "📍 **Ta position** : Non classé (0 pts)\n"
-
-            except Exception as e:
-                print(f"[ERREUR DB] Impossible de récupérer la position de l'utilisateur : {e}")
+            rank = leaderboard.rank(user_id, guild_id=scope_id)
+            description += f"\n{'─' * 30}\n"
+            if rank is not None:
+                description += f"📍 **Ta position** : #{rank} — {leaderboard.points(user_id)} pts\n"
+            else:
+                description += "📍 **Ta position** : Non classé (0 pts)\n"
 
         embed = discord.Embed(
-            title="📊 Classement Reiatsu — Top 20",
+            title=f"📊 Classement Reiatsu — Top 20 {guild.name if local else 'global'}",
             description=description,
             color=discord.Color.purple()
         )
@@ -145,9 +179,10 @@ class ReiatsuTopCommand(commands.Cog):
     # ────────────────────────────────────────────────────────────────────────────
     @app_commands.command(
         name="reiatsutop",
-        description="📊 Affiche le Top 20 Reiatsu et ta position dans le classement global."
+        description="📊 Affiche le Top 20 Reiatsu et ta position (global ou du serveur)."
     )
-    async def slash_reiatsutop(self, interaction: discord.Interaction):
+    @app_commands.describe(portee="Classement : global ou serveur")
+    async def slash_reiatsutop(self, interaction: discord.Interaction, portee: str = "global"):
 
         remaining = await self._check_cooldown(interaction.user.id)
 
@@ -161,7 +196,8 @@ class ReiatsuTopCommand(commands.Cog):
         await self._send_top(
             interaction,
             interaction.user,
-            interaction.guild
+            interaction.guild,
+            portee
         )
 
     # ────────────────────────────────────────────────────────────────────────────
@@ -170,9 +206,9 @@ class ReiatsuTopCommand(commands.Cog):
     @commands.command(
         name="reiatsutop",
         aliases=["rtst"],
-        help="📊 Affiche le Top 20 Reiatsu et ta position dans le classement global."
+        help="📊 Affiche le Top 20 Reiatsu et ta position (global ou du serveur)."
     )
-    async def prefix_reiatsutop(self, ctx: commands.Context):
+    async def prefix_reiatsutop(self, ctx: commands.Context, portee: str = "global"):
 
         remaining = await self._check_cooldown(ctx.author.id)
 
@@ -185,7 +221,8 @@ class ReiatsuTopCommand(commands.Cog):
         await self._send_top(
             ctx.channel,
             ctx.author,
-            ctx.guild
+            ctx.guild,
+            portee
         )
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -19,17 +19,13 @@ from datetime import datetime, timedelta, timezone
 import os
 import json
 import random
-import sqlite3
 from utils.discord_utils import safe_send, safe_respond
 from utils.reiatsu_utils import ensure_profile, has_class
-
-# ────────────────────────────────────────────────────────────────────────────────
-# 🗄️ SQLite
-# ────────────────────────────────────────────────────────────────────────────────
-DB_PATH = os.path.join("database", "reiatsu.db")
-
-def get_conn():
-    return sqlite3.connect(DB_PATH)
+from utils.database import db
+from utils.fake_spawns import fake_spawns
+from utils.profile_cache import profile_cache
+from utils.quests import complete_quest
+from utils.reiatsu_ledger import ledger
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📂 Chargement de la configuration Reiatsu
@@ -62,31 +58,10 @@ class Skill(commands.Cog):
     async def valider_quete_skill(self, user: discord.User, channel=None):
         """Valide la quête 'Première utilisation du skill'."""
         try:
-            conn = get_conn()
-            cursor = conn.cursor()
-
-            cursor.execute("SELECT quetes, niveau FROM reiatsu WHERE user_id = ?", (user.id,))
-            row = cursor.fetchone()
-            if not row:
-                conn.close()
+            new_lvl = await complete_quest(user.id, "skill")
+            if new_lvl is None:
                 return
 
-            quetes = json.loads(row[0] or "[]")
-            niveau = row[1] or 1
-
-            if "skill" in quetes:
-                conn.close()
-                return
-
-            quetes.append("skill")
-            new_lvl = niveau + 1
-            cursor.execute(
-                "UPDATE reiatsu SET quetes = ?, niveau = ? WHERE user_id = ?",
-                (json.dumps(quetes), new_lvl, user.id)
-            )
-            conn.commit()
-            conn.close()
-
             embed = discord.Embed(
                 title="🎯 Quête accomplie !",
                 description=f"Bravo **{user.name}** ! Tu as terminé la quête **Première utilisation du skill** 💫\n\n⭐ **Niveau +1 !** (Niveau {new_lvl})",
@@ -108,7 +83,7 @@ class Skill(commands.Cog):
 
         async with self.skill_locks[user.id]:
 
-            player = ensure_profile(user.id, user.name)
+            player = await ensure_profile(user.id, user.name)
 
             if not has_class(player):
                 await safe_send(channel, "❌ Tu n'as pas encore choisi de classe Reiatsu. Utilise `!!classe` pour choisir une classe.")
@@ -129,14 +104,11 @@ class Skill(commands.Cog):
             classe_data = self.config["CLASSES"].get(classe, {})
             base_cd = classe_data.get("Cooldown", 12)
 
-            conn = get_conn()
-            cursor = conn.cursor()
-            cursor.execute(
+            await ledger.flush()
+            row = await db.fetchone(
                 "SELECT last_skilled_at, active_skill, fake_spawn_id, points FROM reiatsu WHERE user_id = ?",
                 (user.id,)
             )
-            row = cursor.fetchone()
-            conn.close()
 
             if not row:
                 await safe_send(channel, "❌ Profil introuvable.")
@@ -182,23 +154,18 @@ class Skill(commands.Cog):
             # ───────────── Illusionniste ─────────────
             if classe == "Illusionniste":
 
-                conn = get_conn()
-                cursor = conn.cursor()
-                cursor.execute(
-                    "UPDATE reiatsu SET active_skill = 1, last_skilled_at = ? WHERE user_id = ?",
-                    (now_iso, user.id)
+                # Serveur du skill persisté : le faux spawn y reste même après un redémarrage
+                await db.execute(
+                    "UPDATE reiatsu SET active_skill = 1, last_skilled_at = ?, fake_spawn_guild_id = ? WHERE user_id = ?",
+                    (now_iso, channel.guild.id, user.id)
                 )
-                conn.commit()
-                conn.close()
+                profile_cache.invalidate(user.id)
+                fake_spawns.activate(user.id, channel.guild.id)
 
-                conn = get_conn()
-                cursor = conn.cursor()
-                cursor.execute(
+                conf_row = await db.fetchone(
                     "SELECT channel_id FROM reiatsu_config WHERE guild_id = ?",
                     (channel.guild.id,)
                 )
-                conf_row = cursor.fetchone()
-                conn.close()
 
                 if not conf_row or not conf_row[0]:
                     await safe_send(channel, "❌ Aucun canal de spawn configuré pour ce serveur.")
@@ -225,14 +192,11 @@ class Skill(commands.Cog):
             # ───────────── Voleur ─────────────
             elif classe == "Voleur":
 
-                conn = get_conn()
-                cursor = conn.cursor()
-                cursor.execute(
+                await db.execute(
                     "UPDATE reiatsu SET active_skill = 1, last_skilled_at = ? WHERE user_id = ?",
                     (now_iso, user.id)
                 )
-                conn.commit()
-                conn.close()
+                profile_cache.invalidate(user.id)
 
                 embed = discord.Embed(
                     title="🥷 Skill Voleur activé !",
@@ -247,14 +211,11 @@ class Skill(commands.Cog):
             # ───────────── Absorbeur ─────────────
             elif classe == "Absorbeur":
 
-                conn = get_conn()
-                cursor = conn.cursor()
-                cursor.execute(
+                await db.execute(
                     "UPDATE reiatsu SET active_skill = 1, last_skilled_at = ? WHERE user_id = ?",
                     (now_iso, user.id)
                 )
-                conn.commit()
-                conn.close()
+                profile_cache.invalidate(user.id)
 
                 embed = discord.Embed(
                     title="🌀 Skill Absorbeur activé !",
@@ -306,16 +267,15 @@ class Skill(commands.Cog):
                     result_text = "❌ **Perdu !** -30 Reiatsu."
                     gain = -mise
 
-                new_points = max(0, points + gain)
-
-                conn = get_conn()
-                cursor = conn.cursor()
-                cursor.execute(
-                    "UPDATE reiatsu SET points = ?, last_skilled_at = ? WHERE user_id = ?",
-                    (new_points, now_iso, user.id)
-                )
-                conn.commit()
-                conn.close()
+                # Variation appliquée en base (le solde lu avant l'animation peut avoir changé)
+                async with db.transaction() as tx:
+                    rows = await tx.fetchall(
+                        "UPDATE reiatsu SET points = MAX(points + ?, 0), last_skilled_at = ? "
+                        "WHERE user_id = ? RETURNING points",
+                        (gain, now_iso, user.id)
+                    )
+                profile_cache.invalidate(user.id)
+                new_points = rows[0]["points"] if rows else max(0, points + gain)
 
                 embed.description = f"{slots[0]} | {slots[1]} | {slots[2]}\n\n{result_text}"
                 embed.color = discord.Color.gold() if gain > 0 else discord.Color.red()
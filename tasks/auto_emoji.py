@@ -12,6 +12,13 @@ import discord
 from discord.ext import commands
 import re
 
+from utils.webhook_pool import webhook_pool
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 Tokenizer unique : <:nom:id>, <a:nom:id> et :nom:
+# ────────────────────────────────────────────────────────────────────────────────
+EMOJI_TOKEN = re.compile(r"<a?:([a-zA-Z0-9_]+):\d+>|:([a-zA-Z0-9_]+):")
+
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
 # ────────────────────────────────────────────────────────────────────────────────
@@ -20,6 +27,58 @@ class AutoEmoji(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # Index global tenu à jour par les événements de serveurs :
+        # {nom en minuscules: {guild_id: "<:nom:id>"}}
+        self._emojis: dict[str, dict[int, str]] = {}
+        self._guild_names: dict[int, set[str]] = {}  # noms indexés par serveur (pour les retirer)
+
+    # ──────────────────────────────────────────────────────────
+    # 🔹 Index des emojis
+    # ──────────────────────────────────────────────────────────
+    def _index_guild(self, guild: discord.Guild):
+        self._unindex_guild(guild.id)
+        names = set()
+        for e in guild.emojis:
+            name = e.name.lower()
+            self._emojis.setdefault(name, {})[guild.id] = str(e)
+            names.add(name)
+        if names:
+            self._guild_names[guild.id] = names
+
+    def _unindex_guild(self, guild_id: int):
+        for name in self._guild_names.pop(guild_id, ()):
+            by_guild = self._emojis.get(name)
+            if by_guild is None:
+                continue
+            by_guild.pop(guild_id, None)
+            if not by_guild:
+                del self._emojis[name]
+
+    def _rebuild_index(self):
+        self._emojis.clear()
+        self._guild_names.clear()
+        for guild in self.bot.guilds:
+            self._index_guild(guild)
+
+    async def cog_load(self):
+        if self.bot.is_ready():
+            self._rebuild_index()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        self._rebuild_index()
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        self._index_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self._unindex_guild(guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_emojis_update(self, guild: discord.Guild, before, after):
+        self._index_guild(guild)
 
     # ──────────────────────────────────────────────────────────
     # 🔹 Vérifie si le message est une commande bot
@@ -33,40 +92,32 @@ class AutoEmoji(commands.Cog):
     # 🔹 Fonction pour remplacer les emojis custom (identique à say.py)
     # ──────────────────────────────────────────────────────────
     def _replace_custom_emojis(self, channel, message: str) -> str:
-        # Supprime l'affichage en texte brut des emojis non animés (<:nom:id>)
-        message = re.sub(r"<:([a-zA-Z0-9_]+):\d+>", r":\1:", message)
-        # Supprime aussi les emojis animés (<a:nom:id>)
-        message = re.sub(r"<a:([a-zA-Z0-9_]+):\d+>", r":\1:", message)
-
-        # Remplace par des emojis valides si trouvés dans les serveurs du bot
-        all_emojis = {}
-        if hasattr(channel, "guild"):
-            all_emojis.update({e.name.lower(): str(e) for e in channel.guild.emojis})
-            for g in self.bot.guilds:
-                if g.id != channel.guild.id:
-                    all_emojis.update({e.name.lower(): str(e) for e in g.emojis})
-
-        return re.sub(
-            r":([a-zA-Z0-9_]+):",
-            lambda m: all_emojis.get(m.group(1).lower(), m.group(0)),
-            message,
-            flags=re.IGNORECASE
-        )
+        """
+        Un seul passage : chaque emoji (brut ou :nom:) est remplacé par un emoji
+        valide du serveur courant en priorité, sinon d'un autre serveur du bot ;
+        les emojis inconnus restent en texte :nom:.
+        """
+        guild_id = channel.guild.id if getattr(channel, "guild", None) else None
+
+        def replace(match: re.Match) -> str:
+            name = match.group(1) or match.group(2)
+            by_guild = self._emojis.get(name.lower())
+            if not by_guild:
+                return f":{name}:"
+            return by_guild.get(guild_id) or next(iter(by_guild.values()))
+
+        return EMOJI_TOKEN.sub(replace, message)
 
     # ──────────────────────────────────────────────────────────
     # 🔹 Listener sur tous les messages
     # ──────────────────────────────────────────────────────────
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
-        if message.author.bot or not hasattr(message.channel, "guild"):
-            return
-
         content = message.content
-        if not content:
+        # Chemin rapide : pas de « : », pas d'emoji possible
+        if not content or ":" not in content:
             return
-
-        # Ignore les commandes du bot
-        if await self._is_command(message):
+        if message.author.bot or not hasattr(message.channel, "guild"):
             return
 
         # Remplacement des emojis custom
@@ -76,17 +127,18 @@ class AutoEmoji(commands.Cog):
         if new_content == content:
             return
 
-        # Identique à _say_as_user dans say.py : webhook temporaire créé puis supprimé
-        webhook = await message.channel.create_webhook(name=f"tmp-{message.author.name}")
-        try:
-            await webhook.send(
-                content=new_content,
-                username=message.author.display_name,
-                avatar_url=message.author.display_avatar.url,
-                allowed_mentions=discord.AllowedMentions.all()
-            )
-        finally:
-            await webhook.delete()
+        # Ignore les commandes du bot (vérifié seulement quand il y a un repost à faire)
+        if await self._is_command(message):
+            return
+
+        # Identique à _say_as_user dans say.py : webhook du salon réutilisé
+        await webhook_pool.send(
+            message.channel,
+            content=new_content,
+            username=message.author.display_name,
+            avatar_url=message.author.display_avatar.url,
+            allowed_mentions=discord.AllowedMentions.all()
+        )
 
         # Supprime le message original
         await message.delete()
@@ -14,11 +14,17 @@ import random
 import time
 import asyncio
 import json
-import sqlite3
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 from discord.ext import commands, tasks
 from utils.discord_utils import safe_send, safe_delete
+from utils.database import db
+from utils.fake_spawns import fake_spawns, FAKE_SPAWN_TTL
+from utils.profile_cache import profile_cache
+from utils.reiatsu_ledger import ledger
+from utils.spawn_scheduler import SpawnScheduler
+from utils.timer_service import timer_service
 
 # ────────────────────────────────────────────────────────────────────────────────
 # ⚙️ Paramètres globaux
@@ -34,18 +40,30 @@ NORMAL_REIATSU_GAIN  = CONFIG["NORMAL_REIATSU_GAIN"]
 SPAWN_SPEED_RANGES   = CONFIG["SPAWN_SPEED_RANGES"]
 DEFAULT_SPAWN_SPEED  = CONFIG["DEFAULT_SPAWN_SPEED"]
 
-DB_PATH = "database/reiatsu.db"
-
+FAKE_TIMER = "reiatsu_spawner.fake"  # minuteur de disparition d'un faux Reiatsu, clé = message_id
 
 # ────────────────────────────────────────────────────────────────────────────────
-# 🛠️ Helper : timestamp UTC actuel (entier)
+# 🛠️ Helpers : dates UTC et délais de spawn
 # ────────────────────────────────────────────────────────────────────────────────
-def _now_ts() -> int:
-    return int(datetime.now(timezone.utc).timestamp())
-
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat(timespec="seconds")
 
+def _parse_ts(value: str | None) -> float:
+    """ISO stocké en base → timestamp (une date sans fuseau est considérée UTC)."""
+    if not value:
+        return 0.0
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return 0.0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+def _random_delay(spawn_speed: str | None) -> int:
+    min_d, max_d = SPAWN_SPEED_RANGES.get(spawn_speed or DEFAULT_SPAWN_SPEED, SPAWN_SPEED_RANGES[DEFAULT_SPAWN_SPEED])
+    return random.randint(min_d, max_d)
+
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog : ReiatsuSpawner
@@ -55,18 +73,28 @@ class ReiatsuSpawner(commands.Cog):
     # ──────────────────────────────────────────────────────────────
     def __init__(self, bot: commands.Bot):
         self.bot   = bot
-        self.locks: dict[str, asyncio.Lock] = {}
-        self.conn  = sqlite3.connect(DB_PATH, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
-        self.cursor = self.conn.cursor()
+        self.locks: dict[int, list] = {}  # {message_id: [Lock, nb de détenteurs/attente]}
+
+        # Registre des vrais spawns en ligne (les faux sont dans fake_spawns)
+        self.live_spawns: dict[int, int] = {}      # {message_id: guild_id}
+        self._spawn_by_guild: dict[int, int] = {}  # {guild_id: message_id}
+
+        # Prochain spawn de chaque serveur + salon de spawn configuré
+        self.scheduler = SpawnScheduler()
+        self.spawn_channels: dict[int, int] = {}  # {guild_id: channel_id}
+        self.spawn_speeds: dict[int, str] = {}    # {guild_id: spawn_speed}
+        self._scheduler_task: asyncio.Task | None = None
 
     async def cog_load(self):
-        asyncio.create_task(self._check_on_startup())
+        self._scheduler_task = asyncio.create_task(self._run_scheduler())
         self.spawn_loop.start()
+        timer_service.register(FAKE_TIMER, self._on_fake_expired)
 
     def cog_unload(self):
         self.spawn_loop.cancel()
-        self.conn.close()
+        if self._scheduler_task:
+            self._scheduler_task.cancel()
+        timer_service.unregister(FAKE_TIMER)  # échéances persistées : reprises au prochain chargement
 
     # ──────────────────────────────────────────────────────────────
     # 🔹 Nettoyage au démarrage — supprime les spawns fantômes
@@ -74,8 +102,7 @@ class ReiatsuSpawner(commands.Cog):
     async def _check_on_startup(self):
         await self.bot.wait_until_ready()
 
-        self.cursor.execute("SELECT * FROM reiatsu_config")
-        configs = self.cursor.fetchall()
+        configs = await db.fetchall("SELECT * FROM reiatsu_config")
 
         for conf in configs:
             if not conf["is_spawn"] or not conf["message_id"]:
@@ -90,11 +117,111 @@ class ReiatsuSpawner(commands.Cog):
                 await channel.fetch_message(conf["message_id"])
             except Exception:
                 # Message introuvable → reset propre + nouveau délai immédiat
-                self._reset_spawn_config(conf["guild_id"], new_delay=True)
+                await self._reset_spawn_config(conf["guild_id"], new_delay=True)
                 print(f"[STARTUP] Spawn fantôme nettoyé — guild {conf['guild_id']}")
 
     # ──────────────────────────────────────────────────────────────
-    # 🔹 Boucle principale de spawn
+    # 🔹 Planification des spawns (tas-min par échéance)
+    # ──────────────────────────────────────────────────────────────
+    async def load_schedule(self):
+        """Charge une seule fois toutes les configs et planifie chaque serveur."""
+        self.scheduler.clear()
+        self.spawn_channels.clear()
+        self.spawn_speeds.clear()
+        self.live_spawns.clear()
+        self._spawn_by_guild.clear()
+        for conf in await db.fetchall("SELECT * FROM reiatsu_config"):
+            self._schedule_from_row(conf)
+
+    def _schedule_from_row(self, conf):
+        guild_id = conf["guild_id"]
+        self.spawn_speeds[guild_id] = conf["spawn_speed"] or DEFAULT_SPAWN_SPEED
+        if conf["is_spawn"] and conf["message_id"]:
+            self._register_spawn(guild_id, conf["message_id"])
+        else:
+            self._unregister_spawn(guild_id)
+
+        if not conf["channel_id"]:
+            self.spawn_channels.pop(guild_id, None)
+            self.scheduler.cancel(guild_id)
+            return
+
+        self.spawn_channels[guild_id] = conf["channel_id"]
+        if conf["is_spawn"]:
+            self.scheduler.cancel(guild_id)  # replanifié à la capture
+            return
+
+        delay = conf["spawn_delay"] or _random_delay(conf["spawn_speed"])
+        self.scheduler.schedule(guild_id, _parse_ts(conf["last_spawn_at"]) + delay)
+
+    async def refresh_guild(self, guild_id: int):
+        """Relit la config d'un serveur après une modification externe (commandes admin)."""
+        conf = await db.fetchone("SELECT * FROM reiatsu_config WHERE guild_id = ?", (guild_id,))
+        if conf:
+            self._schedule_from_row(conf)
+        else:
+            self.spawn_channels.pop(guild_id, None)
+            self.spawn_speeds.pop(guild_id, None)
+            self.scheduler.cancel(guild_id)
+            self._unregister_spawn(guild_id)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Registre des spawns en ligne + verrous de capture
+    # ──────────────────────────────────────────────────────────────
+    def _register_spawn(self, guild_id: int, message_id: int):
+        self._unregister_spawn(guild_id)
+        self.live_spawns[message_id] = guild_id
+        self._spawn_by_guild[guild_id] = message_id
+
+    def _unregister_spawn(self, guild_id: int):
+        message_id = self._spawn_by_guild.pop(guild_id, None)
+        if message_id is not None:
+            self.live_spawns.pop(message_id, None)
+
+    @asynccontextmanager
+    async def _capture_lock(self, message_id: int):
+        """Verrou anti-double capture, retiré dès que plus personne ne l'attend."""
+        entry = self.locks.get(message_id)
+        if entry is None:
+            entry = self.locks[message_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                self.locks.pop(message_id, None)
+
+    async def _run_scheduler(self):
+        """Tâche unique : dort jusqu'au prochain spawn dû puis le déclenche."""
+        await self.bot.wait_until_ready()
+        await self._check_on_startup()
+        await self.load_schedule()
+        await fake_spawns.load()
+
+        while True:
+            for guild_id in await self.scheduler.wait():
+                if not getattr(self.bot, "is_main_instance", True):
+                    self.scheduler.schedule(guild_id, time.time() + SPAWN_LOOP_INTERVAL)
+                    continue
+                try:
+                    await self._spawn_due(guild_id)
+                except Exception as e:
+                    print(f"[ERREUR spawn_scheduler] {e}")
+                    self.scheduler.schedule(guild_id, time.time() + SPAWN_LOOP_INTERVAL)
+
+    async def _spawn_due(self, guild_id: int):
+        channel_id = self.spawn_channels.get(guild_id)
+        channel    = self.bot.get_channel(channel_id) if channel_id else None
+        if not channel:
+            # Salon absent du cache (ou supprimé) → nouvel essai plus tard
+            self.scheduler.schedule(guild_id, time.time() + SPAWN_LOOP_INTERVAL)
+            return
+        await self._spawn_message(channel, guild_id)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Boucle des faux Reiatsu (Illusionniste)
     # ──────────────────────────────────────────────────────────────
     @tasks.loop(seconds=SPAWN_LOOP_INTERVAL)
     async def spawn_loop(self):
@@ -102,68 +229,81 @@ class ReiatsuSpawner(commands.Cog):
         if not getattr(self.bot, "is_main_instance", True):
             return
         try:
-            await self._spawn_tick()
+            await self._fake_spawn_tick()
         except Exception as e:
             print(f"[ERREUR spawn_loop] {e}")
 
     # ──────────────────────────────────────────────────────────────
-    async def _spawn_tick(self):
-        now = _now_ts()
-
-        self.cursor.execute("SELECT * FROM reiatsu_config")
-        configs = self.cursor.fetchall()
-
-        for conf in configs:
-            guild_id   = conf["guild_id"]
-            channel_id = conf["channel_id"]
-            if not channel_id:
+    async def _fake_spawn_tick(self):
+        """Un seul passage sur les Illusionnistes en attente, sans requête SQL."""
+        for owner_id, guild_id in fake_spawns.pending_dispatch():
+            if guild_id is None:
+                await self._cancel_fake_skill(owner_id)
                 continue
+            channel = self._fake_spawn_channel(guild_id)
+            if channel:
+                await self._spawn_message(
+                    channel,
+                    guild_id=guild_id,
+                    is_fake=True,
+                    owner_id=owner_id
+                )
 
-            # ── Calcul du délai attendu ────────────────────────────
-            spawn_speed      = conf["spawn_speed"] or DEFAULT_SPAWN_SPEED
-            min_d, max_d     = SPAWN_SPEED_RANGES.get(spawn_speed, SPAWN_SPEED_RANGES[DEFAULT_SPAWN_SPEED])
-            spawn_delay      = conf["spawn_delay"] or random.randint(min_d, max_d)
-            last_spawn_str   = conf["last_spawn_at"]
-
-            if last_spawn_str:
-                try:
-                    last_ts = int(datetime.fromisoformat(last_spawn_str).timestamp())
-                except Exception:
-                    last_ts = 0
-            else:
-                last_ts = 0
+    def _fake_spawn_channel(self, guild_id: int) -> discord.TextChannel | None:
+        """Salon de spawn du serveur du joueur (None s'il n'est pas configuré ou pas en cache)."""
+        channel_id = self.spawn_channels.get(guild_id)
+        return self.bot.get_channel(channel_id) if channel_id else None
+
+    async def _cancel_fake_skill(self, owner_id: int):
+        """
+        Skill lancé avant que son serveur ne soit enregistré (ancienne ligne) :
+        plutôt qu'un faux spawn dans un serveur au hasard, le skill est rendu.
+        """
+        print(f"[spawner] Serveur inconnu pour le faux Reiatsu de {owner_id} : skill annulé")
+        fake_spawns.drop(owner_id)
+        await db.execute(
+            "UPDATE reiatsu SET active_skill = 0 WHERE user_id = ? AND fake_spawn_id IS NULL",
+            (owner_id,)
+        )
+        profile_cache.invalidate(owner_id)
 
-            elapsed     = now - last_ts
-            should_spawn = (not conf["is_spawn"]) and (elapsed >= spawn_delay)
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Expiration des faux Reiatsu (minuteur persistant timer_service)
+    # ──────────────────────────────────────────────────────────────
+    async def _release_fake(self, message_id: int) -> dict | None:
+        """Faux spawn capturé : annule son expiration et le retire du tracker."""
+        await timer_service.cancel(FAKE_TIMER, message_id)
+        return fake_spawns.release(message_id)
+
+    async def _on_fake_expired(self, key: str, payload):
+        message_id = int(key)
+        entry = fake_spawns.release(message_id)
+        if not entry:
+            # Échu hors ligne et tracker pas encore rechargé : la base fait foi
+            row = await db.fetchone("""
+                SELECT user_id AS owner_id, fake_spawn_channel_id AS channel_id
+                FROM reiatsu WHERE fake_spawn_id = ?
+            """, (message_id,))
+            if not row:
+                return
+            entry = dict(row)
 
-            if should_spawn:
-                channel = self.bot.get_channel(channel_id)
-                if channel:
-                    await self._spawn_message(channel, guild_id)
+        channel = self.bot.get_channel(entry["channel_id"]) if entry["channel_id"] else None
+        if channel:
+            try:
+                msg = await channel.fetch_message(message_id)
+                await safe_delete(msg)
+            except Exception:
+                pass
 
-            # ── Faux reiatsu Illusionniste ─────────────────────────
-            channel = self.bot.get_channel(channel_id)
-            if channel:
-                # ⚠️ Vérifie qu’aucun faux spawn actif pour ce joueur
-                self.cursor.execute("""
-                    SELECT user_id FROM reiatsu
-                    WHERE classe = 'Illusionniste' AND active_skill = 1 AND fake_spawn_id IS NULL
-                """)
-                players = self.cursor.fetchall()
-                for player in players:
-                    # Vérifie qu’il n’y a pas déjà de spawn existant dans le serveur
-                    self.cursor.execute("""
-                        SELECT 1 FROM reiatsu WHERE fake_spawn_guild_id = ?
-                        AND fake_spawn_id IS NOT NULL AND user_id = ?
-                    """, (guild_id, player["user_id"]))
-                    if self.cursor.fetchone():
-                        continue  # un faux spawn existe déjà
-                    await self._spawn_message(
-                        channel,
-                        guild_id=guild_id,
-                        is_fake=True,
-                        owner_id=player["user_id"]
-                    )
+        await db.execute("""
+            UPDATE reiatsu
+            SET fake_spawn_id = NULL, fake_spawn_guild_id = NULL,
+                fake_spawn_channel_id = NULL, fake_spawn_expires_at = NULL,
+                active_skill = 0
+            WHERE user_id = ? AND fake_spawn_id = ?
+        """, (entry["owner_id"], message_id))
+        profile_cache.invalidate(entry["owner_id"])
 
     # ──────────────────────────────────────────────────────────────
     # 🔹 Envoi d'un message de spawn (vrai ou faux)
@@ -183,6 +323,8 @@ class ReiatsuSpawner(commands.Cog):
 
         message = await safe_send(channel, embed=embed)
         if not message:
+            if not is_fake and guild_id is not None:
+                self.scheduler.schedule(guild_id, time.time() + SPAWN_LOOP_INTERVAL)
             return
 
         try:
@@ -190,134 +332,62 @@ class ReiatsuSpawner(commands.Cog):
         except discord.HTTPException:
             pass
 
+        # ── Faux Reiatsu : une écriture + une seule expiration planifiée ──
         if is_fake:
-            self.cursor.execute(
-                "UPDATE reiatsu SET fake_spawn_id = ?, fake_spawn_guild_id = ? WHERE user_id = ?",
-                (message.id, channel.guild.id, owner_id)
-            )
-        else:
-            spawn_speed  = self._get_spawn_speed(guild_id)
-            min_d, max_d = SPAWN_SPEED_RANGES.get(spawn_speed, SPAWN_SPEED_RANGES[DEFAULT_SPAWN_SPEED])
-            next_delay   = random.randint(min_d, max_d)
-
-            self.cursor.execute("""
-                UPDATE reiatsu_config
-                SET is_spawn = 1,
-                    last_spawn_at = ?,
-                    message_id = ?,
-                    spawn_delay = ?
-                WHERE guild_id = ?
-            """, (_now_iso(), message.id, next_delay, guild_id))
-
-        self.conn.commit()
-
-        if is_fake:
-            asyncio.create_task(
-                self._delete_fake_after_delay(channel, message.id, owner_id)
-            )
-        else:
-            spawn_speed  = self._get_spawn_speed(guild_id)
-            min_d, max_d = SPAWN_SPEED_RANGES.get(spawn_speed, SPAWN_SPEED_RANGES[DEFAULT_SPAWN_SPEED])
-            next_delay   = random.randint(min_d, max_d)
-
-            self.cursor.execute("""
-                UPDATE reiatsu_config
-                SET is_spawn = 1,
-                    last_spawn_at = ?,
-                    message_id = ?,
-                    spawn_delay = ?
-                WHERE guild_id = ?
-            """, (_now_iso(), message.id, next_delay, guild_id))
-
-        self.conn.commit()
-
-        if is_fake:
-            asyncio.create_task(
-                self._delete_fake_after_delay(channel, message.id, owner_id)
-            )
-
-    # ──────────────────────────────────────────────────────────────
-    def _get_spawn_speed(self, guild_id: int) -> str:
-        self.cursor.execute(
-            "SELECT spawn_speed FROM reiatsu_config WHERE guild_id = ?", (guild_id,)
-        )
-        row = self.cursor.fetchone()
-        return (row["spawn_speed"] if row and row["spawn_speed"] else DEFAULT_SPAWN_SPEED)
-
-    # ──────────────────────────────────────────────────────────────
-    # 🔹 Suppression automatique d'un faux reiatsu après 3 minutes
-    # ──────────────────────────────────────────────────────────────
-    async def _delete_fake_after_delay(
-        self,
-        channel: discord.TextChannel,
-        message_id: int,
-        owner_id: int
-    ):
-        await asyncio.sleep(180)
-
-        self.cursor.execute(
-            "SELECT fake_spawn_id FROM reiatsu WHERE user_id = ?", (owner_id,)
-        )
-        row = self.cursor.fetchone()
-        if not row or not row["fake_spawn_id"]:
+            expires_at = time.time() + FAKE_SPAWN_TTL
+            await db.execute("""
+                UPDATE reiatsu
+                SET fake_spawn_id = ?, fake_spawn_guild_id = ?,
+                    fake_spawn_channel_id = ?, fake_spawn_expires_at = ?
+                WHERE user_id = ?
+            """, (message.id, channel.guild.id, channel.id, expires_at, owner_id))
+            profile_cache.invalidate(owner_id)
+            fake_spawns.register(message.id, owner_id, channel.guild.id, channel.id, expires_at)
+            await timer_service.schedule(FAKE_TIMER, message.id, expires_at)
             return
 
-        try:
-            msg = await channel.fetch_message(message_id)
-            await safe_delete(msg)
-        except Exception:
-            pass
-
-        self.cursor.execute(
-            "UPDATE reiatsu SET fake_spawn_id = NULL, fake_spawn_guild_id = NULL, active_skill = 0 WHERE user_id = ?",
-            (owner_id,)
-        )
-        self.conn.commit()
-
-    # ──────────────────────────────────────────────────────────────
-    # 🔹 Spawn faux reiatsu pour les Illusionnistes actifs
-    # ──────────────────────────────────────────────────────────────
-    async def _spawn_faux_reiatsu(self, channel: discord.TextChannel, guild_id: int):
-        self.cursor.execute("""
-            SELECT user_id FROM reiatsu
-            WHERE classe = 'Illusionniste'
-            AND active_skill = 1
-            AND fake_spawn_id IS NULL
-        """)
-        players = self.cursor.fetchall()
-
-        for player in players:
-            await self._spawn_message(
-                channel,
-                guild_id=guild_id,
-                is_fake=True,
-                owner_id=player["user_id"]
-            )
+        # ── Vrai Reiatsu : une seule écriture (vitesse connue en mémoire) ──
+        next_delay = _random_delay(self.spawn_speeds.get(guild_id))
+        await db.execute("""
+            UPDATE reiatsu_config
+            SET is_spawn = 1,
+                last_spawn_at = ?,
+                message_id = ?,
+                spawn_delay = ?
+            WHERE guild_id = ?
+        """, (_now_iso(), message.id, next_delay, guild_id))
+        self._register_spawn(guild_id, message.id)
 
     # ──────────────────────────────────────────────────────────────
     # 🔹 Calcul du gain lors d'une absorption
     # ──────────────────────────────────────────────────────────────
-    def _calculate_gain(self, user_id: int) -> tuple[int, bool, str | None]:
-        self.cursor.execute(
-            "SELECT classe, points, bonus5, active_skill FROM reiatsu WHERE user_id = ?",
+    async def _calculate_gain(self, user_id: int) -> tuple[int, bool, str | None]:
+        # Ledger lu avant la base : un lot validé entre les deux lectures est alors
+        # vu par la base, jamais perdu entre les deux
+        pending = ledger.pending(user_id)
+        row = await db.fetchone(
+            "SELECT classe, bonus5, active_skill FROM reiatsu WHERE user_id = ?",
             (user_id,)
         )
-        row = self.cursor.fetchone()
 
         if row:
-            classe         = row["classe"] or None
-            current_points = row["points"] or 0
-            bonus5         = row["bonus5"] or 0
-            active_skill   = row["active_skill"]
+            classe       = row["classe"] or None
+            bonus5       = row["bonus5"] or 0
+            active_skill = row["active_skill"]
         else:
-            classe, current_points, bonus5, active_skill = None, 0, 0, 0
+            classe, bonus5, active_skill = None, 0, 0
+
+        # Valeurs pas encore validées par le ledger (plus récentes que la base)
+        if pending:
+            bonus5       = pending["fields"].get("bonus5", bonus5)
+            active_skill = pending["fields"].get("active_skill", active_skill)
+
+        fields = {}
 
         # ── Détermination du type de reiatsu ──────────────────────
         if classe == "Absorbeur" and active_skill:
             is_super = True
-            self.cursor.execute(
-                "UPDATE reiatsu SET active_skill = 0 WHERE user_id = ?", (user_id,)
-            )
+            fields["active_skill"] = 0
         else:
             is_super = random.randint(1, 100) <= SUPER_REIATSU_CHANCE
 
@@ -338,18 +408,8 @@ class ReiatsuSpawner(commands.Cog):
         else:
             bonus5 = 0
 
-        new_total = current_points + gain
-
-        # ── BUG CORRIGÉ : on ne réécrit pas username (évite d'écraser avec "")
-        self.cursor.execute("""
-            INSERT INTO reiatsu (user_id, username, points, classe, bonus5)
-            VALUES (?, '', ?, ?, ?)
-            ON CONFLICT(user_id) DO UPDATE SET
-                points = excluded.points,
-                bonus5 = excluded.bonus5
-        """, (user_id, new_total, classe or "", bonus5))
-
-        self.conn.commit()
+        # ── Écriture différée (on ne réécrit pas username) ─────────
+        ledger.add(user_id, gain, bonus5=bonus5, **fields)
 
         return gain, is_super, classe
 
@@ -374,15 +434,12 @@ class ReiatsuSpawner(commands.Cog):
     # ──────────────────────────────────────────────────────────────
     # 🔹 Helper : reset config spawn après capture
     # ──────────────────────────────────────────────────────────────
-    def _reset_spawn_config(self, guild_id: int, new_delay: bool = True):
+    async def _reset_spawn_config(self, guild_id: int, new_delay: bool = True):
         """Remet is_spawn à 0 et génère un nouveau délai aléatoire."""
-        next_delay = None
-        if new_delay:
-            spawn_speed  = self._get_spawn_speed(guild_id)
-            min_d, max_d = SPAWN_SPEED_RANGES.get(spawn_speed, SPAWN_SPEED_RANGES[DEFAULT_SPAWN_SPEED])
-            next_delay   = random.randint(min_d, max_d)
+        speed      = self.spawn_speeds.get(guild_id)
+        next_delay = _random_delay(speed) if new_delay else None
 
-        self.cursor.execute("""
+        await db.execute("""
             UPDATE reiatsu_config
             SET is_spawn = 0,
                 message_id = NULL,
@@ -390,10 +447,13 @@ class ReiatsuSpawner(commands.Cog):
                 spawn_delay = ?
             WHERE guild_id = ?
         """, (_now_iso(), next_delay, guild_id))
-        self.conn.commit()
+        self._unregister_spawn(guild_id)
+
+        if guild_id in self.spawn_channels:
+            self.scheduler.schedule(guild_id, time.time() + (next_delay or _random_delay(speed)))
 
     # ──────────────────────────────────────────────────────────────
-    # 🔹 Listener réaction — capture du Reiatsu (corrigé)
+    # 🔹 Listener réaction — capture du Reiatsu
     # ──────────────────────────────────────────────────────────────
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
@@ -401,55 +461,42 @@ class ReiatsuSpawner(commands.Cog):
             return
         if str(payload.emoji) != "💠":
             return
-    
+
         guild_id   = payload.guild_id
         message_id = payload.message_id
         user_id    = payload.user_id
-    
-        # Vérifie vrai spawn
-        self.cursor.execute("""
-            SELECT * FROM reiatsu_config
-            WHERE guild_id = ? AND message_id = ? AND is_spawn = 1
-        """, (guild_id, message_id))
-        conf = self.cursor.fetchone()
-    
-        # Vérifie faux spawn
-        self.cursor.execute(
-            "SELECT user_id AS owner_id FROM reiatsu WHERE fake_spawn_id = ?", (message_id,)
-        )
-        fake_row = self.cursor.fetchone()
-    
-        # Si ni vrai ni faux → rien à faire
-        if not conf and not fake_row:
+
+        # Filtre en mémoire : un message qui n'est pas un spawn ne touche pas SQLite
+        is_real = self.live_spawns.get(message_id) == guild_id
+        fake    = fake_spawns.get(message_id)
+        if not is_real and not fake:
             return
-    
+
         # ⚠️ Ignore si c’est le propriétaire du faux spawn
-        if fake_row and fake_row["owner_id"] == user_id:
+        if fake and fake["owner_id"] == user_id:
             return
-    
-        # Verrou anti-double capture
-        lock_key = f"{guild_id}-{message_id}"
-        if lock_key not in self.locks:
-            self.locks[lock_key] = asyncio.Lock()
-    
-        async with self.locks[lock_key]:
-            # Re-vérifie disponibilité
-            if conf:
-                self.cursor.execute("""
+
+        async with self._capture_lock(message_id):
+            # Re-vérifie disponibilité en base (index sur message_id / fake_spawn_id)
+            if is_real:
+                current = await db.fetchone("""
                     SELECT is_spawn FROM reiatsu_config
                     WHERE guild_id = ? AND message_id = ?
                 """, (guild_id, message_id))
-                current = self.cursor.fetchone()
                 if not current or not current["is_spawn"]:
+                    self._unregister_spawn(guild_id)
                     return
-            elif fake_row:
-                self.cursor.execute(
-                    "SELECT fake_spawn_id, user_id AS owner_id FROM reiatsu WHERE fake_spawn_id = ?", (message_id,)
+            else:
+                current = await db.fetchone(
+                    "SELECT user_id AS owner_id FROM reiatsu WHERE fake_spawn_id = ?", (message_id,)
                 )
-                current = self.cursor.fetchone()
-                if not current or current["owner_id"] == user_id:
+                if not current:
+                    await self._release_fake(message_id)
                     return
-    
+                if current["owner_id"] == user_id:
+                    return
+                owner_id = current["owner_id"]
+
             # Récupère channel et membre
             channel = self.bot.get_channel(payload.channel_id)
             if not channel:
@@ -460,57 +507,46 @@ class ReiatsuSpawner(commands.Cog):
             user = guild.get_member(user_id) or await guild.fetch_member(user_id)
             if not user:
                 return
-    
+
             # Calcul du gain
             gain, is_super, classe = 0, False, None
-            if conf:
+            if is_real:
                 # Vrai Reiatsu → calcule normalement
-                cog = self.bot.get_cog("ReiatsuSpawner")
-                if cog:
-                    gain, is_super, classe = cog._calculate_gain(user_id)
-            elif fake_row:
+                gain, is_super, classe = await self._calculate_gain(user_id)
+            else:
                 # Faux Reiatsu → +50 au propriétaire
-                owner_id = fake_row["owner_id"]
-                cog = self.bot.get_cog("ReiatsuSpawner")
-                if cog:
-                    cog.cursor.execute(
-                        "UPDATE reiatsu SET points = points + 50, active_skill = 0 WHERE user_id = ?",
-                        (owner_id,)
-                    )
-                    cog.conn.commit()
-                    gain, is_super, classe = 0, False, None
-    
+                ledger.add(owner_id, 50, active_skill=0)
+
             # Supprime le message
             try:
                 msg = await channel.fetch_message(message_id)
                 await safe_delete(msg)
             except Exception:
                 pass
-    
+
             # Reset DB
-            if conf:
-                self._reset_spawn_config(guild_id, new_delay=True)
-            elif fake_row:
-                self.cursor.execute("""
+            if is_real:
+                await self._reset_spawn_config(guild_id, new_delay=True)
+            else:
+                await db.execute("""
                     UPDATE reiatsu
-                    SET fake_spawn_id = NULL, fake_spawn_guild_id = NULL, active_skill = 0
+                    SET fake_spawn_id = NULL, fake_spawn_guild_id = NULL,
+                        fake_spawn_channel_id = NULL, fake_spawn_expires_at = NULL,
+                        active_skill = 0
                     WHERE fake_spawn_id = ?
                 """, (message_id,))
-                self.conn.commit()
-    
-            # Libère le verrou
-            del self.locks[lock_key]
-    
-            # Feedback
-            if conf and gain > 0:
-                await self._send_feedback(channel, user, gain, is_super, classe)
-            elif fake_row:
-                owner_id = fake_row["owner_id"]
-                owner = guild.get_member(owner_id) or await guild.fetch_member(owner_id)
-                await safe_send(
-                    channel,
-                    f"🎭 {user.mention} a absorbé un faux Reiatsu ! **{owner.display_name}** gagne **+50 Reiatsu** !"
-                )
+                profile_cache.invalidate(owner_id)
+                await self._release_fake(message_id)
+
+        # Feedback
+        if is_real and gain > 0:
+            await self._send_feedback(channel, user, gain, is_super, classe)
+        elif not is_real:
+            owner = guild.get_member(owner_id) or await guild.fetch_member(owner_id)
+            await safe_send(
+                channel,
+                f"🎭 {user.mention} a absorbé un faux Reiatsu ! **{owner.display_name}** gagne **+50 Reiatsu** !"
+            )
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🔌 Setup du Cog
@@ -0,0 +1,54 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 timer_runner.py — Démarrage des minuteurs persistants (utils.timer_service)
+# Objectif : Recharger la table timers et lancer la tâche de réveil une fois le
+#            bot connecté (les callbacks ont besoin du cache des salons)
+# Catégorie : Général
+# Accès : Interne
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import logging
+
+from discord.ext import commands
+
+from utils.timer_service import timer_service
+
+log = logging.getLogger(__name__)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cog principal
+# ────────────────────────────────────────────────────────────────────────────────
+class TimerRunner(commands.Cog):
+    """
+    Lance timer_service au premier on_ready (les on_ready suivants sont sans effet),
+    ou dès cog_load si le bot est déjà prêt : après un reload des extensions
+    (panneau admin), on_ready ne se redéclenche pas.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    async def cog_load(self):
+        if self.bot.is_ready():
+            await self._start()
+
+    def cog_unload(self):
+        timer_service.stop()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        await self._start()
+
+    async def _start(self):
+        if not await timer_service.start():
+            return
+        stats = timer_service.stats()
+        log.info("[timers] %d minuteur(s) en attente, %d échu(s) hors ligne", stats["pending"], stats["missed"])
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔌 Setup
+# ────────────────────────────────────────────────────────────────────────────────
+async def setup(bot: commands.Bot):
+    await bot.add_cog(TimerRunner(bot))
@@ -0,0 +1,49 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 webhook_cleanup.py — Entretien du pool de webhooks (utils.webhook_pool)
+# Objectif : Brancher le client sur le pool et oublier les webhooks des salons
+#            supprimés ou des serveurs quittés (et, au démarrage, des salons disparus)
+# Catégorie : Général
+# Accès : Interne
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import logging
+
+import discord
+from discord.ext import commands
+
+from utils.webhook_pool import webhook_pool
+
+log = logging.getLogger(__name__)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cog principal
+# ────────────────────────────────────────────────────────────────────────────────
+class WebhookCleanup(commands.Cog):
+    """Garde la table channel_webhooks alignée sur les salons existants."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        webhook_pool.attach(bot)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        removed = await webhook_pool.prune(self.bot)
+        if removed:
+            log.info("[webhook_pool] %d webhook(s) de salons disparus oubliés", removed)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        await webhook_pool.forget(channel.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        await webhook_pool.forget_guild(guild.id)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔌 Setup
+# ────────────────────────────────────────────────────────────────────────────────
+async def setup(bot: commands.Bot):
+    await bot.add_cog(WebhookCleanup(bot))
@@ -1,286 +1,326 @@
-# ────────────────────────────────────────────────────────────────
-# utils/algorithms.py — Tous les algorithmes de tri asynchrones
-# Règle : UNIQUEMENT des swaps data[i], data[j] = data[j], data[i]
-#         Jamais de copie intermédiaire, jamais de insert/pop
-# ────────────────────────────────────────────────────────────────
-
-# ────────────────────────────────────────────────────────────────
-# Tris classiques
-# ────────────────────────────────────────────────────────────────
-async def bubble_sort(data):
-    n = len(data)
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 algorithms.py — Moteur de tri instrumenté (visualisation + benchmark)
+# Objectif : Un seul jeu d'algorithmes qui travaillent via un SortTrace :
+#            chaque comparaison / swap / écriture est comptée et, si demandé,
+#            enregistrée sous forme d'étape compacte (op, i, j) au lieu d'une
+#            copie complète de la liste
+# Catégorie : 🧠 Utils
+# Accès : Interne
+# Règle : les algorithmes ne modifient la liste que via t.swap / t.write
+#         (jamais de copie intermédiaire, jamais de insert/pop)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import time
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧾 Étapes compactes
+# ────────────────────────────────────────────────────────────────────────────────
+COMPARE = 0  # (COMPARE, i, j) : data[i] comparé à data[j]
+SWAP    = 1  # (SWAP, i, j)    : data[i] et data[j] échangés
+WRITE   = 2  # (WRITE, i, v)   : data[i] = v
+
+Step = tuple[int, int, int]
+
+
+class SortTrace:
+    """
+    Liste instrumentée passée aux algorithmes.
+    - compteurs : comparisons, swaps, writes, elapsed (secondes)
+    - steps : étapes compactes ; seules les modifications (swap/write) sont
+      enregistrées par défaut, les comparaisons avec record_compares=True
+    - initial : état de départ, pour rejouer la trace (utils.sort_frames)
+    """
+
+    __slots__ = ("data", "initial", "steps", "record", "record_compares",
+                 "comparisons", "swaps", "writes", "elapsed")
+
+    def __init__(self, data: list[int], record: bool = True, record_compares: bool = False):
+        self.data = list(data)
+        self.initial = tuple(data)
+        self.steps: list[Step] = []
+        self.record = record
+        self.record_compares = record and record_compares
+        self.comparisons = 0
+        self.swaps = 0
+        self.writes = 0
+        self.elapsed = 0.0
+
+    @property
+    def moves(self) -> int:
+        """Nombre de modifications (= images possibles de l'animation)."""
+        return self.swaps + self.writes
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Opérations
+    # ──────────────────────────────────────────────────────────────
+    def gt(self, i: int, j: int) -> bool:
+        """data[i] > data[j] (une comparaison)."""
+        self.comparisons += 1
+        if self.record_compares:
+            self.steps.append((COMPARE, i, j))
+        return self.data[i] > self.data[j]
+
+    def lt(self, i: int, j: int) -> bool:
+        """data[i] < data[j] (une comparaison)."""
+        return self.gt(j, i)
+
+    def swap(self, i: int, j: int):
+        data = self.data
+        data[i], data[j] = data[j], data[i]
+        self.swaps += 1
+        if self.record:
+            self.steps.append((SWAP, i, j))
+
+    def write(self, i: int, value: int):
+        self.data[i] = value
+        self.writes += 1
+        if self.record:
+            self.steps.append((WRITE, i, value))
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔧 Briques partagées
+# ────────────────────────────────────────────────────────────────────────────────
+def _sift_down(t: SortTrace, size: int, i: int):
+    """Fait descendre data[i] dans le tas max de taille `size`."""
+    while True:
+        largest = i
+        l, r = 2 * i + 1, 2 * i + 2
+        if l < size and t.gt(l, largest):
+            largest = l
+        if r < size and t.gt(r, largest):
+            largest = r
+        if largest == i:
+            return
+        t.swap(i, largest)
+        i = largest
+
+
+def _gap_insertion(t: SortTrace, gap: int):
+    """Insertion par swaps successifs entre éléments distants de `gap`."""
+    for i in range(gap, len(t.data)):
+        j = i
+        while j >= gap and t.gt(j - gap, j):
+            t.swap(j, j - gap)
+            j -= gap
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📚 Tris classiques
+# ────────────────────────────────────────────────────────────────────────────────
+def bubble_sort(t: SortTrace):
+    n = len(t.data)
     for i in range(n):
         for j in range(0, n - i - 1):
-            if data[j] > data[j + 1]:
-                data[j], data[j + 1] = data[j + 1], data[j]
-                yield data, [j, j + 1]
+            if t.gt(j, j + 1):
+                t.swap(j, j + 1)
 bubble_sort.desc = "Compare chaque élément avec le suivant et fait remonter les plus grands."
 
 
-async def insertion_sort(data):
-    for i in range(1, len(data)):
-        j = i
-        while j > 0 and data[j - 1] > data[j]:
-            data[j], data[j - 1] = data[j - 1], data[j]
-            yield data, [j, j - 1]
-            j -= 1
+def insertion_sort(t: SortTrace):
+    _gap_insertion(t, 1)
 insertion_sort.desc = "Insère chaque élément dans la partie déjà triée via des swaps successifs."
 
 
-async def selection_sort(data):
-    n = len(data)
+def selection_sort(t: SortTrace):
+    n = len(t.data)
     for i in range(n):
         min_idx = i
         for j in range(i + 1, n):
-            if data[j] < data[min_idx]:
+            if t.lt(j, min_idx):
                 min_idx = j
         if min_idx != i:
-            data[i], data[min_idx] = data[min_idx], data[i]
-            yield data, [i, min_idx]
+            t.swap(i, min_idx)
 selection_sort.desc = "Sélectionne le plus petit élément restant et le place au bon endroit."
 
 
-async def quick_sort(data, low=0, high=None):
-    if high is None:
-        high = len(data) - 1
-    if low < high:
-        pivot = data[high]
+def quick_sort(t: SortTrace):
+    # Pile explicite : une entrée déjà triée ne fait pas exploser la récursion
+    stack = [(0, len(t.data) - 1)]
+    while stack:
+        low, high = stack.pop()
+        if low >= high:
+            continue
+        # Pivot = data[high] : aucun swap ne le touche avant la fin de la partition
         left = low
         for j in range(low, high):
-            if data[j] < pivot:
-                data[left], data[j] = data[j], data[left]
-                yield data, [left, j]
+            if t.lt(j, high):
+                if left != j:
+                    t.swap(left, j)
                 left += 1
-        data[left], data[high] = data[high], data[left]
-        yield data, [left, high]
-        async for step, idx in quick_sort(data, low, left - 1):
-            yield step, idx
-        async for step, idx in quick_sort(data, left + 1, high):
-            yield step, idx
+        if left != high:
+            t.swap(left, high)
+        stack.append((left + 1, high))
+        stack.append((low, left - 1))
 quick_sort.desc = "Choisit un pivot et partitionne récursivement la liste."
 
 
-async def merge_sort(data, start=0, end=None):
+def merge_sort(t: SortTrace, start: int = 0, end: int | None = None):
     if end is None:
-        end = len(data)
-    if end - start > 1:
-        mid = (start + end) // 2
-        async for step, idx in merge_sort(data, start, mid):
-            yield step, idx
-        async for step, idx in merge_sort(data, mid, end):
-            yield step, idx
-        # Fusion en place par rotations de swaps
-        i, j = start, mid
-        while i < j and j < end:
-            if data[i] <= data[j]:
-                i += 1
-            else:
-                # Rotation : amène data[j] en position i par swaps successifs
-                k = j
-                while k > i:
-                    data[k], data[k - 1] = data[k - 1], data[k]
-                    yield data, [k, k - 1]
-                    k -= 1
-                i += 1
-                j += 1
+        end = len(t.data)
+    if end - start <= 1:
+        return
+    mid = (start + end) // 2
+    merge_sort(t, start, mid)
+    merge_sort(t, mid, end)
+    # Fusion en place par rotations de swaps
+    i, j = start, mid
+    while i < j < end:
+        if not t.gt(i, j):
+            i += 1
+        else:
+            # Rotation : amène data[j] en position i par swaps successifs
+            for k in range(j, i, -1):
+                t.swap(k, k - 1)
+            i += 1
+            j += 1
 merge_sort.desc = "Divise et fusionne récursivement les sous-listes pour trier (fusion par swaps)."
 
 
-async def heap_sort(data):
-    n = len(data)
-
-    async def heapify(size, i):
-        while True:
-            largest = i
-            l, r = 2 * i + 1, 2 * i + 2
-            if l < size and data[l] > data[largest]:
-                largest = l
-            if r < size and data[r] > data[largest]:
-                largest = r
-            if largest == i:
-                break
-            data[i], data[largest] = data[largest], data[i]
-            yield data, [i, largest]
-            i = largest
-
+def heap_sort(t: SortTrace):
+    n = len(t.data)
     # Construction du tas
     for i in range(n // 2 - 1, -1, -1):
-        async for step, idx in heapify(n, i):
-            yield step, idx
-
+        _sift_down(t, n, i)
     # Extraction
     for i in range(n - 1, 0, -1):
-        data[i], data[0] = data[0], data[i]
-        yield data, [0, i]
-        async for step, idx in heapify(i, 0):
-            yield step, idx
-heap_sort.desc = "Tri utilisant un tas binaire (heapify entièrement async)."
+        t.swap(0, i)
+        _sift_down(t, i, 0)
+heap_sort.desc = "Tri utilisant un tas binaire."
 
 
-async def shell_sort(data):
-    n = len(data)
-    gap = n // 2
+def shell_sort(t: SortTrace):
+    gap = len(t.data) // 2
     while gap > 0:
-        for i in range(gap, n):
-            j = i
-            while j >= gap and data[j - gap] > data[j]:
-                data[j], data[j - gap] = data[j - gap], data[j]
-                yield data, [j, j - gap]
-                j -= gap
+        _gap_insertion(t, gap)
         gap //= 2
 shell_sort.desc = "Améliore Insertion Sort avec des gaps décroissants."
 
 
-async def cocktail_sort(data):
-    n = len(data)
-    start, end = 0, n - 1
+def cocktail_sort(t: SortTrace):
+    start, end = 0, len(t.data) - 1
     while True:
         swapped = False
         for i in range(start, end):
-            if data[i] > data[i + 1]:
-                data[i], data[i + 1] = data[i + 1], data[i]
+            if t.gt(i, i + 1):
+                t.swap(i, i + 1)
                 swapped = True
-                yield data, [i, i + 1]
         if not swapped:
             break
         swapped = False
         end -= 1
         for i in range(end - 1, start - 1, -1):
-            if data[i] > data[i + 1]:
-                data[i], data[i + 1] = data[i + 1], data[i]
+            if t.gt(i, i + 1):
+                t.swap(i, i + 1)
                 swapped = True
-                yield data, [i, i + 1]
         if not swapped:
             break
         start += 1
 cocktail_sort.desc = "Version bidirectionnelle de Bubble Sort."
 
 
-async def comb_sort(data):
-    n = len(data)
+def comb_sort(t: SortTrace):
+    n = len(t.data)
     gap = n
-    shrink = 1.3
     sorted_ = False
     while not sorted_:
-        gap = int(gap / shrink)
+        gap = int(gap / 1.3)
         if gap <= 1:
             gap = 1
             sorted_ = True
         for i in range(n - gap):
-            if data[i] > data[i + gap]:
-                data[i], data[i + gap] = data[i + gap], data[i]
+            if t.gt(i, i + gap):
+                t.swap(i, i + gap)
                 sorted_ = False
-                yield data, [i, i + gap]
 comb_sort.desc = "Amélioration de Bubble Sort avec un gap variable."
 
 
-# ────────────────────────────────────────────────────────────────
-# Expérimentaux — réécrits en swaps purs
-# ────────────────────────────────────────────────────────────────
-async def pair_sum_sort(data):
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧪 Expérimentaux
+# ────────────────────────────────────────────────────────────────────────────────
+def pair_sum_sort(t: SortTrace):
     """
     Odd-Even / Brick Sort : passe alternativement sur les paires (0,1),(2,3)...
     puis (1,2),(3,4)... et swap si nécessaire. Converge vers un tri complet.
-    Remplace l'ancienne version qui utilisait des copies intermédiaires.
     """
-    n = len(data)
+    n = len(t.data)
     changed = True
     while changed:
         changed = False
-        # Paires paires : (0,1), (2,3), ...
-        for i in range(0, n - 1, 2):
-            if data[i] > data[i + 1]:
-                data[i], data[i + 1] = data[i + 1], data[i]
-                changed = True
-                yield data, [i, i + 1]
-        # Paires impaires : (1,2), (3,4), ...
-        for i in range(1, n - 1, 2):
-            if data[i] > data[i + 1]:
-                data[i], data[i + 1] = data[i + 1], data[i]
-                changed = True
-                yield data, [i, i + 1]
+        for offset in (0, 1):
+            for i in range(offset, n - 1, 2):
+                if t.gt(i, i + 1):
+                    t.swap(i, i + 1)
+                    changed = True
 pair_sum_sort.desc = "Odd-Even Sort : alterne les paires paires et impaires jusqu'au tri complet."
 
 
-async def pair_shift_sort(data):
+def pair_shift_sort(t: SortTrace):
     """
     Gnome Sort : si l'élément courant est mal placé, le swap vers la gauche
     jusqu'à sa bonne position, puis repart en avant.
-    Remplace l'ancienne version avec insert/pop.
     """
-    n = len(data)
+    n = len(t.data)
     i = 1
     while i < n:
-        if i == 0 or data[i] >= data[i - 1]:
+        if i == 0 or not t.gt(i - 1, i):
             i += 1
         else:
-            data[i], data[i - 1] = data[i - 1], data[i]
-            yield data, [i, i - 1]
+            t.swap(i, i - 1)
             i -= 1
 pair_shift_sort.desc = "Gnome Sort : swap l'élément vers la gauche jusqu'à sa bonne position."
 
 
-async def centrifugal_sort(data):
+def centrifugal_sort(t: SortTrace):
     """
     Tri par triplets via swaps directs (min au début, max à la fin du triplet).
-    Chaque triplet est trié avec au plus 3 swaps comparatifs.
+    Chaque triplet est trié avec au plus 3 swaps comparatifs ; le dernier
+    triplet peut être tronqué à une paire pour que toutes les paires voisines
+    soient comparées (sinon la paire finale reste en place si n % 3 == 2).
     """
-    n = len(data)
+    n = len(t.data)
     changed = True
     while changed:
         changed = False
         for offset in (0, 1):
-            for i in range(offset, n - 2, 3):
-                a, b, c = i, i + 1, i + 2
+            for a in range(offset, n - 1, 3):
                 # Tri réseau à 3 éléments : 3 comparaisons max, swaps directs
-                if data[a] > data[b]:
-                    data[a], data[b] = data[b], data[a]
-                    changed = True
-                    yield data, [a, b]
-                if data[b] > data[c]:
-                    data[b], data[c] = data[c], data[b]
-                    changed = True
-                    yield data, [b, c]
-                if data[a] > data[b]:
-                    data[a], data[b] = data[b], data[a]
-                    changed = True
-                    yield data, [a, b]
+                for x, y in ((a, a + 1), (a + 1, a + 2), (a, a + 1)):
+                    if y < n and t.gt(x, y):
+                        t.swap(x, y)
+                        changed = True
 centrifugal_sort.desc = "Tri par triplets avec swaps directs (réseau de tri à 3 éléments)."
 
 
-async def flashy_sort(data):
-    """Heap Sort avec heapify async imbriquée — visuellement spectaculaire."""
-    n = len(data)
-
-    async def heapify(size, i):
-        while True:
-            largest = i
-            l, r = 2 * i + 1, 2 * i + 2
-            if l < size and data[l] > data[largest]:
-                largest = l
-            if r < size and data[r] > data[largest]:
-                largest = r
-            if largest == i:
-                break
-            data[i], data[largest] = data[largest], data[i]
-            yield data, [i, largest]
-            i = largest
+def flashy_sort(t: SortTrace):
+    """Heap Sort sous son ancien nom : garde stable la numérotation du menu /sorting."""
+    heap_sort(t)
+flashy_sort.desc = "Heap Sort avec heapify imbriquée — visuellement spectaculaire."
 
-    for i in range(n // 2 - 1, -1, -1):
-        async for step, highlight in heapify(n, i):
-            yield step, highlight
-
-    for i in range(n - 1, 0, -1):
-        data[i], data[0] = data[0], data[i]
-        yield data, [0, i]
-        async for step, highlight in heapify(i, 0):
-            yield step, highlight
-flashy_sort.desc = "Heap Sort visuellement spectaculaire avec heapify entièrement async."
 
-
-# ────────────────────────────────────────────────────────────────
-# Dictionnaire global pour import
-# ────────────────────────────────────────────────────────────────
+# ────────────────────────────────────────────────────────────────────────────────
+# ▶️ Exécution
+# ────────────────────────────────────────────────────────────────────────────────
+def run_sort(algo, data: list[int], record: bool = True, record_compares: bool = False) -> SortTrace:
+    """
+    Trie une copie de `data` avec `algo` (fonction ou nom du dictionnaire
+    `algorithms`) et renvoie la trace : liste triée, compteurs, durée, étapes.
+    """
+    if isinstance(algo, str):
+        algo = algorithms[algo]
+    t = SortTrace(data, record=record, record_compares=record_compares)
+    start = time.perf_counter()
+    algo(t)
+    t.elapsed = time.perf_counter() - start
+    return t
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📖 Dictionnaire global pour import
+# ────────────────────────────────────────────────────────────────────────────────
 algorithms = {
     "Bubble Sort":      bubble_sort,
     "Cocktail Sort":    cocktail_sort,
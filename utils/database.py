@@ -0,0 +1,202 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 database.py — Accès SQLite asynchrone partagé
+# Objectif : Servir tous les cogs via un petit pool (1 écrivain + N lecteurs WAL)
+#            et exécuter les requêtes hors de la boucle asyncio
+# Catégorie : 🧠 Utils
+# Accès : Interne
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from utils.init_db import REIATSU_DB_PATH
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres du pool
+# ────────────────────────────────────────────────────────────────────────────────
+READER_COUNT = 3
+BUSY_TIMEOUT = 30  # secondes d'attente max sur un verrou SQLite
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    """Ouvre une connexion configurée pour le pool (WAL, Row, autocommit)."""
+    conn = sqlite3.connect(
+        path,
+        timeout=BUSY_TIMEOUT,
+        check_same_thread=False,
+        isolation_level=None  # transactions gérées explicitement (BEGIN/COMMIT)
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔒 Transaction sur la connexion écrivain
+# ────────────────────────────────────────────────────────────────────────────────
+class Transaction:
+    """
+    Transaction ouverte sur la connexion écrivain.
+    Toutes les requêtes passent par le thread écrivain et voient les
+    écritures non encore validées de la transaction.
+    """
+
+    def __init__(self, pool: "DatabasePool"):
+        self._pool = pool
+
+    async def execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        return await self._pool._run_writer(lambda c: c.execute(sql, params))
+
+    async def executemany(self, sql: str, seq_params) -> sqlite3.Cursor:
+        seq_params = list(seq_params)
+        return await self._pool._run_writer(lambda c: c.executemany(sql, seq_params))
+
+    async def fetchone(self, sql: str, params: tuple = ()) -> sqlite3.Row | None:
+        return await self._pool._run_writer(lambda c: c.execute(sql, params).fetchone())
+
+    async def fetchall(self, sql: str, params: tuple = ()) -> list[sqlite3.Row]:
+        return await self._pool._run_writer(lambda c: c.execute(sql, params).fetchall())
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗄️ Pool de connexions
+# ────────────────────────────────────────────────────────────────────────────────
+class DatabasePool:
+    """
+    Pool SQLite partagé par tous les cogs.
+    - 1 connexion écrivain, servie par un thread dédié (écritures sérialisées)
+    - N connexions lecteurs en WAL, lues en parallèle de l'écrivain
+    Les connexions sont ouvertes paresseusement au premier appel.
+    """
+
+    def __init__(self, path: str = REIATSU_DB_PATH, readers: int = READER_COUNT):
+        self.path = path
+        self.reader_count = readers
+        self._writer: sqlite3.Connection | None = None
+        self._readers: queue.Queue[sqlite3.Connection] = queue.Queue()
+        self._writer_executor: ThreadPoolExecutor | None = None
+        self._reader_executor: ThreadPoolExecutor | None = None
+        self._write_lock = asyncio.Lock()
+        self._open_lock = threading.Lock()
+
+    # ──────────────────────────────────────────────────────────────
+    def _ensure_open(self):
+        if self._writer is not None:
+            return
+        with self._open_lock:
+            if self._writer is not None:
+                return
+            self._writer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+            self._reader_executor = ThreadPoolExecutor(max_workers=self.reader_count, thread_name_prefix="db-reader")
+            for _ in range(self.reader_count):
+                self._readers.put(_connect(self.path))
+            self._writer = _connect(self.path)
+
+    async def _run_writer(self, func):
+        self._ensure_open()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer_executor, func, self._writer)
+
+    async def _run_reader(self, func):
+        self._ensure_open()
+
+        def _job():
+            conn = self._readers.get()
+            try:
+                return func(conn)
+            finally:
+                self._readers.put(conn)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._reader_executor, _job)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Lectures (connexions lecteurs)
+    # ──────────────────────────────────────────────────────────────
+    async def fetchone(self, sql: str, params: tuple = ()) -> sqlite3.Row | None:
+        return await self._run_reader(lambda c: c.execute(sql, params).fetchone())
+
+    async def fetchall(self, sql: str, params: tuple = ()) -> list[sqlite3.Row]:
+        return await self._run_reader(lambda c: c.execute(sql, params).fetchall())
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Écritures (connexion écrivain)
+    # ──────────────────────────────────────────────────────────────
+    async def execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        """Exécute une requête d'écriture isolée (validée immédiatement)."""
+        async with self._write_lock:
+            return await self._run_writer(lambda c: c.execute(sql, params))
+
+    async def executemany(self, sql: str, seq_params) -> sqlite3.Cursor:
+        seq_params = list(seq_params)
+        async with self.transaction() as tx:
+            return await tx.executemany(sql, seq_params)
+
+    async def query(self, sql: str, params: tuple = (), write: bool = False) -> tuple[list[str], list[tuple], int]:
+        """
+        Requête quelconque (console SQL, navigateur de tables du panneau admin) :
+        (colonnes, lignes, rowcount). `write=True` passe par l'écrivain.
+        """
+        def _job(c):
+            cur = c.execute(sql, params)
+            columns = [d[0] for d in cur.description] if cur.description else []
+            rows = [tuple(row) for row in cur.fetchall()] if columns else []
+            return columns, rows, cur.rowcount
+
+        if not write:
+            return await self._run_reader(_job)
+        async with self._write_lock:
+            return await self._run_writer(_job)
+
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Ouvre une transaction IMMEDIATE sur l'écrivain.
+        COMMIT en sortie normale, ROLLBACK si une exception remonte.
+
+            async with db.transaction() as tx:
+                row = await tx.fetchone(...)
+                await tx.execute(...)
+        """
+        async with self._write_lock:
+            await self._run_writer(lambda c: c.execute("BEGIN IMMEDIATE"))
+            try:
+                yield Transaction(self)
+            except BaseException:
+                await self._run_writer(lambda c: c.rollback())
+                raise
+            else:
+                await self._run_writer(lambda c: c.commit())
+
+    # ──────────────────────────────────────────────────────────────
+    def close(self):
+        """Ferme toutes les connexions et les threads du pool."""
+        with self._open_lock:
+            if self._writer is None:
+                return
+            self._writer_executor.shutdown(wait=True)
+            self._reader_executor.shutdown(wait=True)
+            self._writer.close()
+            while not self._readers.empty():
+                self._readers.get_nowait().close()
+            self._writer = None
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🌐 Instance partagée + raccourcis
+# ────────────────────────────────────────────────────────────────────────────────
+db = DatabasePool()
+
+fetchone = db.fetchone
+fetchall = db.fetchall
+execute = db.execute
+executemany = db.executemany
+transaction = db.transaction
@@ -1,59 +1,417 @@
 # ────────────────────────────────────────────────────────────────────────────────
 # 📌 discord_utils.py — Fonctions utilitaires sécurisées pour Discord
 # Objectif : Fournir des fonctions send/edit/respond optimisées avec gestion du rate-limit
-# Version : ✅ Optimisée et robuste, backoff exponentiel, logs clairs
+# Version : ✅ File sortante partagée (token buckets par route et par salon),
+#           voies prioritaires, fusion des éditions successives, métriques
 # ────────────────────────────────────────────────────────────────────────────────
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📦 Imports nécessaires
 # ────────────────────────────────────────────────────────────────────────────────
 import asyncio
+import time
+from collections import deque
+
 import discord
 from discord.errors import HTTPException
 
 # ────────────────────────────────────────────────────────────────────────────────
-# 🛡️ Gestion centralisée des appels Discord avec backoff 429
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+PRIORITY_INTERACTION = 0  # réponses d'interaction : exécutées tout de suite (délai de 3 s)
+PRIORITY_MESSAGE     = 1  # envois, réponses, suppressions
+PRIORITY_COSMETIC    = 2  # éditions, réactions
+
+GLOBAL_LIMIT  = (50, 1.0)  # (jetons, secondes) : limite globale du bot
+CHANNEL_LIMIT = (5, 5.0)   # par (route, salon) si la route n'a pas de limite propre
+ROUTE_LIMITS  = {          # seaux Discord par (route, salon)
+    "send":            (5, 5.0),
+    "edit":            (5, 5.0),
+    "delete":          (5, 1.0),
+    "add_reaction":    (4, 1.0),  # ~1 réaction / 250 ms
+    "clear_reactions": (4, 1.0),
+    "webhook":         (5, 2.0),  # exécution d'un webhook (utils.webhook_pool)
+}
+
+MAX_RETRIES        = 3     # nouvelles tentatives après un 429
+DEFAULT_RETRY      = 5.0   # pause si Discord n'indique pas Retry-After
+LATENCY_WINDOW     = 500   # dernières latences gardées pour les métriques
+MAX_IDLE_BUCKETS   = 1000  # au-delà, les seaux pleins sont oubliés
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🪣 Token bucket
+# ────────────────────────────────────────────────────────────────────────────────
+class TokenBucket:
+    """Seau à jetons : `capacity` requêtes, rechargé en continu sur `per` secondes."""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated", "blocked_until")
+
+    def __init__(self, capacity: int, per: float):
+        self.capacity = capacity
+        self.rate = capacity / per
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0  # posé après un 429 (Retry-After)
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Secondes avant qu'un jeton soit disponible (0 = tout de suite)."""
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
+
+    def block(self, seconds: float, now: float):
+        """Bloque le seau pour tous les appelants (état appris d'un 429)."""
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 0.0
+
+    def idle(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity and now >= self.blocked_until
+
+
 # ────────────────────────────────────────────────────────────────────────────────
-async def _discord_action(action_func, *args, retry=3, delay=0.3, **kwargs):
+# 📤 File sortante
+# ────────────────────────────────────────────────────────────────────────────────
+class _Request:
+    __slots__ = ("func", "args", "kwargs", "route", "channel_id", "priority",
+                 "coalesce_key", "future", "enqueued_at", "attempt")
+
+    def __init__(self, func, args, kwargs, route, channel_id, priority, coalesce_key, future):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.route = route
+        self.channel_id = channel_id
+        self.priority = priority
+        self.coalesce_key = coalesce_key
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        self.attempt = 0
+
+
+class OutboundQueue:
     """
-    Exécute une action Discord sécurisée avec gestion du rate-limit et des exceptions.
-    - action_func : fonction Discord à appeler (send, edit, reply, etc.)
-    - retry : nombre de tentatives en cas de 429
-    - delay : délai entre chaque tentative (anti-429)
+    Ordonnanceur des appels API Discord du bot.
+    - un seul état de rate-limit partagé : seau global + un seau par (route, salon),
+      comme les buckets Discord ; un 429 bloque le seau concerné pour tous les appelants
+    - voies par priorité : les réponses d'interaction ne passent jamais par la file,
+      les envois passent avant les éditions et réactions
+    - une requête à la fois par salon : l'ordre des messages est conservé
+    - fusion : une édition d'un message déjà en attente d'édition remplace les champs
+      de la précédente ; un seul appel part, tous les appelants reçoivent son résultat
     """
-    for attempt in range(1, retry + 2):
+
+    def __init__(self):
+        self._lanes: dict[int, deque[_Request]] = {
+            PRIORITY_MESSAGE:  deque(),
+            PRIORITY_COSMETIC: deque(),
+        }
+        self._pending: dict[tuple, _Request] = {}  # {clé de fusion: requête en file}
+        self._inflight: set[int] = set()            # salons avec une requête en cours
+        self._global = TokenBucket(*GLOBAL_LIMIT)
+        self._routes: dict[tuple, TokenBucket] = {}  # {(route, salon): seau}
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+
+        # Métriques
+        self.submitted    = 0
+        self.coalesced    = 0
+        self.completed    = 0
+        self.failed       = 0
+        self.rate_limited = 0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Soumission
+    # ──────────────────────────────────────────────────────────────
+    async def submit(self, func, *args, route: str, channel_id: int | None = None,
+                     priority: int = PRIORITY_MESSAGE, coalesce_key: tuple | None = None, **kwargs):
+        """Planifie `func(*args, **kwargs)` et renvoie son résultat (None si échec)."""
+        self.submitted += 1
+
+        if priority == PRIORITY_INTERACTION:
+            return await self._run_inline(func, args, kwargs, route)
+
+        self._ensure_running()
+
+        if coalesce_key is not None and (req := self._pending.get(coalesce_key)) is not None:
+            # Édition pas encore partie : on y fusionne les nouveaux champs
+            req.func = func
+            req.args = args
+            req.kwargs.update(kwargs)
+            self.coalesced += 1
+            return await asyncio.shield(req.future)
+
+        req = _Request(func, args, kwargs, route, channel_id, priority, coalesce_key,
+                       self._loop.create_future())
+        if coalesce_key is not None:
+            self._pending[coalesce_key] = req
+        self._lanes[priority].append(req)
+        self._wakeup.set()
+        return await asyncio.shield(req.future)
+
+    def _ensure_running(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            if self._loop is not loop:
+                # Nouvelle boucle (redémarrage, scripts) : les requêtes d'avant sont perdues
+                for lane in self._lanes.values():
+                    lane.clear()
+                self._pending.clear()
+                self._inflight.clear()
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Répartition
+    # ──────────────────────────────────────────────────────────────
+    async def _run(self):
+        while True:
+            timeout = self._dispatch_ready()
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _dispatch_ready(self) -> float | None:
+        """Lance toutes les requêtes prêtes ; renvoie l'attente avant la suivante."""
+        now = time.monotonic()
+        busy = set(self._inflight)
+        next_wait = None
+
+        for priority in sorted(self._lanes):
+            lane = self._lanes[priority]
+            kept = deque()
+            while lane:
+                req = lane.popleft()
+                if req.channel_id is not None and req.channel_id in busy:
+                    kept.append(req)
+                    continue
+
+                buckets = self._buckets(req.route, req.channel_id)
+                wait = max(bucket.wait_time(now) for bucket in buckets)
+                if wait > 0:
+                    kept.append(req)
+                    if req.channel_id is not None:
+                        busy.add(req.channel_id)  # garde l'ordre dans le salon
+                    next_wait = wait if next_wait is None else min(next_wait, wait)
+                    continue
+
+                for bucket in buckets:
+                    bucket.take(now)
+                if req.coalesce_key is not None and self._pending.get(req.coalesce_key) is req:
+                    del self._pending[req.coalesce_key]
+                if req.channel_id is not None:
+                    self._inflight.add(req.channel_id)
+                    busy.add(req.channel_id)
+                self._loop.create_task(self._execute(req))
+            self._lanes[priority] = kept
+
+        if len(self._routes) > MAX_IDLE_BUCKETS:
+            for key in [k for k, b in self._routes.items() if b.idle(now)]:
+                del self._routes[key]
+        return next_wait
+
+    def _buckets(self, route: str, channel_id: int | None) -> list[TokenBucket]:
+        """Seaux à consommer pour une requête (global + route du salon)."""
+        if channel_id is None:
+            # Salon inconnu (DM pas encore ouvert) : seulement la limite globale
+            # et un éventuel 429 déjà appris sur la route
+            learned = self._routes.get((route, None))
+            return [self._global] if learned is None else [self._global, learned]
+        return [self._global, self._route_bucket(route, channel_id)]
+
+    def _route_bucket(self, route: str, channel_id: int | None) -> TokenBucket:
+        bucket = self._routes.get((route, channel_id))
+        if bucket is None:
+            bucket = self._routes[(route, channel_id)] = TokenBucket(*ROUTE_LIMITS.get(route, CHANNEL_LIMIT))
+        return bucket
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Exécution
+    # ──────────────────────────────────────────────────────────────
+    async def _execute(self, req: _Request):
+        name = getattr(req.func, "__name__", req.route)
         try:
-            result = await action_func(*args, **kwargs)
-            if delay > 0:
-                await asyncio.sleep(delay)
-            return result
+            result = await req.func(*req.args, **req.kwargs)
         except HTTPException as e:
             if e.status == 429:
-                wait_time = 10 * attempt  # backoff exponentiel
-                print(f"[RateLimit] {action_func.__name__} → 429 Too Many Requests. Pause {wait_time}s...")
-                await asyncio.sleep(wait_time)
+                self._on_rate_limit(name, e, req.route, req.channel_id, req.attempt + 1)
+                if req.attempt < MAX_RETRIES:
+                    req.attempt += 1
+                    self._lanes[req.priority].appendleft(req)  # repasse en tête de sa voie
+                    return
+                print(f"[Erreur] {name} → Échec après {MAX_RETRIES + 1} tentatives")
+                self._finish(req, failed=True)
             else:
-                raise e
+                self._finish(req, exc=e)
         except Exception as e:
-            print(f"[Erreur] {action_func.__name__} → {e}")
-            return None
-    print(f"[Erreur] {action_func.__name__} → Échec après {retry+1} tentatives")
-    return None
+            print(f"[Erreur] {name} → {e}")
+            self._finish(req, failed=True)
+        else:
+            self._finish(req, result=result)
+        finally:
+            self._inflight.discard(req.channel_id)
+            self._wakeup.set()
+
+    def _finish(self, req: _Request, result=None, exc: BaseException | None = None, failed: bool = False):
+        """
+        Résout la requête. Le succès ne dépend pas du résultat : webhook.send()
+        sans wait=True renvoie None. Les échecs absorbés résolvent aussi à None.
+        """
+        self._latencies.append(time.monotonic() - req.enqueued_at)
+        if exc is not None or failed:
+            self.failed += 1
+        else:
+            self.completed += 1
+        if req.future.done():
+            return
+        if exc is not None:
+            req.future.set_exception(exc)
+        else:
+            req.future.set_result(result)
+
+    async def _run_inline(self, func, args, kwargs, route: str):
+        """Voie prioritaire : appel direct, mais même état de rate-limit que la file."""
+        name = getattr(func, "__name__", route)
+        start = time.monotonic()
+        for attempt in range(1, MAX_RETRIES + 2):
+            # Jamais retardée par la file : seul un 429 déjà appris fait attendre
+            now = time.monotonic()
+            self._global.take(now)
+            learned = self._routes.get((route, None))
+            if learned is not None and (wait := learned.wait_time(now)) > 0:
+                await asyncio.sleep(wait)
+            try:
+                result = await func(*args, **kwargs)
+                self.completed += 1
+                self._latencies.append(time.monotonic() - start)
+                return result
+            except HTTPException as e:
+                if e.status != 429:
+                    self.failed += 1
+                    raise
+                self._on_rate_limit(name, e, route, None, attempt)
+            except Exception as e:
+                print(f"[Erreur] {name} → {e}")
+                self.failed += 1
+                return None
+        print(f"[Erreur] {name} → Échec après {MAX_RETRIES + 1} tentatives")
+        self.failed += 1
+        return None
+
+    def _on_rate_limit(self, name: str, e: HTTPException, route: str, channel_id: int | None, attempt: int):
+        """Partage le Retry-After appris : bloque le seau (route, salon) pour tous."""
+        self.rate_limited += 1
+        retry_after = _retry_after(e, attempt)
+        print(f"[RateLimit] {name} → 429 Too Many Requests. Pause {retry_after:.1f}s...")
+        self._route_bucket(route, channel_id).block(retry_after, time.monotonic())
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Métriques
+    # ──────────────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        """Profondeur de file et latences (file + appel API), pour le panneau admin."""
+        latencies = sorted(self._latencies)
+        n = len(latencies)
+        return {
+            "queued":       {"message": len(self._lanes[PRIORITY_MESSAGE]),
+                             "cosmetic": len(self._lanes[PRIORITY_COSMETIC])},
+            "inflight":     len(self._inflight),
+            "submitted":    self.submitted,
+            "coalesced":    self.coalesced,
+            "completed":    self.completed,
+            "failed":       self.failed,
+            "rate_limited": self.rate_limited,
+            "latency_avg_ms": round(sum(latencies) / n * 1000, 1) if n else 0.0,
+            "latency_p95_ms": round(latencies[min(n - 1, int(n * 0.95))] * 1000, 1) if n else 0.0,
+            "latency_max_ms": round(latencies[-1] * 1000, 1) if n else 0.0,
+        }
+
+
+def _retry_after(e: HTTPException, attempt: int) -> float:
+    response = getattr(e, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY * attempt
+
+
+def _channel_id(target) -> int | None:
+    """Salon visé : Message / Context → leur salon ; utilisateur (DM pas encore ouvert) → None."""
+    channel = getattr(target, "channel", target)
+    if isinstance(channel, discord.abc.User):
+        return None
+    return getattr(channel, "id", None)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🌐 Instance partagée
+# ────────────────────────────────────────────────────────────────────────────────
+outbound = OutboundQueue()
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🛡️ Gestion centralisée des appels Discord avec backoff 429
+# ────────────────────────────────────────────────────────────────────────────────
+async def _discord_action(action_func, *args, route: str | None = None, channel_id: int | None = None,
+                          priority: int = PRIORITY_MESSAGE, coalesce_key: tuple | None = None, **kwargs):
+    """
+    Exécute une action Discord sécurisée via la file sortante partagée.
+    - action_func : fonction Discord à appeler (send, edit, reply, etc.)
+    - route : seau de rate-limit (par défaut le nom de la fonction)
+    - channel_id : salon visé (seau + ordre par salon)
+    - priority : voie (PRIORITY_INTERACTION / MESSAGE / COSMETIC)
+    - coalesce_key : éditions successives fusionnées tant qu'elles sont en file
+    """
+    return await outbound.submit(
+        action_func, *args,
+        route=route or getattr(action_func, "__name__", "action"),
+        channel_id=channel_id,
+        priority=priority,
+        coalesce_key=coalesce_key,
+        **kwargs
+    )
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📩 Fonctions publiques sécurisées
 # ────────────────────────────────────────────────────────────────────────────────
 async def safe_send(channel: discord.abc.Messageable, content=None, **kwargs):
-    return await _discord_action(channel.send, content=content, **kwargs)
+    return await _discord_action(channel.send, content=content, route="send",
+                                 channel_id=_channel_id(channel), **kwargs)
 
 async def safe_edit(message: discord.Message, content=None, **kwargs):
-    return await _discord_action(message.edit, content=content, **kwargs)
+    # Éditions successives encore en file fusionnées (les derniers champs gagnent)
+    return await _discord_action(message.edit, content=content, route="edit", channel_id=_channel_id(message),
+                                 priority=PRIORITY_COSMETIC, coalesce_key=("edit", message.id), **kwargs)
+
+async def safe_webhook_send(webhook: discord.Webhook, content=None, channel_id: int | None = None, **kwargs):
+    return await _discord_action(webhook.send, content=content, route="webhook", channel_id=channel_id, **kwargs)
 
 async def safe_respond(interaction: discord.Interaction, content=None, **kwargs):
-    return await _discord_action(interaction.response.send_message, content=content, **kwargs)
+    return await _discord_action(interaction.response.send_message, content=content,
+                                 route="interaction", priority=PRIORITY_INTERACTION, **kwargs)
 
 async def safe_followup(interaction: discord.Interaction, content=None, **kwargs):
-    return await _discord_action(interaction.followup.send, content=content, **kwargs)
+    return await _discord_action(interaction.followup.send, content=content,
+                                 route="interaction", priority=PRIORITY_INTERACTION, **kwargs)
 
 async def safe_interact(interaction: discord.Interaction, content=None, edit=False, **kwargs):
     """
@@ -65,33 +423,42 @@ async def safe_interact(interaction: discord.Interaction, content=None, edit=Fal
         if edit:
             if not interaction.response.is_done():
                 # Édition directe avant réponse
-                return await _discord_action(interaction.response.edit_message, content=content, **kwargs)
+                action = interaction.response.edit_message
             else:
                 # Édition après réponse initiale
-                return await _discord_action(interaction.edit_original_response, content=content, **kwargs)
+                action = interaction.edit_original_response
         else:
             if not interaction.response.is_done():
-                return await _discord_action(interaction.response.send_message, content=content, **kwargs)
+                action = interaction.response.send_message
             else:
-                return await _discord_action(interaction.followup.send, content=content, **kwargs)
+                action = interaction.followup.send
+        return await _discord_action(action, content=content, route="interaction",
+                                     priority=PRIORITY_INTERACTION, **kwargs)
     except Exception as e:
         print(f"[Erreur] safe_interact → {e}")
         return None
 
 async def safe_reply(ctx_or_message, content=None, **kwargs):
-    return await _discord_action(ctx_or_message.reply, content=content, **kwargs)
+    return await _discord_action(ctx_or_message.reply, content=content, route="send",
+                                 channel_id=_channel_id(ctx_or_message), **kwargs)
 
-async def safe_add_reaction(message: discord.Message, emoji: str, delay: float = 0.3):
-    return await _discord_action(message.add_reaction, emoji, delay=delay)
+async def safe_add_reaction(message: discord.Message, emoji: str, delay: float = 0):
+    # delay : conservé pour compatibilité, le rythme est donné par le seau "add_reaction"
+    result = await _discord_action(message.add_reaction, emoji, route="add_reaction",
+                                   channel_id=_channel_id(message), priority=PRIORITY_COSMETIC)
+    if delay > 0:
+        await asyncio.sleep(delay)
+    return result
 
 async def safe_delete(message: discord.Message, delay: float = 0):
-    result = await _discord_action(message.delete)
+    result = await _discord_action(message.delete, route="delete", channel_id=_channel_id(message))
     if delay > 0:
         await asyncio.sleep(delay)
     return result
 
-async def safe_clear_reactions(message: discord.Message, delay: float = 0.3):
-    result = await _discord_action(message.clear_reactions)
+async def safe_clear_reactions(message: discord.Message, delay: float = 0):
+    result = await _discord_action(message.clear_reactions, route="clear_reactions",
+                                   channel_id=_channel_id(message), priority=PRIORITY_COSMETIC)
     if delay > 0:
         await asyncio.sleep(delay)
     return result
@@ -0,0 +1,108 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 fake_spawns.py — Suivi en mémoire des faux Reiatsu (skill Illusionniste)
+# Objectif : Savoir sans requête SQL quels Illusionnistes attendent un faux spawn
+#            et quels faux spawns sont en ligne (avec leur échéance persistée)
+# Catégorie : 🧠 Utils
+# Accès : Interne
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+from utils.database import db
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+FAKE_SPAWN_TTL = 180  # secondes avant disparition d'un faux Reiatsu
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🎭 Tracker
+# ────────────────────────────────────────────────────────────────────────────────
+class FakeSpawnTracker:
+    """
+    État des faux Reiatsu, reconstruit depuis `reiatsu` au démarrage du spawner.
+    - waiting : Illusionnistes au skill actif sans faux spawn en ligne
+                ({owner_id: guild_id où le skill a été lancé, None si inconnu})
+    - live    : faux spawns affichés ({message_id: infos + expires_at})
+    La base reste la source de vérité (colonnes fake_spawn_*), ce tracker évite
+    seulement de l'interroger à chaque tour de boucle.
+    """
+
+    def __init__(self):
+        self.waiting: dict[int, int | None] = {}
+        self.live: dict[int, dict] = {}
+        self._by_owner: dict[int, int] = {}  # {owner_id: message_id}
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Chargement
+    # ──────────────────────────────────────────────────────────────
+    async def load(self):
+        """Relit les Illusionnistes au skill actif (index partiel idx_reiatsu_active_skill)."""
+        rows = await db.fetchall("""
+            SELECT user_id, fake_spawn_id, fake_spawn_guild_id,
+                   fake_spawn_channel_id, fake_spawn_expires_at
+            FROM reiatsu
+            WHERE classe = 'Illusionniste' AND active_skill = 1
+        """)
+
+        self.waiting.clear()
+        self.live.clear()
+        self._by_owner.clear()
+
+        for row in rows:
+            if row["fake_spawn_id"]:
+                self.register(
+                    row["fake_spawn_id"],
+                    owner_id=row["user_id"],
+                    guild_id=row["fake_spawn_guild_id"],
+                    channel_id=row["fake_spawn_channel_id"],
+                    expires_at=row["fake_spawn_expires_at"] or 0
+                )
+            else:
+                self.waiting[row["user_id"]] = row["fake_spawn_guild_id"]
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Mises à jour
+    # ──────────────────────────────────────────────────────────────
+    def activate(self, owner_id: int, guild_id: int | None = None):
+        """Skill Illusionniste lancé : le joueur attend un faux spawn."""
+        if owner_id not in self._by_owner:
+            self.waiting[owner_id] = guild_id
+
+    def register(self, message_id: int, owner_id: int, guild_id: int | None,
+                 channel_id: int | None, expires_at: float):
+        """Un faux spawn vient d'apparaître (ou a été retrouvé au démarrage)."""
+        self.waiting.pop(owner_id, None)
+        self.live[message_id] = {
+            "owner_id":   owner_id,
+            "guild_id":   guild_id,
+            "channel_id": channel_id,
+            "expires_at": expires_at,
+        }
+        self._by_owner[owner_id] = message_id
+
+    def drop(self, owner_id: int):
+        """Retire un Illusionniste de l'attente (skill annulé)."""
+        self.waiting.pop(owner_id, None)
+
+    def release(self, message_id: int) -> dict | None:
+        """Retire un faux spawn (capturé ou expiré) et renvoie ses infos."""
+        entry = self.live.pop(message_id, None)
+        if entry is not None:
+            self._by_owner.pop(entry["owner_id"], None)
+        return entry
+
+    def get(self, message_id: int) -> dict | None:
+        return self.live.get(message_id)
+
+    def pending_dispatch(self) -> list[tuple[int, int | None]]:
+        """Illusionnistes à servir au prochain passage : [(owner_id, guild_id)]."""
+        return list(self.waiting.items())
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🌐 Instance partagée
+# ────────────────────────────────────────────────────────────────────────────────
+fake_spawns = FakeSpawnTracker()
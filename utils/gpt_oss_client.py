@@ -1,15 +1,24 @@
 # ────────────────────────────────────────────────────────────────────────────────
 # 📌 gpt_oss_client.py — Connexion cloud NVIDIA GPT-OSS (pour !!gpt et /rpgpt)
+# Objectif : Appels asynchrones (aiohttp) à l'API chat-completions compatible OpenAI
+#            sans bloquer la boucle du bot : concurrence bornée, file par utilisateur,
+#            timeouts, cache LRU des réponses !!gpt et quota mis en cache
 # ────────────────────────────────────────────────────────────────────────────────
+import asyncio
 import os
-from openai import OpenAI
-import requests
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+import aiohttp
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🔑 Clé NVIDIA (cloud)
 # ────────────────────────────────────────────────────────────────────────────────
 API_KEY = os.getenv("GPT_OSS_API_KEY")
-BASE_URL = "https://integrate.api.nvidia.com/v1"
+# Surchargeable pour pointer vers un serveur local compatible OpenAI (tests, stub)
+BASE_URL = os.getenv("GPT_OSS_BASE_URL", "https://integrate.api.nvidia.com/v1").rstrip("/")
+MODEL = "openai/gpt-oss-120b"
 
 if not API_KEY:
     print("❌ Aucune clé GPT-OSS détectée. Configure GPT_OSS_API_KEY dans ton environnement.")
@@ -17,51 +26,148 @@ else:
     print("✅ Clé NVIDIA GPT-OSS détectée — utilisation du cloud.")
 
 # ────────────────────────────────────────────────────────────────────────────────
-# ⚙️ Initialisation du client NVIDIA Cloud
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+MAX_CONCURRENT  = 4      # requêtes simultanées vers l'API, tous utilisateurs confondus
+REQUEST_TIMEOUT = 30     # secondes par complétion
+QUOTA_TIMEOUT   = 5      # secondes pour /usage
+CACHE_SIZE      = 256    # réponses !!gpt gardées en mémoire
+CACHE_TTL       = 600    # secondes avant de redemander le même prompt
+QUOTA_TTL       = 300    # secondes entre deux lectures du quota
+DEFAULT_QUOTA   = 100_000
+
 # ────────────────────────────────────────────────────────────────────────────────
-client = OpenAI(base_url=BASE_URL, api_key=API_KEY)
+# 🔌 Session HTTP + limites de concurrence
+# ────────────────────────────────────────────────────────────────────────────────
+_session: aiohttp.ClientSession | None = None
+_semaphore = asyncio.Semaphore(MAX_CONCURRENT)
+_user_locks: dict[int, list] = {}  # {user_id: [Lock, nb de requêtes en attente]}
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Session partagée, créée au premier appel (dans la boucle du bot)."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            headers={"Authorization": f"Bearer {API_KEY}"} if API_KEY else None
+        )
+    return _session
+
+
+async def close():
+    """Ferme la session HTTP (déchargement du cog)."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+@asynccontextmanager
+async def _user_slot(user_id: int | None):
+    """Une seule requête à la fois par utilisateur : les suivantes attendent leur tour."""
+    if user_id is None:
+        yield
+        return
+    entry = _user_locks.setdefault(user_id, [asyncio.Lock(), 0])
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            _user_locks.pop(user_id, None)
+
+
+async def _chat(messages: list[dict], **params) -> str:
+    """POST /chat/completions ; lève une exception si l'API échoue."""
+    async with _semaphore:
+        async with _get_session().post(
+            f"{BASE_URL}/chat/completions",
+            json={"model": MODEL, "messages": messages, **params},
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        ) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+    return (data["choices"][0]["message"].get("content") or "").strip()
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗂️ Cache des réponses simples (LRU + TTL)
+# ────────────────────────────────────────────────────────────────────────────────
+_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()  # {prompt normalisé: (expire_at, réponse)}
+
+
+def _normalize(prompt: str) -> str:
+    """Même clé pour « Salut ! » et « salut » (casse, espaces, ponctuation finale)."""
+    return " ".join(prompt.casefold().split()).rstrip(" ?!.…")
+
+
+def _cache_get(key: str) -> str | None:
+    item = _cache.get(key)
+    if item is None:
+        return None
+    if item[0] < time.monotonic():
+        del _cache[key]
+        return None
+    _cache.move_to_end(key)
+    return item[1]
+
+
+def _cache_set(key: str, value: str):
+    _cache[key] = (time.monotonic() + CACHE_TTL, value)
+    _cache.move_to_end(key)
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 💬 Réponse simple (commande !!gpt)
 # ────────────────────────────────────────────────────────────────────────────────
-def get_simple_response(prompt: str) -> str:
+async def get_simple_response(prompt: str, user_id: int | None = None) -> str:
     """
     Envoie un simple prompt texte à GPT-OSS NVIDIA (cloud) et renvoie la réponse directe.
-    Utilisé pour la commande !!gpt.
+    Utilisé pour la commande !!gpt. Les prompts identiques (normalisés) sont servis
+    depuis le cache ; les requêtes d'un même utilisateur passent l'une après l'autre.
     """
+    key = _normalize(prompt)
+    if (cached := _cache_get(key)) is not None:
+        return cached
+
     try:
-        # Consigne ajoutée automatiquement sans compter dans la limite utilisateur
-        full_prompt = (
-            prompt.strip()
-            + "\n\nRéponds brièvement et clairement, en français, en 1 à 3 phrases maximum."
-        )
+        async with _user_slot(user_id):
+            # Un prompt identique a pu être résolu pendant l'attente
+            if (cached := _cache_get(key)) is not None:
+                return cached
 
-        response = client.chat.completions.create(
-            model="openai/gpt-oss-120b",
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "Tu es un assistant conversationnel précis, bienveillant et toujours francophone. "
-                        "Réponds de manière naturelle et fluide."
-                    ),
-                },
-                {"role": "user", "content": full_prompt},
-            ],
-            temperature=0.8,   # un peu plus libre pour éviter les non-réponses
-            top_p=0.8,
-            max_tokens=512,    # limite interne confortable (pas coupée brutalement)
-        )
+            # Consigne ajoutée automatiquement sans compter dans la limite utilisateur
+            full_prompt = (
+                prompt.strip()
+                + "\n\nRéponds brièvement et clairement, en français, en 1 à 3 phrases maximum."
+            )
+
+            msg = await _chat(
+                [
+                    {
+                        "role": "system",
+                        "content": (
+                            "Tu es un assistant conversationnel précis, bienveillant et toujours francophone. "
+                            "Réponds de manière naturelle et fluide."
+                        ),
+                    },
+                    {"role": "user", "content": full_prompt},
+                ],
+                temperature=0.8,   # un peu plus libre pour éviter les non-réponses
+                top_p=0.8,
+                max_tokens=512,    # limite interne confortable (pas coupée brutalement)
+            )
 
-        msg = response.choices[0].message.content
-        if not msg or not msg.strip():
+        if not msg:
             return "⚠️ Le modèle n’a rien répondu."
-        msg = msg.strip()
 
         # Tronquer à 500 caractères maximum
         if len(msg) > 500:
             msg = msg[:500].rstrip() + "…"
 
+        _cache_set(key, msg)
         return msg
 
     except Exception as e:
@@ -71,23 +177,23 @@ def get_simple_response(prompt: str) -> str:
 # ────────────────────────────────────────────────────────────────────────────────
 # 💬 Continuation d’histoire (utilisée par RPGPT)
 # ────────────────────────────────────────────────────────────────────────────────
-def get_story_continuation(history: list[dict]) -> str:
+async def get_story_continuation(history: list[dict], user_id: int | None = None) -> str:
     """
     Envoie l'historique du RPG à GPT-OSS NVIDIA (cloud) et renvoie la suite de l'histoire.
     Chaque élément de 'history' est une dict : {role: 'user'/'assistant'/'system', content: str}
+    Jamais mis en cache : la suite dépend de tout l'historique.
     """
     try:
-        response = client.chat.completions.create(
-            model="openai/gpt-oss-120b",
-            messages=history,
-            temperature=0.95,
-            top_p=0.7,
-            max_tokens=1024
-        )
-        msg = response.choices[0].message.content
+        async with _user_slot(user_id):
+            msg = await _chat(
+                history,
+                temperature=0.95,
+                top_p=0.7,
+                max_tokens=1024
+            )
         if not msg:
             return "⚠️ Le narrateur se tait..."
-        return msg.strip()
+        return msg
     except Exception as e:
         print(f"[Erreur GPT-OSS Histoire] {type(e)} — {e}")
         return "⚠️ Le narrateur se tait... (*erreur du modèle ou limite atteinte*)"
@@ -95,22 +201,33 @@ def get_story_continuation(history: list[dict]) -> str:
 # --------------------------------------------------------------------- #
 # Fonction pour récupérer le quota restant
 # --------------------------------------------------------------------- #
-def remaining_tokens() -> int:
+_quota: tuple[float, int] | None = None  # (expire_at, tokens restants)
+_quota_lock = asyncio.Lock()
+
+
+async def remaining_tokens() -> int:
     """
     Retourne le nombre de tokens restants dans le quota mensuel NVIDIA GPT-OSS.
     Approximation : 100 000 tokens par mois (free-tier)
+    Valeur relue au plus une fois toutes les QUOTA_TTL secondes.
     """
-    try:
-        resp = requests.get(
-            f"{BASE_URL}/usage",
-            headers={"Authorization": f"Bearer {API_KEY}"},
-            timeout=5
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        used = data.get("token_used", 0)
-        quota = data.get("token_quota", 100_000)
-        return quota - used
-    except Exception as e:
-        print(f"[Erreur remaining_tokens] {e}")
-        return 100_000
+    global _quota
+    async with _quota_lock:
+        if _quota is not None and _quota[0] > time.monotonic():
+            return _quota[1]
+        try:
+            async with _get_session().get(
+                f"{BASE_URL}/usage",
+                timeout=aiohttp.ClientTimeout(total=QUOTA_TIMEOUT)
+            ) as resp:
+                resp.raise_for_status()
+                data = await resp.json()
+            used = data.get("token_used", 0)
+            quota = data.get("token_quota", DEFAULT_QUOTA)
+            value = quota - used
+        except Exception as e:
+            print(f"[Erreur remaining_tokens] {e}")
+            # Garde la dernière valeur connue, sinon l'approximation free-tier
+            value = _quota[1] if _quota is not None else DEFAULT_QUOTA
+        _quota = (time.monotonic() + QUOTA_TTL, value)
+        return value
@@ -22,10 +22,101 @@ os.makedirs(DB_DIR, exist_ok=True)
 
 
 def get_conn():
-    """Retourne une connexion SQLite vers reiatsu.db"""
+    """
+    Retourne une connexion SQLite vers reiatsu.db.
+    Réservé aux scripts synchrones (init, tunnel) : les cogs passent par utils.database.
+    """
     return sqlite3.connect(REIATSU_DB_PATH)
 
 
+def _add_column(cursor, table: str, column: str, decl: str):
+    """Ajoute une colonne à une table existante si elle manque (migration légère)."""
+    columns = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def _migrate_quest_completions(cursor):
+    """
+    Recopie une seule fois les quêtes de l'ancienne colonne JSON reiatsu.quetes
+    dans quest_completions (date inconnue → completed_at = 0).
+    """
+    done = cursor.execute(
+        "SELECT 1 FROM config WHERE key = 'quest_completions_migrated'"
+    ).fetchone()
+    if done:
+        return
+
+    cursor.execute("""
+    INSERT OR IGNORE INTO quest_completions (user_id, quest_key, completed_at)
+    SELECT r.user_id, q.value, 0
+    FROM reiatsu r, json_each(r.quetes) q
+    WHERE json_valid(r.quetes) AND json_type(r.quetes) = 'array' AND q.type = 'text'
+    """)
+    cursor.execute(
+        "INSERT INTO config (key, value) VALUES ('quest_completions_migrated', '1')"
+    )
+
+
+def _migrate_active_effects(cursor):
+    """
+    Recopie une seule fois les effets encore actifs de l'ancienne colonne JSON
+    reiatsu.shop_effets dans active_effects (end_time ISO UTC → timestamp).
+    """
+    done = cursor.execute(
+        "SELECT 1 FROM config WHERE key = 'active_effects_migrated'"
+    ).fetchone()
+    if done:
+        return
+
+    cursor.execute("""
+    INSERT OR REPLACE INTO active_effects (user_id, guild_id, effect_key, end_time, payload)
+    SELECT user_id, guild_id, effect_key, end_time,
+           CASE WHEN effect_key = 'rename' THEN json_object('nick', nick) END
+    FROM (
+        SELECT r.user_id,
+               json_extract(e.value, '$.guild_id')   AS guild_id,
+               json_extract(e.value, '$.effect_key') AS effect_key,
+               (julianday(json_extract(e.value, '$.end_time')) - 2440587.5) * 86400.0 AS end_time,
+               json_extract(e.value, '$.forced_nick') AS nick
+        FROM reiatsu r, json_each(r.shop_effets) e
+        WHERE json_valid(r.shop_effets) AND json_type(r.shop_effets) = 'array'
+    )
+    WHERE guild_id IS NOT NULL AND effect_key IS NOT NULL
+      AND end_time > (julianday('now') - 2440587.5) * 86400.0
+    """)
+    cursor.execute(
+        "INSERT INTO config (key, value) VALUES ('active_effects_migrated', '1')"
+    )
+
+
+def _migrate_timers(cursor):
+    """
+    Crée une seule fois les minuteurs des échéances déjà en base
+    (effets du ReiatsuShop, faux Reiatsu en ligne) pour utils.timer_service.
+    """
+    done = cursor.execute(
+        "SELECT 1 FROM config WHERE key = 'timers_migrated'"
+    ).fetchone()
+    if done:
+        return
+
+    cursor.execute("""
+    INSERT OR IGNORE INTO timers (name, key, due_at, payload)
+    SELECT 'reiatsu_shop.effect', user_id || ':' || guild_id || ':' || effect_key, end_time, NULL
+    FROM active_effects
+    """)
+    cursor.execute("""
+    INSERT OR IGNORE INTO timers (name, key, due_at, payload)
+    SELECT 'reiatsu_spawner.fake', CAST(fake_spawn_id AS TEXT), COALESCE(fake_spawn_expires_at, 0), NULL
+    FROM reiatsu
+    WHERE fake_spawn_id IS NOT NULL
+    """)
+    cursor.execute(
+        "INSERT INTO config (key, value) VALUES ('timers_migrated', '1')"
+    )
+
+
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Initialisation des tables
 # ────────────────────────────────────────────────────────────────────────────────
@@ -51,15 +142,41 @@ def init_db():
         fake_spawn_guild_id INTEGER,
         niveau INTEGER DEFAULT 0,
         quetes TEXT DEFAULT '[]',
-        shop_effets TEXT DEFAULT '[]'
+        shop_effets TEXT DEFAULT '[]',
+        fake_spawn_channel_id INTEGER,
+        fake_spawn_expires_at REAL
     )
     """)
 
+    # Faux spawn : salon + échéance, pour reprendre l'expiration après un redémarrage
+    _add_column(cursor, "reiatsu", "fake_spawn_channel_id", "INTEGER")
+    _add_column(cursor, "reiatsu", "fake_spawn_expires_at", "REAL")
+
     cursor.execute("""
     CREATE INDEX IF NOT EXISTS idx_reiatsu_user_id
     ON reiatsu(user_id)
     """)
 
+    # Classement : Top N et rangs sans tri de toute la table
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_reiatsu_points
+    ON reiatsu(points DESC)
+    """)
+
+    # Index partiel : recherche d'un faux spawn par message (réactions)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_reiatsu_fake_spawn
+    ON reiatsu(fake_spawn_id)
+    WHERE fake_spawn_id IS NOT NULL
+    """)
+
+    # Index partiel : seuls les joueurs au skill actif y figurent
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_reiatsu_active_skill
+    ON reiatsu(classe, active_skill)
+    WHERE active_skill = 1
+    """)
+
 
     # ─── Table reiatsu_config ──────────────────────
     cursor.execute("""
@@ -79,6 +196,11 @@ def init_db():
     ON reiatsu_config(guild_id)
     """)
 
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_reiatsu_config_message
+    ON reiatsu_config(message_id)
+    """)
+
 
     # ─── Table mots_trouves ────────────────────────
     cursor.execute("""
@@ -162,6 +284,24 @@ def init_db():
     )
     """)    
 
+    # ─── Table quest_completions ──────────────────
+    # Une ligne par quête validée (remplace la colonne JSON reiatsu.quetes)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS quest_completions (
+        user_id      INTEGER NOT NULL,
+        quest_key    TEXT    NOT NULL,
+        completed_at REAL    NOT NULL,
+        PRIMARY KEY (user_id, quest_key)
+    ) WITHOUT ROWID
+    """)
+
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_quest_completions_at
+    ON quest_completions(completed_at)
+    """)
+
+    _migrate_quest_completions(cursor)
+
     # ─── Table top entrainement cererbral ─────────────────────────────
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS kawashima_scores (
@@ -172,6 +312,63 @@ def init_db():
         timestamp INTEGER NOT NULL
     )
     """)
+
+    # ─── Table channel_webhooks ───────────────────
+    # Un webhook réutilisable par salon (utils.webhook_pool)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS channel_webhooks (
+        channel_id INTEGER PRIMARY KEY,
+        guild_id   INTEGER NOT NULL,
+        webhook_id INTEGER NOT NULL,
+        token      TEXT    NOT NULL,
+        created_at REAL    NOT NULL
+    )
+    """)
+
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_channel_webhooks_guild
+    ON channel_webhooks(guild_id)
+    """)
+
+    # ─── Table active_effects ─────────────────────
+    # Effets du ReiatsuShop en cours (remplace la colonne JSON reiatsu.shop_effets)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS active_effects (
+        user_id    INTEGER NOT NULL,
+        guild_id   INTEGER NOT NULL,
+        effect_key TEXT    NOT NULL,
+        end_time   REAL    NOT NULL,
+        payload    TEXT,
+        PRIMARY KEY (user_id, guild_id, effect_key)
+    ) WITHOUT ROWID
+    """)
+
+    # Rechargement et purge des effets expirés sans parcourir la table
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_active_effects_end
+    ON active_effects(end_time)
+    """)
+
+    _migrate_active_effects(cursor)
+
+    # ─── Table timers ─────────────────────────────
+    # Minuteurs persistants des cogs (utils.timer_service)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS timers (
+        name    TEXT NOT NULL,
+        key     TEXT NOT NULL,
+        due_at  REAL NOT NULL,
+        payload TEXT,
+        PRIMARY KEY (name, key)
+    ) WITHOUT ROWID
+    """)
+
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_timers_due
+    ON timers(due_at)
+    """)
+
+    _migrate_timers(cursor)
     
     
     
@@ -11,6 +11,8 @@ import asyncio
 import discord
 from discord.ui import View, Button
 
+from utils.message_router import message_router
+
 # ────────────────────────────────────────────────────────────────────────────────
 # 📦 Paramètres
 # ────────────────────────────────────────────────────────────────────────────────
@@ -43,7 +45,7 @@ async def addition_cachee(ctx, embed, get_user_id, bot):
     await ctx.edit(embed=embed)
 
     try:
-        msg = await bot.wait_for("message", check=lambda m: m.author.id == get_user_id(), timeout=TIMEOUT)
+        msg = await message_router.wait_for(ctx.channel.id, lambda m: m.author.id == get_user_id(), TIMEOUT, name="kawashima")
         return int(msg.content) == total
     except:
         return False
@@ -73,7 +75,7 @@ async def calcul_rapide(ctx, embed, get_user_id, bot):
     await ctx.edit(embed=embed)
 
     try:
-        msg = await bot.wait_for("message", check=lambda m: m.author.id == get_user_id(), timeout=TIMEOUT)
+        msg = await message_router.wait_for(ctx.channel.id, lambda m: m.author.id == get_user_id(), TIMEOUT, name="kawashima")
         return int(msg.content) == answer
     except:
         return False
@@ -175,10 +177,11 @@ async def compter_emojis(ctx, embed, get_user_id, bot):
     await ctx.edit(embed=embed)
 
     try:
-        msg = await bot.wait_for(
-            "message",
-            check=lambda m: m.author.id == get_user_id(),
-            timeout=TIMEOUT
+        msg = await message_router.wait_for(
+            ctx.channel.id,
+            lambda m: m.author.id == get_user_id(),
+            TIMEOUT,
+            name="kawashima"
         )
         return msg.content.isdigit() and int(msg.content) == total
     except:
@@ -387,7 +390,7 @@ async def equation_trou(ctx, embed, get_user_id, bot):
     await ctx.edit(embed=embed)
 
     try:
-        msg = await bot.wait_for("message", check=lambda m: m.author.id == get_user_id(), timeout=TIMEOUT)
+        msg = await message_router.wait_for(ctx.channel.id, lambda m: m.author.id == get_user_id(), TIMEOUT, name="kawashima")
         return int(msg.content) == answer
     except:
         return False
@@ -413,10 +416,11 @@ async def heures(ctx, embed, get_user_id, bot):
     await ctx.edit(embed=embed)
 
     try:
-        msg = await bot.wait_for(
-            "message",
-            check=lambda m: m.author.id == get_user_id(),
-            timeout=TIMEOUT
+        msg = await message_router.wait_for(
+            ctx.channel.id,
+            lambda m: m.author.id == get_user_id(),
+            TIMEOUT,
+            name="kawashima"
         )
         rep = msg.content.lower().replace("h", " ").replace(":", " ").replace("min", " ").replace("m", " ")
         nums = [int(x) for x in rep.split() if x.isdigit()]
@@ -451,7 +455,7 @@ async def memoire_numerique(ctx, embed, get_user_id, bot):
     await ctx.edit(embed=embed)
 
     try:
-        msg = await bot.wait_for("message", check=lambda m: m.author.id == get_user_id(), timeout=TIMEOUT)
+        msg = await message_router.wait_for(ctx.channel.id, lambda m: m.author.id == get_user_id(), TIMEOUT, name="kawashima")
         return msg.content == "".join(map(str, sequence))
     except:
         return False
@@ -539,7 +543,7 @@ async def monnaie(ctx, embed, get_user_id, bot):
     await asyncio.sleep(prep_time)
 
     try:
-        msg = await bot.wait_for("message", check=lambda m: m.author.id == get_user_id(), timeout=TIMEOUT)
+        msg = await message_router.wait_for(ctx.channel.id, lambda m: m.author.id == get_user_id(), TIMEOUT, name="kawashima")
         return abs(float(msg.content.replace(',', '.')) - rendu) < 0.01
     except:
         return False
@@ -567,7 +571,7 @@ async def mot_miroir(ctx, embed, get_user_id, bot):
     await asyncio.sleep(prep_time)
 
     try:
-        msg = await bot.wait_for("message", check=lambda m: m.author.id == get_user_id(), timeout=TIMEOUT)
+        msg = await message_router.wait_for(ctx.channel.id, lambda m: m.author.id == get_user_id(), TIMEOUT, name="kawashima")
         return msg.content.lower() == mot_inverse
     except:
         return False
@@ -590,7 +594,7 @@ async def pagaille(ctx, embed, get_user_id, bot):
     await asyncio.sleep(prep_time)
 
     try:
-        msg = await bot.wait_for("message", check=lambda m: m.author.id == get_user_id(), timeout=TIMEOUT)
+        msg = await message_router.wait_for(ctx.channel.id, lambda m: m.author.id == get_user_id(), TIMEOUT, name="kawashima")
         return msg.content.lower() == mot
     except:
         return False
@@ -883,7 +887,7 @@ async def suite_alpha(ctx, embed, get_user_id, bot):
     await asyncio.sleep(prep_time)
 
     try:
-        msg = await bot.wait_for("message", check=lambda m: m.author.id == get_user_id(), timeout=TIMEOUT)
+        msg = await message_router.wait_for(ctx.channel.id, lambda m: m.author.id == get_user_id(), TIMEOUT, name="kawashima")
         return msg.content.strip().upper() == answer
     except:
         return False
@@ -934,7 +938,7 @@ async def suite_logique(ctx, embed, get_user_id, bot):
     await asyncio.sleep(prep_time)
 
     try:
-        msg = await bot.wait_for("message", check=lambda m: m.author.id == get_user_id(), timeout=TIMEOUT)
+        msg = await message_router.wait_for(ctx.channel.id, lambda m: m.author.id == get_user_id(), TIMEOUT, name="kawashima")
         return int(msg.content) == answer
     except:
         return False
@@ -975,10 +979,11 @@ async def trouver_difference(ctx, embed, get_user_id, bot):
     await asyncio.sleep(trouver_difference.prep_time)
 
     try:
-        msg = await bot.wait_for(
-            "message",
-            check=lambda m: m.author.id == get_user_id(),
-            timeout=TIMEOUT
+        msg = await message_router.wait_for(
+            ctx.channel.id,
+            lambda m: m.author.id == get_user_id(),
+            TIMEOUT,
+            name="kawashima"
         )
         if not msg.content.isdigit():
             return False
@@ -1018,10 +1023,11 @@ async def typo_trap(ctx, embed, get_user_id, bot):
 
     # Attente de la réponse
     try:
-        msg = await bot.wait_for(
-            "message",
-            check=lambda m: m.author.id == get_user_id(),
-            timeout=TIMEOUT
+        msg = await message_router.wait_for(
+            ctx.channel.id,
+            lambda m: m.author.id == get_user_id(),
+            TIMEOUT,
+            name="kawashima"
         )
         return msg.content.lower().strip() == nouvelle_lettre
     except:
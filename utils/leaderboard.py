@@ -0,0 +1,235 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 leaderboard.py — Classement Reiatsu matérialisé en mémoire
+# Objectif : Servir le Top N et le rang d'un joueur sans scanner la table
+#            (liste triée + bisect, rafraîchie seulement pour les joueurs modifiés)
+# Catégorie : 🧠 Utils
+# Accès : Interne
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import threading
+from bisect import bisect_left, insort
+
+from utils.database import db
+from utils.profile_cache import profile_cache
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+TOP_N      = 20   # taille du Top suivi pour top_version
+CHUNK_SIZE = 500  # user_id par requête IN (...) lors d'un rafraîchissement
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📊 Classement
+# ────────────────────────────────────────────────────────────────────────────────
+class Leaderboard:
+    """
+    Classement global trié par points décroissants.
+    - _keys : liste triée de (-points, user_id) → rang en O(log n) par bisect
+    - abonné à profile_cache : chaque écriture sur `reiatsu` marque les joueurs
+      concernés comme « sales », relus en un seul SELECT au prochain refresh()
+    - top_version n'augmente que si le Top N change : l'affichage peut être
+      réutilisé tant qu'elle ne bouge pas
+    - vues par serveur : même liste triée restreinte aux membres du serveur
+      (ensembles tenus à jour par les évènements join/leave), mises à jour en même
+      temps que la vue globale → Top et rang d'un serveur sans parcourir la table
+    """
+
+    def __init__(self, top_n: int = TOP_N):
+        self.top_n = top_n
+        self._keys: list[tuple[int, int]] = []
+        self._points: dict[int, int] = {}
+        self._loaded = False
+
+        self._dirty: set[int] = set()
+        self._stale = True
+        self._dirty_lock = threading.Lock()  # invalidations possibles hors de la boucle asyncio
+        self._refresh_lock = asyncio.Lock()
+
+        self.top_version = 0
+
+        # Vues par serveur
+        self._guild_members: dict[int, set[int]] = {}               # {guild_id: {user_id}}
+        self._guild_keys: dict[int, list[tuple[int, int]]] = {}     # {guild_id: [(-points, user_id)]}
+        self._member_guilds: dict[int, set[int]] = {}               # {user_id: {guild_id}}
+        self.guild_versions: dict[int, int] = {}
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Invalidation (appelée par profile_cache)
+    # ──────────────────────────────────────────────────────────────
+    def mark_dirty(self, user_ids):
+        if user_ids is None:
+            self._stale = True
+            return
+        with self._dirty_lock:
+            self._dirty.update(user_ids)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Rafraîchissement
+    # ──────────────────────────────────────────────────────────────
+    async def refresh(self):
+        """Applique les changements en attente (rechargement complet si besoin)."""
+        async with self._refresh_lock:
+            if self._stale or not self._loaded:
+                self._stale = False
+                with self._dirty_lock:
+                    self._dirty.clear()
+                await self._reload()
+                return
+
+            with self._dirty_lock:
+                dirty, self._dirty = self._dirty, set()
+            if not dirty:
+                return
+
+            ids = list(dirty)
+            found: dict[int, int] = {}
+            for i in range(0, len(ids), CHUNK_SIZE):
+                chunk = ids[i:i + CHUNK_SIZE]
+                rows = await db.fetchall(
+                    f"SELECT user_id, points FROM reiatsu WHERE user_id IN ({','.join('?' * len(chunk))})",
+                    tuple(chunk)
+                )
+                found.update((row["user_id"], row["points"] or 0) for row in rows)
+
+            for user_id in ids:
+                self._set(user_id, found.get(user_id))
+
+    async def _reload(self):
+        rows = await db.fetchall("SELECT user_id, points FROM reiatsu ORDER BY points DESC, user_id")
+        self._points = {row["user_id"]: row["points"] or 0 for row in rows}
+        self._keys = [(-points, user_id) for user_id, points in self._points.items()]
+        self._keys.sort()
+        self._loaded = True
+        self.top_version += 1
+
+        for guild_id in self._guild_members:
+            self._rebuild_guild(guild_id)
+
+    def _set(self, user_id: int, points: int | None):
+        """Déplace un joueur dans la liste triée (points=None → retiré)."""
+        old = self._points.get(user_id)
+        if old == points:
+            return
+
+        if points is None:
+            del self._points[user_id]
+        else:
+            self._points[user_id] = points
+
+        if self._move(self._keys, user_id, old, points):
+            self.top_version += 1
+        for guild_id in self._member_guilds.get(user_id, ()):
+            if self._move(self._guild_keys[guild_id], user_id, old, points):
+                self._bump_guild(guild_id)
+
+    def _move(self, keys: list, user_id: int, old: int | None, new: int | None) -> bool:
+        """Retire/insère la clé du joueur ; renvoie True si le Top N est touché."""
+        touched_top = False
+        if old is not None:
+            idx = bisect_left(keys, (-old, user_id))
+            if idx < len(keys) and keys[idx] == (-old, user_id):
+                del keys[idx]
+                touched_top = idx < self.top_n
+        if new is not None:
+            key = (-new, user_id)
+            insort(keys, key)
+            touched_top = touched_top or bisect_left(keys, key) < self.top_n
+        return touched_top
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Appartenance aux serveurs (évènements Discord)
+    # ──────────────────────────────────────────────────────────────
+    def set_guild_members(self, guild_id: int, member_ids):
+        """(Re)définit tous les membres d'un serveur (on_ready / on_guild_join)."""
+        self.drop_guild(guild_id)
+        members = set(member_ids)
+        self._guild_members[guild_id] = members
+        for user_id in members:
+            self._member_guilds.setdefault(user_id, set()).add(guild_id)
+        self._rebuild_guild(guild_id)
+
+    def add_member(self, guild_id: int, user_id: int):
+        members = self._guild_members.get(guild_id)
+        if members is None or user_id in members:
+            return
+        members.add(user_id)
+        self._member_guilds.setdefault(user_id, set()).add(guild_id)
+        if self._move(self._guild_keys[guild_id], user_id, None, self._points.get(user_id)):
+            self._bump_guild(guild_id)
+
+    def remove_member(self, guild_id: int, user_id: int):
+        members = self._guild_members.get(guild_id)
+        if members is None or user_id not in members:
+            return
+        members.discard(user_id)
+        guilds = self._member_guilds.get(user_id)
+        if guilds is not None:
+            guilds.discard(guild_id)
+            if not guilds:
+                del self._member_guilds[user_id]
+        if self._move(self._guild_keys[guild_id], user_id, self._points.get(user_id), None):
+            self._bump_guild(guild_id)
+
+    def drop_guild(self, guild_id: int):
+        """Oublie un serveur (bot retiré du serveur)."""
+        for user_id in self._guild_members.pop(guild_id, ()):
+            guilds = self._member_guilds.get(user_id)
+            if guilds is not None:
+                guilds.discard(guild_id)
+                if not guilds:
+                    del self._member_guilds[user_id]
+        self._guild_keys.pop(guild_id, None)
+
+    def _rebuild_guild(self, guild_id: int):
+        points = self._points
+        keys = [(-points[uid], uid) for uid in self._guild_members[guild_id] if uid in points]
+        keys.sort()
+        self._guild_keys[guild_id] = keys
+        self._bump_guild(guild_id)
+
+    def _bump_guild(self, guild_id: int):
+        self.guild_versions[guild_id] = self.guild_versions.get(guild_id, 0) + 1
+
+    def has_guild(self, guild_id: int) -> bool:
+        return guild_id in self._guild_keys
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Lecture
+    # ──────────────────────────────────────────────────────────────
+    def _view(self, guild_id: int | None) -> list[tuple[int, int]]:
+        return self._keys if guild_id is None else self._guild_keys.get(guild_id, [])
+
+    def version(self, guild_id: int | None = None) -> int:
+        """Version du Top N (global ou du serveur)."""
+        return self.top_version if guild_id is None else self.guild_versions.get(guild_id, 0)
+
+    def top(self, n: int | None = None, guild_id: int | None = None) -> list[tuple[int, int]]:
+        """[(user_id, points)] des n premiers (du serveur si guild_id est donné)."""
+        return [(user_id, -neg) for neg, user_id in self._view(guild_id)[:n or self.top_n]]
+
+    def points(self, user_id: int) -> int | None:
+        return self._points.get(user_id)
+
+    def rank(self, user_id: int, guild_id: int | None = None) -> int | None:
+        """Rang 1-based (ex æquo = même rang), None si le joueur n'est pas classé."""
+        points = self._points.get(user_id)
+        if points is None:
+            return None
+        if guild_id is not None and user_id not in self._guild_members.get(guild_id, ()):
+            return None
+        return bisect_left(self._view(guild_id), (-points,)) + 1
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🌐 Instance partagée
+# ────────────────────────────────────────────────────────────────────────────────
+leaderboard = Leaderboard()
+profile_cache.subscribe(leaderboard.mark_dirty)
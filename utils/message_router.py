@@ -0,0 +1,218 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 message_router.py — Aiguillage des messages vers les jeux actifs par salon
+# Objectif : Un seul point d'entrée (bot.on_message) au lieu d'un listener
+#            on_message / bot.wait_for par cog : les jeux s'abonnent à
+#            (salon, prédicat) le temps d'une partie, un message dans un salon
+#            sans partie coûte une seule recherche dans un dict.
+#            Les intercepteurs (effets du ReiatsuShop) voient chaque message
+#            avant les abonnements par salon et doivent rester en O(1).
+#            Compteurs et temps de traitement par listener pour le panneau admin
+# Catégorie : 🧠 Utils
+# Accès : Interne
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+
+import discord
+
+log = logging.getLogger(__name__)
+
+Predicate = Callable[[discord.Message], bool]
+Handler = Callable[[discord.Message], Awaitable[None]]
+Interceptor = Callable[[discord.Message], bool]
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧷 Abonnement
+# ────────────────────────────────────────────────────────────────────────────────
+class Route:
+    """Abonnement d'un jeu à un salon. `cancel()` le retire du routeur."""
+
+    __slots__ = ("router", "channel_id", "name", "predicate", "handler", "future")
+
+    def __init__(self, router: "MessageRouter", channel_id: int, name: str,
+                 predicate: Predicate | None, handler: Handler | None, future: asyncio.Future | None = None):
+        self.router = router
+        self.channel_id = channel_id
+        self.name = name
+        self.predicate = predicate
+        self.handler = handler
+        self.future = future
+
+    def cancel(self):
+        self.router.unregister(self)
+
+
+class _ListenerStats:
+    __slots__ = ("dispatched", "errors", "total", "max")
+
+    def __init__(self):
+        self.dispatched = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, elapsed: float, error: bool = False):
+        self.dispatched += 1
+        self.errors += error
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔀 Routeur
+# ────────────────────────────────────────────────────────────────────────────────
+class MessageRouter:
+    """
+    {channel_id: [Route]} :
+    - register(channel_id, handler, predicate, name) → chaque message accepté
+      par le prédicat est traité dans sa propre tâche (comme un listener discord.py)
+    - wait_for(channel_id, predicate, timeout, name) → remplace bot.wait_for("message")
+    - intercept(name, hook) → hook(message) synchrone appelé pour tout message,
+      renvoie True s'il a pris le message en charge (il planifie lui-même le travail)
+    Les messages des bots ne sont jamais routés.
+    """
+
+    def __init__(self):
+        self._routes: dict[int, list[Route]] = {}
+        self._interceptors: dict[str, Interceptor] = {}
+        self._stats: dict[str, _ListenerStats] = {}
+        self.received = 0
+        self.routed = 0
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Abonnements
+    # ──────────────────────────────────────────────────────────────
+    def register(self, channel_id: int, handler: Handler, predicate: Predicate | None = None,
+                 name: str = "listener") -> Route:
+        route = Route(self, channel_id, name, predicate, handler)
+        self._routes.setdefault(channel_id, []).append(route)
+        return route
+
+    def unregister(self, route: Route):
+        routes = self._routes.get(route.channel_id)
+        if not routes:
+            return
+        try:
+            routes.remove(route)
+        except ValueError:
+            return
+        if not routes:
+            del self._routes[route.channel_id]
+
+    async def wait_for(self, channel_id: int, predicate: Predicate | None = None,
+                       timeout: float | None = None, name: str = "wait_for") -> discord.Message:
+        """Prochain message du salon accepté par le prédicat ; lève asyncio.TimeoutError."""
+        future = asyncio.get_running_loop().create_future()
+        route = Route(self, channel_id, name, predicate, None, future)
+        self._routes.setdefault(channel_id, []).append(route)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.unregister(route)
+
+    def intercept(self, name: str, hook: Interceptor):
+        """Ajoute (ou remplace) un intercepteur global ; il doit filtrer en O(1)."""
+        self._interceptors[name] = hook
+
+    def remove_interceptor(self, name: str):
+        self._interceptors.pop(name, None)
+
+    def has_routes(self, channel_id: int) -> bool:
+        return channel_id in self._routes
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Distribution
+    # ──────────────────────────────────────────────────────────────
+    def dispatch(self, message: discord.Message) -> int:
+        """Transmet le message aux abonnés de son salon ; renvoie le nombre d'abonnés touchés."""
+        self.received += 1
+        if message.author.bot:
+            return 0
+
+        for name, hook in list(self._interceptors.items()):
+            start = time.perf_counter()
+            try:
+                if hook(message):
+                    self._stat(name).record(time.perf_counter() - start)
+            except Exception:
+                log.exception("[router] Intercepteur %s en erreur", name)
+                self._stat(name).record(time.perf_counter() - start, error=True)
+
+        routes = self._routes.get(message.channel.id)
+        if not routes:
+            return 0
+
+        hits = 0
+        for route in list(routes):  # un handler peut se désabonner pendant la boucle
+            start = time.perf_counter()
+            try:
+                if route.predicate is not None and not route.predicate(message):
+                    continue
+            except Exception:
+                log.exception("[router] Prédicat %s en erreur", route.name)
+                self._stat(route.name).record(time.perf_counter() - start, error=True)
+                continue
+
+            hits += 1
+            if route.future is not None:
+                if not route.future.done():
+                    route.future.set_result(message)
+                self.unregister(route)
+                self._stat(route.name).record(time.perf_counter() - start)
+            else:
+                asyncio.create_task(self._run(route, message))
+
+        self.routed += hits > 0
+        return hits
+
+    async def _run(self, route: Route, message: discord.Message):
+        start = time.perf_counter()
+        error = False
+        try:
+            await route.handler(message)
+        except Exception:
+            error = True
+            log.exception("[router] Listener %s en erreur", route.name)
+        finally:
+            self._stat(route.name).record(time.perf_counter() - start, error=error)
+
+    def _stat(self, name: str) -> _ListenerStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = _ListenerStats()
+        return stats
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Statistiques
+    # ──────────────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        """Messages reçus / routés, abonnements actifs et temps par listener (panneau admin)."""
+        return {
+            "received": self.received,
+            "routed": self.routed,
+            "channels": len(self._routes),
+            "routes": sum(len(routes) for routes in self._routes.values()),
+            "interceptors": sorted(self._interceptors),
+            "listeners": {
+                name: {
+                    "dispatched": s.dispatched,
+                    "errors": s.errors,
+                    "avg_ms": round(s.total / s.dispatched * 1000, 2) if s.dispatched else 0.0,
+                    "max_ms": round(s.max * 1000, 2),
+                }
+                for name, s in sorted(self._stats.items())
+            },
+        }
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🌐 Instance partagée
+# ────────────────────────────────────────────────────────────────────────────────
+message_router = MessageRouter()
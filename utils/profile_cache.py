@@ -0,0 +1,135 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 profile_cache.py — Cache mémoire des profils Reiatsu
+# Objectif : Éviter un SELECT * + json.loads à chaque ensure_profile
+#            (LRU borné + expiration TTL, invalidé par les écritures sur `reiatsu`)
+# Catégorie : 🧠 Utils
+# Accès : Interne
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+CACHE_MAXSIZE = 1024  # profils gardés en mémoire
+CACHE_TTL     = 60.0  # secondes avant relecture forcée
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗂️ Cache LRU + TTL
+# ────────────────────────────────────────────────────────────────────────────────
+class ProfileCache:
+    """
+    Cache process-wide des profils déjà décodés (shop_effets en JSON parsé).
+    - get() / set() travaillent sur des copies : l'appelant peut modifier le profil
+    - invalidate() est appelé par tous les chemins qui écrivent dans `reiatsu`
+    - protégé par un verrou : invalidate() reste sûr hors de la boucle asyncio
+
+    Pour éviter de remettre en cache une lecture devenue obsolète pendant qu'elle
+    s'exécutait, ensure_profile récupère un jeton avant le SELECT et le repasse à
+    set() : si une invalidation a eu lieu entre-temps, le profil n'est pas stocké.
+
+    Les autres vues mémoire de `reiatsu` (classement…) s'abonnent via subscribe()
+    pour être prévenues des mêmes écritures.
+    """
+
+    def __init__(self, maxsize: int = CACHE_MAXSIZE, ttl: float = CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl     = ttl
+        self._data: OrderedDict[int, tuple[float, dict]] = OrderedDict()  # {user_id: (expire_at, profil)}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._listeners: list = []  # callback(user_ids) ; user_ids=None → tout
+
+        # Statistiques
+        self.hits          = 0
+        self.misses        = 0
+        self.invalidations = 0
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Lecture / écriture
+    # ──────────────────────────────────────────────────────────────
+    def get(self, user_id: int) -> dict | None:
+        """Retourne une copie du profil en cache, ou None (absent / expiré)."""
+        with self._lock:
+            item = self._data.get(user_id)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._data[user_id]
+                self.misses += 1
+                return None
+            self._data.move_to_end(user_id)
+            self.hits += 1
+            profile = item[1]
+        return copy.deepcopy(profile)
+
+    def token(self) -> int:
+        """Jeton à prendre avant une lecture en base (voir set)."""
+        return self._generation
+
+    def set(self, user_id: int, profile: dict, token: int | None = None):
+        """Stocke une copie du profil, sauf si une invalidation a eu lieu depuis `token`."""
+        profile = copy.deepcopy(profile)
+        with self._lock:
+            if token is not None and token != self._generation:
+                return
+            self._data[user_id] = (time.monotonic() + self.ttl, profile)
+            self._data.move_to_end(user_id)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Invalidation
+    # ──────────────────────────────────────────────────────────────
+    def invalidate(self, *user_ids: int):
+        """Retire un ou plusieurs profils après une écriture dans `reiatsu`."""
+        with self._lock:
+            self._generation += 1
+            for user_id in user_ids:
+                if self._data.pop(user_id, None) is not None:
+                    self.invalidations += 1
+        self._notify(user_ids)
+
+    def clear(self):
+        """Vide tout le cache (écriture dont les joueurs touchés sont inconnus)."""
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._data)
+            self._data.clear()
+        self._notify(None)
+
+    # ──────────────────────────────────────────────────────────────
+    def subscribe(self, callback):
+        """Appelle `callback(user_ids)` à chaque invalidation (None = tous les joueurs)."""
+        self._listeners.append(callback)
+
+    def _notify(self, user_ids):
+        for callback in self._listeners:
+            callback(user_ids)
+
+    # ──────────────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        """Compteurs pour le panneau admin."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size":          len(self._data),
+                "maxsize":       self.maxsize,
+                "ttl":           self.ttl,
+                "hits":          self.hits,
+                "misses":        self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate":      round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🌐 Instance partagée
+# ────────────────────────────────────────────────────────────────────────────────
+profile_cache = ProfileCache()
@@ -0,0 +1,98 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 quests.py — Service des quêtes Reiatsu
+# Objectif : Valider une quête en une seule transaction (INSERT idempotent dans
+#            quest_completions + niveau incrémenté atomiquement) et lire l'état
+#            des quêtes sans décoder de JSON
+# Catégorie : 🧠 Utils
+# Accès : Interne
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import logging
+import time
+
+from utils.database import db
+from utils.profile_cache import profile_cache
+
+log = logging.getLogger(__name__)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📜 Quêtes disponibles
+# ────────────────────────────────────────────────────────────────────────────────
+QUESTS = {
+    "couleur": "Faire une fois la commande couleur",
+    "pizza": "Faire une fois la commande pizza",
+    "division": "Faire le quizz de la commande division",
+    "entrainement": "Faire un score de minimum 5000 à l'entraînement cérébral",
+    "skill": "Utiliser ton skill",
+    "bmoji": "Réussi le minijeu de la commande bmoji"
+}
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ✅ Validation
+# ────────────────────────────────────────────────────────────────────────────────
+async def complete_quest(user_id: int, quest_key: str) -> int | None:
+    """
+    Valide la quête `quest_key` pour le joueur.
+    Retourne le nouveau niveau si la quête vient d'être validée, sinon None
+    (déjà faite, pas de profil Reiatsu ou erreur).
+
+    La contrainte PRIMARY KEY (user_id, quest_key) rend l'INSERT idempotent :
+    deux validations simultanées ne montent le niveau qu'une fois.
+    """
+    try:
+        async with db.transaction() as tx:
+            cur = await tx.execute("""
+                INSERT INTO quest_completions (user_id, quest_key, completed_at)
+                SELECT ?, ?, ? WHERE EXISTS (SELECT 1 FROM reiatsu WHERE user_id = ?)
+                ON CONFLICT(user_id, quest_key) DO NOTHING
+            """, (user_id, quest_key, time.time(), user_id))
+            if cur.rowcount != 1:
+                return None
+
+            # Même règle qu'avant : un niveau 0/NULL compte comme 1
+            rows = await tx.fetchall(
+                "UPDATE reiatsu SET niveau = COALESCE(NULLIF(niveau, 0), 1) + 1 WHERE user_id = ? RETURNING niveau",
+                (user_id,)
+            )
+        profile_cache.invalidate(user_id)
+        return rows[0]["niveau"]
+
+    except Exception as e:
+        log.exception("[quests] Erreur validation quête %s : %s", quest_key, e)
+        return None
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔎 Lecture
+# ────────────────────────────────────────────────────────────────────────────────
+async def get_completions(user_id: int) -> dict[str, float]:
+    """Quêtes terminées par le joueur : {quest_key: completed_at}."""
+    rows = await db.fetchall(
+        "SELECT quest_key, completed_at FROM quest_completions WHERE user_id = ?",
+        (user_id,)
+    )
+    return {row["quest_key"]: row["completed_at"] for row in rows}
+
+
+async def completions_since(since: float, user_ids=None) -> dict[int, dict[str, float]]:
+    """
+    Toutes les validations depuis `since` (timestamp), en une requête :
+    {user_id: {quest_key: completed_at}}, éventuellement restreint à `user_ids`.
+    """
+    sql = "SELECT user_id, quest_key, completed_at FROM quest_completions WHERE completed_at >= ?"
+    params: tuple = (since,)
+    if user_ids is not None:
+        ids = tuple(user_ids)
+        if not ids:
+            return {}
+        sql += f" AND user_id IN ({','.join('?' * len(ids))})"
+        params += ids
+
+    result: dict[int, dict[str, float]] = {}
+    for row in await db.fetchall(sql + " ORDER BY completed_at", params):
+        result.setdefault(row["user_id"], {})[row["quest_key"]] = row["completed_at"]
+    return result
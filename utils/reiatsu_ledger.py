@@ -0,0 +1,182 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 reiatsu_ledger.py — File d'écriture différée des points Reiatsu
+# Objectif : Regrouper les variations de points en mémoire (par joueur) et les
+#            écrire en une seule transaction toutes les N ms ou N opérations
+# Catégorie : 🧠 Utils
+# Accès : Interne
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import logging
+
+from utils.database import db
+from utils.profile_cache import profile_cache
+
+log = logging.getLogger(__name__)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+FLUSH_INTERVAL  = 0.25  # secondes max avant écriture
+FLUSH_THRESHOLD = 50    # opérations en attente déclenchant une écriture immédiate
+
+# Colonnes de reiatsu pouvant accompagner une variation de points (dernière valeur gagne)
+LEDGER_COLUMNS = ("bonus5", "active_skill", "last_steal_attempt")
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧾 Ledger
+# ────────────────────────────────────────────────────────────────────────────────
+class ReiatsuLedger:
+    """
+    Écriture différée des points Reiatsu.
+    - add() est synchrone : la variation est cumulée en mémoire par joueur
+    - flush() écrit tout le lot dans une seule transaction
+    Les lectures qui ont besoin de la valeur exacte appellent `await ledger.flush()`
+    avant de lire la base (coût nul si rien n'est en attente).
+    """
+
+    def __init__(self, interval: float = FLUSH_INTERVAL, threshold: int = FLUSH_THRESHOLD):
+        self.interval  = interval
+        self.threshold = threshold
+        self._pending: dict[int, dict] = {}  # {user_id: {"delta": int, "username": str, "fields": {...}}}
+        self._inflight: dict[int, dict] = {}  # lot en cours d'écriture (pas encore validé)
+        self._ops = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+
+        # Statistiques
+        self.total_ops     = 0
+        self.total_flushes = 0
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Enregistrement d'une variation
+    # ──────────────────────────────────────────────────────────────
+    def add(self, user_id: int, delta: int = 0, username: str = "", **fields):
+        """Cumule `delta` points pour le joueur (et les colonnes éventuelles)."""
+        for key in fields:
+            if key not in LEDGER_COLUMNS:
+                raise ValueError(f"Colonne non gérée par le ledger : {key}")
+
+        entry = self._pending.setdefault(user_id, {"delta": 0, "username": "", "fields": {}})
+        entry["delta"] += delta
+        if username:
+            entry["username"] = username
+        entry["fields"].update(fields)
+
+        self._ops += 1
+        self.total_ops += 1
+        self._schedule()
+
+    def pending(self, user_id: int) -> dict | None:
+        """
+        Retourne une copie de ce qui n'est pas encore validé en base pour ce joueur
+        (lot en cours d'écriture + variations en attente), ou None.
+        """
+        inflight = self._inflight.get(user_id)
+        entry = self._pending.get(user_id)
+        if not inflight and not entry:
+            return None
+        parts = [e for e in (inflight, entry) if e]
+        return {
+            "delta": sum(e["delta"] for e in parts),
+            "fields": {k: v for e in parts for k, v in e["fields"].items()},  # le plus récent gagne
+        }
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Planification
+    # ──────────────────────────────────────────────────────────────
+    def _schedule(self):
+        if self._ops >= self.threshold:
+            self._start_flush()
+        elif self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.interval, self._start_flush)
+
+    def _start_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Écriture du lot
+    # ──────────────────────────────────────────────────────────────
+    async def flush(self):
+        """Écrit toutes les variations en attente dans une seule transaction."""
+        async with self._flush_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+
+            batch, self._pending, self._ops = self._pending, {}, 0
+            self._inflight = batch  # reste visible par pending() jusqu'au COMMIT
+
+            points_rows = [
+                (uid, e["username"], e["delta"], e["delta"])
+                for uid, e in batch.items()
+            ]
+            field_rows = [
+                (uid, e["fields"]) for uid, e in batch.items() if e["fields"]
+            ]
+
+            try:
+                async with db.transaction() as tx:
+                    await tx.executemany("""
+                        INSERT INTO reiatsu (user_id, username, points)
+                        VALUES (?, ?, MAX(?, 0))
+                        ON CONFLICT(user_id) DO UPDATE SET
+                            points = MAX(reiatsu.points + ?, 0)
+                    """, points_rows)
+
+                    for uid, fields in field_rows:
+                        cols = ", ".join(f"{col} = ?" for col in fields)
+                        await tx.execute(
+                            f"UPDATE reiatsu SET {cols} WHERE user_id = ?",
+                            (*fields.values(), uid)
+                        )
+            except BaseException as e:
+                if not isinstance(e, asyncio.CancelledError):
+                    log.exception("[ledger] Échec de l'écriture du lot : %s", e)
+                self._inflight = {}
+                self._merge_back(batch)
+                if isinstance(e, asyncio.CancelledError):
+                    raise
+            else:
+                self._inflight = {}
+                self.total_flushes += 1
+                profile_cache.invalidate(*batch)
+
+            # Variations arrivées pendant l'écriture (ou lot à réessayer)
+            if self._pending and self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(self.interval, self._start_flush)
+
+    def _merge_back(self, batch: dict):
+        """Remet un lot non écrit en tête des variations en attente."""
+        for uid, old in batch.items():
+            entry = self._pending.get(uid)
+            if entry is None:
+                self._pending[uid] = old
+                continue
+            entry["delta"] += old["delta"]
+            entry["username"] = entry["username"] or old["username"]
+            entry["fields"] = {**old["fields"], **entry["fields"]}
+        self._ops += len(batch)
+
+    # ──────────────────────────────────────────────────────────────
+    async def close(self):
+        """Écriture finale à l'arrêt du bot."""
+        await self.flush()
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🌐 Instance partagée
+# ────────────────────────────────────────────────────────────────────────────────
+ledger = ReiatsuLedger()
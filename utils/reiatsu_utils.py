@@ -8,54 +8,48 @@
 # ────────────────────────────────────────────────────────────────────────────────
 # 📦 Imports nécessaires
 # ────────────────────────────────────────────────────────────────────────────────
-import sqlite3
-import os
 import datetime
 import json
 
-# ────────────────────────────────────────────────────────────────────────────────
-# 🗄️ Configuration SQLite
-# ────────────────────────────────────────────────────────────────────────────────
-DB_PATH = os.path.join("database", "reiatsu.db")
-
-
-def get_conn():
-    """Retourne une connexion SQLite vers reiatsu.db"""
-    return sqlite3.connect(DB_PATH)
+from utils.database import db
+from utils.profile_cache import profile_cache
 
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🔹 Création d’un profil joueur si inexistant
 # ────────────────────────────────────────────────────────────────────────────────
-def ensure_profile(user_id: int, username: str) -> dict:
+async def ensure_profile(user_id: int, username: str) -> dict:
     """
     Vérifie si un joueur a un profil Reiatsu.
     Si non, le crée automatiquement et renvoie le profil.
+    Le profil décodé est servi depuis utils.profile_cache tant qu'aucune
+    écriture ne l'a invalidé.
 
     Returns:
-        dict : Profil joueur
+        dict : Profil joueur (copie modifiable)
     """
 
-    conn = get_conn()
-    cursor = conn.cursor()
+    cached = profile_cache.get(user_id)
+    if cached is not None:
+        return cached
 
-    cursor.execute("SELECT * FROM reiatsu WHERE user_id = ?", (user_id,))
-    row = cursor.fetchone()
+    token = profile_cache.token()
+    row = await db.fetchone("SELECT * FROM reiatsu WHERE user_id = ?", (user_id,))
 
     # ─── Profil existant ───────────────────────────
     if row:
-        columns = [column[0] for column in cursor.description]
-        profile = dict(zip(columns, row))
+        profile = dict(row)
 
         # Conversion JSON stocké en TEXT
-        profile["quetes"] = json.loads(profile.get("quetes") or "[]")
+        # (quetes : ancienne colonne, les quêtes sont dans quest_completions → utils.quests)
+        profile.pop("quetes", None)
         profile["shop_effets"] = json.loads(profile.get("shop_effets") or "[]")
 
-        conn.close()
+        profile_cache.set(user_id, profile, token)
         return profile
 
     # ─── Création automatique ──────────────────────
-    cursor.execute("""
+    await db.execute("""
         INSERT INTO reiatsu (
             user_id,
             username,
@@ -69,14 +63,12 @@ def ensure_profile(user_id: int, username: str) -> dict:
             fake_spawn_id,
             fake_spawn_guild_id,
             niveau,
-            quetes,
             shop_effets
         )
-        VALUES (?, ?, 0, 0, NULL, 24, '', NULL, 0, NULL, NULL, 0, '[]', '[]')
+        VALUES (?, ?, 0, 0, NULL, 24, '', NULL, 0, NULL, NULL, 0, '[]')
+        ON CONFLICT(user_id) DO NOTHING
     """, (user_id, username))
-
-    conn.commit()
-    conn.close()
+    profile_cache.invalidate(user_id)
 
     return {
         "user_id": user_id,
@@ -90,8 +82,9 @@ def ensure_profile(user_id: int, username: str) -> dict:
         "steal_cd": 24,
         "fake_spawn_id": None,
         "fake_spawn_guild_id": None,
+        "fake_spawn_channel_id": None,
+        "fake_spawn_expires_at": None,
         "niveau": 0,
-        "quetes": [],
         "shop_effets": []
     }
 
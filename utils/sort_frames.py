@@ -0,0 +1,115 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 sort_frames.py — Pipeline d'images pour la visualisation des tris
+# Objectif : Rejouer la trace compacte d'un tri (utils.algorithms) pour n'en
+#            extraire que les images clés à afficher (budget d'éditions)
+#            ou à encoder en GIF
+# Catégorie : 🧠 Utils
+# Accès : Interne
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import io
+
+from utils.algorithms import SortTrace, SWAP, WRITE
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+GIF_BAR_WIDTH   = 24   # px par barre (maximum)
+GIF_MAX_WIDTH   = 600  # px : les barres s'affinent quand il y en a beaucoup
+GIF_HEIGHT      = 240  # px
+GIF_FRAME_MS    = 120  # durée d'une image
+GIF_END_MS      = 1500 # pause sur le résultat final
+GIF_BACKGROUND  = (47, 49, 54)
+GIF_BAR_COLOR   = (220, 221, 222)
+GIF_HIGHLIGHT   = (237, 66, 69)
+GIF_DONE_COLOR  = (87, 242, 135)
+
+# (n° d'étape, valeurs, indices mis en évidence)
+Frame = tuple[int, tuple[int, ...], tuple[int, ...]]
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🎞️ Images clés depuis la trace
+# ────────────────────────────────────────────────────────────────────────────────
+def keyframe_steps(total: int, budget: int) -> list[int]:
+    """Au plus `budget` numéros d'étape répartis uniformément dans [0, total], bornes incluses."""
+    if total + 1 <= budget:
+        return list(range(total + 1))
+    if budget <= 1:
+        return [total]
+    return sorted({round(i * total / (budget - 1)) for i in range(budget)})
+
+
+def trace_keyframes(trace: SortTrace, budget: int) -> list[Frame]:
+    """
+    Rejoue les étapes compactes de la trace sur une seule liste et ne copie
+    l'état qu'aux images retenues (au plus `budget`, état initial et final inclus).
+    Les comparaisons enregistrées ne font pas avancer le compteur d'étapes.
+    """
+    wanted = keyframe_steps(trace.moves, budget)
+    values = list(trace.initial)
+    frames: list[Frame] = []
+    pos = 0
+    step = 0
+
+    if wanted[0] == 0:
+        frames.append((0, tuple(values), ()))
+        pos = 1
+
+    for op, i, j in trace.steps:
+        if pos == len(wanted):
+            break
+        if op == SWAP:
+            values[i], values[j] = values[j], values[i]
+            highlight = (i, j)
+        elif op == WRITE:
+            values[i] = j
+            highlight = (i,)
+        else:
+            continue
+        step += 1
+        if step == wanted[pos]:
+            frames.append((step, tuple(values), highlight))
+            pos += 1
+    return frames
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🖼️ Animation GIF
+# ────────────────────────────────────────────────────────────────────────────────
+def render_gif(frames: list[Frame]) -> io.BytesIO:
+    """
+    Encode les images en GIF animé (Pillow). Appel bloquant : lancé dans le pool
+    de rendu (utils.sort_renderer). La dernière image est affichée en vert, plus longtemps.
+    """
+    from PIL import Image, ImageDraw
+
+    size = len(frames[0][1])
+    max_val = max(frames[0][1]) or 1
+    bar_width = max(2, min(GIF_BAR_WIDTH, GIF_MAX_WIDTH // size))
+    gap = 2 if bar_width >= 6 else 0
+    width = size * bar_width
+    images = []
+
+    for index, (_, values, highlight) in enumerate(frames):
+        final = index == len(frames) - 1
+        img = Image.new("RGB", (width, GIF_HEIGHT), GIF_BACKGROUND)
+        draw = ImageDraw.Draw(img)
+        for i, value in enumerate(values):
+            height = max(1, round(value / max_val * (GIF_HEIGHT - 4)))
+            color = GIF_DONE_COLOR if final else GIF_HIGHLIGHT if i in highlight else GIF_BAR_COLOR
+            x0 = i * bar_width
+            draw.rectangle((x0, GIF_HEIGHT - height, x0 + bar_width - 1 - gap, GIF_HEIGHT - 1), fill=color)
+        images.append(img.convert("P", palette=Image.ADAPTIVE, colors=8))
+
+    durations = [GIF_FRAME_MS] * (len(images) - 1) + [GIF_END_MS]
+    buffer = io.BytesIO()
+    images[0].save(
+        buffer, format="GIF", save_all=True, append_images=images[1:],
+        duration=durations, loop=0, optimize=True
+    )
+    buffer.seek(0)
+    return buffer
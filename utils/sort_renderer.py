@@ -0,0 +1,185 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 sort_renderer.py — Rendu GIF des tris hors de la boucle + cache disque
+# Objectif : Encoder l'animation d'un tri (jusqu'à MAX_BARS barres) dans un
+#            processus séparé et garder les GIF déjà produits sur disque
+#            (clé : algorithme, graine, taille ; éviction LRU)
+# Catégorie : 🧠 Utils
+# Accès : Interne
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import json
+import os
+import random
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.sort_frames import trace_keyframes, render_gif
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+CACHE_DIR       = os.path.join("database", "cache", "sorting")
+CACHE_MAX_FILES = 200
+CACHE_MAX_BYTES = 200 * 1024 * 1024  # 200 Mo
+MAX_BARS        = 200
+GIF_MAX_FRAMES  = 120
+RENDER_WORKERS  = 2
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🏭 Travail exécuté dans le processus de rendu
+# ────────────────────────────────────────────────────────────────────────────────
+def shuffled_data(seed: int, size: int) -> list[int]:
+    """Données de départ reproductibles pour (graine, taille)."""
+    data = list(range(1, size + 1))
+    random.Random(seed).shuffle(data)
+    return data
+
+
+def render_sort_gif(algorithm_name: str, seed: int, size: int, path: str) -> int:
+    """
+    Rejoue le tri, encode le GIF dans `path` et renvoie le nombre d'étapes.
+    Fonction de module (picklable) : exécutée dans le ProcessPoolExecutor.
+    """
+    from utils.algorithms import run_sort
+
+    trace = run_sort(algorithm_name, shuffled_data(seed, size))
+    buffer = render_gif(trace_keyframes(trace, GIF_MAX_FRAMES))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(buffer.getbuffer())
+    os.replace(tmp_path, path)  # jamais de GIF à moitié écrit dans le cache
+    return trace.moves
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗂️ Cache disque LRU + pool de rendu
+# ────────────────────────────────────────────────────────────────────────────────
+class SortGifRenderer:
+    """
+    GIF des tris mis en cache sur disque.
+    - index.json garde l'ordre LRU et le nombre d'étapes de chaque GIF
+    - les rendus manquants partent dans un ProcessPoolExecutor (Pillow ne bloque
+      ni la boucle ni le GIL du bot) ; deux demandes identiques partagent le rendu
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_files: int = CACHE_MAX_FILES,
+                 max_bytes: int = CACHE_MAX_BYTES, workers: int = RENDER_WORKERS):
+        self.cache_dir = cache_dir
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self._index: OrderedDict[str, dict] | None = None  # {clé: {"file", "bytes", "iterations"}}
+        self._lock = threading.Lock()
+        self._pool: ProcessPoolExecutor | None = None
+        self._rendering: dict[str, asyncio.Future] = {}
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Index
+    # ──────────────────────────────────────────────────────────────
+    @staticmethod
+    def key(algorithm_name: str, seed: int, size: int) -> str:
+        slug = re.sub(r"[^a-z0-9]+", "-", algorithm_name.lower()).strip("-")
+        return f"{slug}_{seed}_{size}"
+
+    def _index_path(self) -> str:
+        return os.path.join(self.cache_dir, "index.json")
+
+    def _load_index(self) -> OrderedDict:
+        if self._index is not None:
+            return self._index
+        os.makedirs(self.cache_dir, exist_ok=True)
+        index = OrderedDict()
+        try:
+            with open(self._index_path(), "r", encoding="utf-8") as f:
+                for key, entry in json.load(f):
+                    if os.path.exists(os.path.join(self.cache_dir, entry["file"])):
+                        index[key] = entry
+        except (OSError, ValueError, TypeError, KeyError):
+            pass
+        self._index = index
+        return index
+
+    def _save_index(self):
+        tmp_path = self._index_path() + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(list(self._index.items()), f)
+        os.replace(tmp_path, self._index_path())
+
+    def _lookup(self, key: str) -> tuple[str, int] | None:
+        with self._lock:
+            index = self._load_index()
+            entry = index.get(key)
+            if entry is None:
+                return None
+            path = os.path.join(self.cache_dir, entry["file"])
+            if not os.path.exists(path):
+                del index[key]
+                self._save_index()
+                return None
+            index.move_to_end(key)
+            self._save_index()
+            return path, entry["iterations"]
+
+    def _store(self, key: str, path: str, iterations: int):
+        with self._lock:
+            index = self._load_index()
+            index[key] = {"file": os.path.basename(path), "bytes": os.path.getsize(path), "iterations": iterations}
+            index.move_to_end(key)
+
+            total = sum(entry["bytes"] for entry in index.values())
+            while len(index) > 1 and (len(index) > self.max_files or total > self.max_bytes):
+                _, old = index.popitem(last=False)
+                total -= old["bytes"]
+                try:
+                    os.remove(os.path.join(self.cache_dir, old["file"]))
+                except OSError:
+                    pass
+            self._save_index()
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Rendu
+    # ──────────────────────────────────────────────────────────────
+    async def get(self, algorithm_name: str, seed: int, size: int) -> tuple[str, int]:
+        """Chemin du GIF et nombre d'étapes (rendu en arrière-plan si absent du cache)."""
+        size = max(2, min(size, MAX_BARS))
+        key = self.key(algorithm_name, seed, size)
+
+        cached = await asyncio.to_thread(self._lookup, key)
+        if cached is not None:
+            return cached
+
+        pending = self._rendering.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._render(key, algorithm_name, seed, size))
+            self._rendering[key] = pending
+            pending.add_done_callback(lambda _: self._rendering.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def _render(self, key: str, algorithm_name: str, seed: int, size: int) -> tuple[str, int]:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        path = os.path.join(self.cache_dir, f"{key}.gif")
+        loop = asyncio.get_running_loop()
+        iterations = await loop.run_in_executor(self._pool, render_sort_gif, algorithm_name, seed, size, path)
+        await asyncio.to_thread(self._store, key, path, iterations)
+        return path, iterations
+
+    def shutdown(self):
+        """Arrête les processus de rendu (déchargement du cog)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🌐 Instance partagée
+# ────────────────────────────────────────────────────────────────────────────────
+sort_renderer = SortGifRenderer()
@@ -0,0 +1,110 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 spawn_scheduler.py — Planificateur des spawns Reiatsu
+# Objectif : Garder l'échéance du prochain spawn de chaque serveur dans un tas-min
+#            pour ne réveiller la boucle qu'au prochain spawn dû. Les clés sont
+#            quelconques (hashables et ordonnables) : le ReiatsuShop s'en sert
+#            aussi pour l'expiration de ses effets
+# Catégorie : 🧠 Utils
+# Accès : Interne
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import heapq
+import time
+from typing import Hashable
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⏱️ Tas-min des échéances
+# ────────────────────────────────────────────────────────────────────────────────
+class SpawnScheduler:
+    """
+    Échéances indexées par clé (guild_id pour les spawns).
+    - schedule() / cancel() sont en O(log n) / O(1) : une entrée remplacée reste
+      dans le tas mais est ignorée à la lecture (suppression paresseuse)
+    - wait() dort jusqu'à la plus proche échéance, ou jusqu'à ce qu'une échéance
+      plus proche soit planifiée, puis renvoie les serveurs dus
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, Hashable]] = []  # (timestamp dû, clé)
+        self._due: dict[Hashable, float] = {}          # échéance courante par clé
+        self._wakeup = asyncio.Event()
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Planification
+    # ──────────────────────────────────────────────────────────────
+    def schedule(self, key: Hashable, due_ts: float):
+        """Planifie (ou replanifie) l'échéance de la clé."""
+        self._due[key] = due_ts
+        heapq.heappush(self._heap, (due_ts, key))
+        if self._heap[0] == (due_ts, key):
+            self._wakeup.set()
+        if len(self._heap) > 2 * len(self._due) + 32:
+            self._compact()
+
+    def cancel(self, key: Hashable):
+        """Retire la clé (spawn en cours, salon supprimé, effet retiré…)."""
+        self._due.pop(key, None)
+
+    def clear(self):
+        self._heap.clear()
+        self._due.clear()
+        self._wakeup.set()
+
+    def due_at(self, key: Hashable) -> float | None:
+        return self._due.get(key)
+
+    def keys(self) -> list:
+        return list(self._due)
+
+    def next_due(self) -> float | None:
+        """Plus proche échéance, sans toucher au tas (lisible depuis un autre thread)."""
+        return min(list(self._due.values()), default=None)
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Lecture
+    # ──────────────────────────────────────────────────────────────
+    def _peek(self) -> tuple[float, Hashable] | None:
+        """Plus proche échéance encore valide (purge les entrées remplacées)."""
+        while self._heap:
+            due_ts, key = self._heap[0]
+            if self._due.get(key) == due_ts:
+                return due_ts, key
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now: float | None = None) -> list:
+        """Retire et renvoie les clés dont l'échéance est passée."""
+        now = time.time() if now is None else now
+        due = []
+        while (head := self._peek()) is not None and head[0] <= now:
+            heapq.heappop(self._heap)
+            del self._due[head[1]]
+            due.append(head[1])
+        return due
+
+    async def wait(self) -> list:
+        """Attend la prochaine échéance et renvoie les clés dues."""
+        while True:
+            head = self._peek()
+            delay = None if head is None else head[0] - time.time()
+            if delay is not None and delay <= 0:
+                return self.pop_due()
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    # ──────────────────────────────────────────────────────────────
+    def _compact(self):
+        self._heap = [(ts, key) for key, ts in self._due.items()]
+        heapq.heapify(self._heap)
@@ -0,0 +1,91 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 spell_service.py — Validation partagée des mots français (jeux de mots)
+# Objectif : Un seul chargement paresseux du dictionnaire pyspellchecker pour
+#            tous les jeux, réduit à des frozenset de mots sans accents rangés
+#            par longueur (pas de fréquences ni d'objet SpellChecker en mémoire)
+# Catégorie : 🧠 Utils
+# Accès : Interne
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import gzip
+import json
+import logging
+import sys
+import threading
+
+from utils.word_index import fold, source_path
+
+log = logging.getLogger(__name__)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📖 Service de validation
+# ────────────────────────────────────────────────────────────────────────────────
+class FrenchSpellService:
+    """
+    Dictionnaire français partagé : {longueur: frozenset(mots repliés)}.
+    Les mots sont repliés avec word_index.fold (majuscules, sans accents,
+    œ → OE) comme les propositions des joueurs : « ECRAN » valide « écran ».
+    """
+
+    def __init__(self):
+        self._by_length: dict[int, frozenset[str]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Charge le dictionnaire (une seule fois, tous jeux confondus). Bloquant."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            with gzip.open(source_path(), "rt", encoding="utf-8") as f:
+                frequencies: dict[str, int] = json.load(f)
+
+            buckets: dict[int, set[str]] = {}
+            for word in frequencies:
+                folded = sys.intern(fold(word))
+                buckets.setdefault(len(folded), set()).add(folded)
+            del frequencies
+
+            self._by_length = {length: frozenset(words) for length, words in buckets.items()}
+            self._loaded = True
+            stats = self.stats()
+            log.info("[spell] %d mots chargés (~%.1f Mo)", stats["words"], stats["bytes"] / 1_048_576)
+
+    async def ensure_loaded(self):
+        """Charge le dictionnaire dans un thread si ce n'est pas déjà fait."""
+        if not self._loaded:
+            await asyncio.to_thread(self.load)
+
+    def is_valid(self, word: str) -> bool:
+        """True si le mot existe (casse et accents ignorés)."""
+        self.load()
+        folded = fold(word.strip())
+        bucket = self._by_length.get(len(folded))
+        return bucket is not None and folded in bucket
+
+    def words_of_length(self, length: int) -> frozenset[str]:
+        """Tous les mots (repliés) d'une longueur donnée."""
+        self.load()
+        return self._by_length.get(length, frozenset())
+
+    def stats(self) -> dict:
+        """Nombre de mots et empreinte mémoire approximative (ensembles + chaînes)."""
+        words = sum(len(bucket) for bucket in self._by_length.values())
+        size = sys.getsizeof(self._by_length) + sum(
+            sys.getsizeof(bucket) + sum(sys.getsizeof(w) for w in bucket)
+            for bucket in self._by_length.values()
+        )
+        return {"loaded": self._loaded, "words": words, "lengths": len(self._by_length), "bytes": size}
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🌐 Instance partagée
+# ────────────────────────────────────────────────────────────────────────────────
+spell_service = FrenchSpellService()
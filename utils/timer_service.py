@@ -0,0 +1,179 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 timer_service.py — Minuteurs persistants partagés par les cogs
+# Objectif : Remplacer les tâches asyncio.sleep « lancer et oublier » (fin des
+#            effets du ReiatsuShop, disparition des faux Reiatsu) par une table
+#            SQLite `timers` et une seule tâche de réveil (tas-min). Les cogs
+#            enregistrent un callback par nom ; les minuteurs survivent aux
+#            rechargements et redémarrages (ceux échus hors ligne partent au start)
+# Catégorie : 🧠 Utils
+# Accès : Interne
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import json
+import logging
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable
+
+from utils.database import db
+from utils.spawn_scheduler import SpawnScheduler
+
+log = logging.getLogger(__name__)
+
+TimerCallback = Callable[[str, Any], Awaitable[None]]
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⏲️ Service
+# ────────────────────────────────────────────────────────────────────────────────
+class TimerService:
+    """
+    Minuteurs (name, key) → échéance + payload JSON :
+    - register(name, callback) : `await callback(key, payload)` à l'échéance
+    - schedule(name, key, due_ts, payload) : crée ou replanifie (upsert)
+    - cancel(name, key) : annule
+    La table est la source de vérité, le tas ne fait que dater le prochain réveil.
+    Un minuteur dont le nom n'a pas (encore) de callback reste en attente et part
+    dès l'enregistrement du callback (cog rechargé, chargement dans le désordre).
+    """
+
+    def __init__(self):
+        self._callbacks: dict[str, TimerCallback] = {}
+        self._heap = SpawnScheduler()                 # clés (name, key)
+        self._payloads: dict[tuple[str, str], Any] = {}
+        self._orphans: set[tuple[str, str]] = set()  # échus sans callback
+        self._task: asyncio.Task | None = None
+        self.fired = 0
+        self.failed = 0
+        self.missed = 0  # échus pendant que le bot était arrêté
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Callbacks
+    # ──────────────────────────────────────────────────────────────
+    def register(self, name: str, callback: TimerCallback):
+        """Associe un callback à un nom (appelé depuis cog_load)."""
+        self._callbacks[name] = callback
+        for timer in [t for t in self._orphans if t[0] == name]:
+            self._orphans.discard(timer)
+            self._heap.schedule(timer, time.time())
+
+    def unregister(self, name: str):
+        """Retire le callback (cog_unload) : ses minuteurs attendent le prochain register."""
+        self._callbacks.pop(name, None)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Planification
+    # ──────────────────────────────────────────────────────────────
+    async def schedule(self, name: str, key, due_ts: float, payload: Any = None):
+        """Crée ou replanifie le minuteur (name, key)."""
+        timer = (name, str(key))
+        await db.execute("""
+            INSERT INTO timers (name, key, due_at, payload)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(name, key) DO UPDATE SET
+                due_at  = excluded.due_at,
+                payload = excluded.payload
+        """, (*timer, due_ts, json.dumps(payload) if payload is not None else None))
+        self._arm(timer, due_ts, payload)
+
+    async def cancel(self, name: str, key) -> bool:
+        """Annule le minuteur ; False s'il n'existait pas (déjà parti)."""
+        timer = (name, str(key))
+        self._disarm(timer)
+        cursor = await db.execute("DELETE FROM timers WHERE name = ? AND key = ?", timer)
+        return cursor.rowcount > 0
+
+    def due_at(self, name: str, key) -> float | None:
+        return self._heap.due_at((name, str(key)))
+
+    def _arm(self, timer: tuple[str, str], due_ts: float, payload: Any):
+        self._orphans.discard(timer)
+        self._payloads[timer] = payload
+        self._heap.schedule(timer, due_ts)
+
+    def _disarm(self, timer: tuple[str, str]):
+        self._heap.cancel(timer)
+        self._orphans.discard(timer)
+        self._payloads.pop(timer, None)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Démarrage / arrêt
+    # ──────────────────────────────────────────────────────────────
+    async def start(self) -> bool:
+        """Recharge la table (une requête) et lance la tâche de réveil. False si déjà lancé."""
+        if self._task is not None and not self._task.done():
+            return False
+        now = time.time()
+        for row in await db.fetchall("SELECT name, key, due_at, payload FROM timers"):
+            timer = (row["name"], row["key"])
+            payload = json.loads(row["payload"]) if row["payload"] is not None else None
+            # Relance après stop() (reload) : les minuteurs déjà armés ne sont pas « hors ligne »
+            known = self._heap.due_at(timer) is not None or timer in self._orphans
+            self._arm(timer, row["due_at"], payload)
+            self.missed += row["due_at"] <= now and not known
+        self._task = asyncio.create_task(self._run())
+        return True
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Déclenchement
+    # ──────────────────────────────────────────────────────────────
+    async def _run(self):
+        """Tâche unique : dort jusqu'à la prochaine échéance, déclenche, recommence."""
+        while True:
+            for timer in await self._heap.wait():
+                await self._fire(timer)
+
+    async def _fire(self, timer: tuple[str, str]):
+        name, key = timer
+        callback = self._callbacks.get(name)
+        if callback is None:
+            self._orphans.add(timer)
+            return
+
+        payload = self._payloads.pop(timer, None)
+        try:
+            await callback(key, payload)
+            self.fired += 1
+        except Exception:
+            self.failed += 1
+            log.exception("[timers] Minuteur %s:%s en erreur", name, key)
+
+        # Le callback a pu replanifier le même minuteur : on ne supprime que l'échéance partie
+        if self._heap.due_at(timer) is None:
+            await db.execute("DELETE FROM timers WHERE name = ? AND key = ?", timer)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Statistiques
+    # ──────────────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        """Minuteurs en attente par nom (panneau admin)."""
+        pending = Counter(name for name, _ in self._heap.keys())
+        orphans = Counter(name for name, _ in list(self._orphans))
+        upcoming = self._heap.next_due()
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "pending": len(self._heap) + len(self._orphans),
+            "by_name": {
+                name: {"pending": pending[name] + orphans[name], "waiting_callback": orphans[name]}
+                for name in sorted(pending | orphans)
+            },
+            "next_in": round(upcoming - time.time(), 1) if upcoming else None,
+            "fired": self.fired,
+            "failed": self.failed,
+            "missed": self.missed,
+        }
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🌐 Instance partagée
+# ────────────────────────────────────────────────────────────────────────────────
+timer_service = TimerService()
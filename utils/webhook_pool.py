@@ -0,0 +1,162 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 webhook_pool.py — Un webhook réutilisable par salon
+# Objectif : Reposter « au nom » d'un membre (AutoEmoji, zombification, rename)
+#            sans créer puis supprimer un webhook à chaque message : le webhook
+#            du salon est créé à la demande, réutilisé avec username/avatar par
+#            message et gardé en base (table channel_webhooks) entre redémarrages
+# Catégorie : 🧠 Utils
+# Accès : Interne
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import logging
+import time
+
+import discord
+
+from utils.database import db
+from utils.discord_utils import safe_webhook_send
+
+log = logging.getLogger(__name__)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+WEBHOOK_NAME = "Kisuke Relay"
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🪝 Pool
+# ────────────────────────────────────────────────────────────────────────────────
+class WebhookPool:
+    """
+    {channel_id: Webhook}, rempli paresseusement :
+    mémoire → table channel_webhooks → webhook existant du bot dans le salon → création.
+    Les fils (threads) utilisent le webhook de leur salon parent.
+    """
+
+    def __init__(self):
+        self._bot: discord.Client | None = None
+        self._webhooks: dict[int, discord.Webhook] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+        self.created = 0
+        self.sent = 0
+
+    def attach(self, bot: discord.Client):
+        """Client utilisé pour reconstruire les webhooks lus en base (branché par bot.py au démarrage)."""
+        self._bot = bot
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Récupération / création
+    # ──────────────────────────────────────────────────────────────
+    async def get(self, channel: discord.abc.GuildChannel) -> discord.Webhook:
+        webhook = self._webhooks.get(channel.id)
+        if webhook is not None:
+            return webhook
+
+        lock = self._locks.setdefault(channel.id, asyncio.Lock())
+        async with lock:
+            webhook = self._webhooks.get(channel.id)
+            if webhook is None:
+                webhook = await self._load(channel) or await self._create(channel)
+                self._webhooks[channel.id] = webhook
+        self._locks.pop(channel.id, None)
+        return webhook
+
+    async def _load(self, channel) -> discord.Webhook | None:
+        if self._bot is None:
+            # Sans client, un webhook partiel n'aurait pas d'état : on passe par channel.webhooks()
+            return None
+        row = await db.fetchone(
+            "SELECT webhook_id, token FROM channel_webhooks WHERE channel_id = ?", (channel.id,)
+        )
+        if row is None:
+            return None
+        return discord.Webhook.partial(row["webhook_id"], row["token"], client=self._bot)
+
+    async def _create(self, channel) -> discord.Webhook:
+        me = channel.guild.me
+        # Base perdue : on réutilise le webhook déjà créé par le bot plutôt que d'en ajouter un
+        webhook = next(
+            (w for w in await channel.webhooks()
+             if w.name == WEBHOOK_NAME and w.token and w.user and me and w.user.id == me.id),
+            None
+        )
+        if webhook is None:
+            webhook = await channel.create_webhook(name=WEBHOOK_NAME, reason="Webhook réutilisable du bot")
+            self.created += 1
+
+        await db.execute("""
+            INSERT INTO channel_webhooks (channel_id, guild_id, webhook_id, token, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(channel_id) DO UPDATE SET
+                webhook_id = excluded.webhook_id,
+                token      = excluded.token,
+                created_at = excluded.created_at
+        """, (channel.id, channel.guild.id, webhook.id, webhook.token, time.time()))
+        return webhook
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Envoi
+    # ──────────────────────────────────────────────────────────────
+    async def send(self, channel: discord.abc.GuildChannel, *, username: str, avatar_url: str | None = None,
+                   **kwargs):
+        """
+        Envoie `kwargs` (content, embed…) via le webhook du salon avec le pseudo et
+        l'avatar donnés. Si le webhook a été supprimé à la main, il est recréé une fois.
+        """
+        target = channel
+        if isinstance(channel, discord.Thread):
+            kwargs["thread"] = channel
+            target = channel.parent
+
+        for attempt in range(2):
+            webhook = await self.get(target)
+            try:
+                result = await safe_webhook_send(
+                    webhook, channel_id=target.id, username=username, avatar_url=avatar_url, **kwargs
+                )
+                self.sent += 1
+                return result
+            except discord.NotFound:
+                log.info("[webhook_pool] Webhook du salon %s supprimé, recréation", target.id)
+                await self.forget(target.id)
+                if attempt:
+                    raise
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Nettoyage
+    # ──────────────────────────────────────────────────────────────
+    async def forget(self, channel_id: int):
+        """Oublie le webhook d'un salon (salon supprimé ou webhook invalide)."""
+        self._webhooks.pop(channel_id, None)
+        await db.execute("DELETE FROM channel_webhooks WHERE channel_id = ?", (channel_id,))
+
+    async def forget_guild(self, guild_id: int):
+        """Oublie tous les webhooks d'un serveur quitté."""
+        rows = await db.fetchall("SELECT channel_id FROM channel_webhooks WHERE guild_id = ?", (guild_id,))
+        for row in rows:
+            self._webhooks.pop(row["channel_id"], None)
+        await db.execute("DELETE FROM channel_webhooks WHERE guild_id = ?", (guild_id,))
+
+    async def prune(self, bot: discord.Client) -> int:
+        """Supprime les lignes des salons qui n'existent plus (au démarrage). Retourne leur nombre."""
+        rows = await db.fetchall("SELECT channel_id FROM channel_webhooks")
+        gone = [(row["channel_id"],) for row in rows if bot.get_channel(row["channel_id"]) is None]
+        if gone:
+            for (channel_id,) in gone:
+                self._webhooks.pop(channel_id, None)
+            await db.executemany("DELETE FROM channel_webhooks WHERE channel_id = ?", gone)
+        return len(gone)
+
+    def stats(self) -> dict:
+        return {"cached": len(self._webhooks), "created": self.created, "sent": self.sent}
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🌐 Instance partagée
+# ────────────────────────────────────────────────────────────────────────────────
+webhook_pool = WebhookPool()
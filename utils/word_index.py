@@ -0,0 +1,183 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 word_index.py — Index local des mots français (motus, anagramme)
+# Objectif : Tirer un mot au hasard par longueur et difficulté en O(1) et lister
+#            instantanément les anagrammes d'un mot, sans aucun appel réseau.
+#            Construit une fois depuis le dictionnaire de fréquences de
+#            pyspellchecker puis gardé sur disque (database/cache/words_fr.json)
+# Catégorie : 🧠 Utils
+# Accès : Interne
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import gzip
+import json
+import logging
+import os
+import random
+import threading
+import unicodedata
+
+log = logging.getLogger(__name__)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+CACHE_PATH     = os.path.join("database", "cache", "words_fr.json")
+INDEX_VERSION  = 1
+MIN_LENGTH     = 3
+MAX_LENGTH     = 12
+DRAW_MIN_COUNT = 100  # fréquence minimale pour être tiré au sort (évite les formes rarissimes)
+
+# Bandes de fréquence par longueur : les mots les plus courants d'abord
+DIFFICULTIES = ("facile", "moyen", "difficile")
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 Normalisation
+# ────────────────────────────────────────────────────────────────────────────────
+def fold(word: str) -> str:
+    """Majuscules sans accents, œ/æ décomposés : « Cœur » → « COEUR »."""
+    word = word.replace("œ", "oe").replace("Œ", "OE").replace("æ", "ae").replace("Æ", "AE")
+    return "".join(
+        c for c in unicodedata.normalize("NFD", word)
+        if unicodedata.category(c) != "Mn"
+    ).upper()
+
+
+def signature(word: str) -> str:
+    """Lettres triées (sans accents) : deux anagrammes ont la même signature."""
+    return "".join(sorted(fold(word)))
+
+
+def source_path() -> str:
+    """Dictionnaire de fréquences français livré avec pyspellchecker."""
+    import spellchecker
+    return os.path.join(os.path.dirname(spellchecker.__file__), "resources", "fr.json.gz")
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗂️ Index
+# ────────────────────────────────────────────────────────────────────────────────
+class FrenchWordIndex:
+    """
+    - buckets : {longueur: {difficulté: [mots]}} → random.choice en O(1)
+    - anagrams : {signature: [mots]} pour tous les mots alphabétiques indexés
+    Chargé une seule fois (paresseusement, hors de la boucle via ensure_loaded).
+    """
+
+    def __init__(self, cache_path: str = CACHE_PATH):
+        self.cache_path = cache_path
+        self._buckets: dict[int, dict[str, list[str]]] = {}
+        self._anagrams: dict[str, list[str]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Construction / chargement
+    # ──────────────────────────────────────────────────────────────
+    @staticmethod
+    def _source_stamp(path: str) -> list:
+        stat = os.stat(path)
+        return [INDEX_VERSION, stat.st_size, int(stat.st_mtime)]
+
+    def _build(self, source: str) -> dict:
+        with gzip.open(source, "rt", encoding="utf-8") as f:
+            frequencies: dict[str, int] = json.load(f)
+
+        by_length: dict[int, list[tuple[int, str]]] = {}
+        anagrams: dict[str, list[str]] = {}
+        for word, count in frequencies.items():
+            if not (MIN_LENGTH <= len(word) <= MAX_LENGTH) or not word.isalpha():
+                continue
+            anagrams.setdefault(signature(word), []).append(word)
+            if count >= DRAW_MIN_COUNT:
+                by_length.setdefault(len(word), []).append((count, word))
+
+        buckets = {}
+        for length, entries in by_length.items():
+            entries.sort(key=lambda e: (-e[0], e[1]))
+            words = [w for _, w in entries]
+            third = -(-len(words) // len(DIFFICULTIES))
+            buckets[str(length)] = {
+                name: words[i * third:(i + 1) * third] for i, name in enumerate(DIFFICULTIES)
+            }
+        return {"buckets": buckets, "anagrams": anagrams}
+
+    def load(self):
+        """Charge l'index (construit et écrit sur disque au premier lancement). Bloquant."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            source = source_path()
+            stamp = self._source_stamp(source)
+            data = None
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    cached = json.load(f)
+                if cached.get("source") == stamp:
+                    data = cached
+            except (OSError, ValueError):
+                pass
+
+            if data is None:
+                data = self._build(source)
+                data["source"] = stamp
+                os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                tmp_path = f"{self.cache_path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+                os.replace(tmp_path, self.cache_path)
+                log.info("[word_index] Index reconstruit (%d signatures)", len(data["anagrams"]))
+
+            self._buckets = {int(length): bands for length, bands in data["buckets"].items()}
+            self._anagrams = data["anagrams"]
+            self._loaded = True
+
+    async def ensure_loaded(self):
+        """Charge l'index dans un thread si ce n'est pas déjà fait."""
+        if not self._loaded:
+            await asyncio.to_thread(self.load)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Requêtes
+    # ──────────────────────────────────────────────────────────────
+    def random_word(self, length: int | None = None, difficulty: str | None = None) -> str:
+        """
+        Mot au hasard (minuscules, accents conservés). `difficulty` parmi
+        DIFFICULTIES ; sans difficulté, les trois bandes sont tirées au même poids.
+        """
+        self.load()
+        if length is None:
+            length = random.choice(list(self._buckets))
+        bands = self._buckets.get(length)
+        if not bands:
+            raise ValueError(f"Aucun mot de {length} lettres dans l'index")
+        band = bands[difficulty] if difficulty else bands[random.choice(DIFFICULTIES)]
+        return random.choice(band or next(b for b in bands.values() if b))
+
+    def anagrams(self, word: str) -> list[str]:
+        """Tous les mots indexés qui s'écrivent avec les mêmes lettres (accents ignorés)."""
+        self.load()
+        return list(self._anagrams.get(signature(word), ()))
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self._loaded,
+            "signatures": len(self._anagrams),
+            "words": sum(len(words) for words in self._anagrams.values()),
+            "drawable": {
+                length: {name: len(words) for name, words in bands.items()}
+                for length, bands in sorted(self._buckets.items())
+            },
+        }
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🌐 Instance partagée
+# ────────────────────────────────────────────────────────────────────────────────
+word_index = FrenchWordIndex()